@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Forecasting Engine Benchmark
+
+Holds out the last --horizon days of every station in data/climate_data.csv,
+fits each forecasting engine on the rest, and reports fit+forecast wall-clock
+time and the error of the forecast against the held-out days.
+
+Usage:
+    python benchmarks/bench_forecasters.py [--horizon 90] [--engines lstm harmonic]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.dataset_cache import DatasetCache
+from src.ml_algorithms import ClimateML
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--horizon', type=int, default=90)
+    parser.add_argument('--engines', nargs='+', default=ClimateML.available_engines())
+    parser.add_argument('--epochs', type=int, default=None, help='override LSTM epochs')
+    args = parser.parse_args()
+
+    index = DatasetCache(os.path.join(ROOT, 'data', 'climate_data.csv')).get_index()
+    lstm_config = {'epochs': args.epochs} if args.epochs else None
+
+    print(f"{'station':<42} {'engine':>9} {'time (s)':>9} {'MAE':>7} {'RMSE':>7}")
+    for position in range(len(index)):
+        station = index.station_frame(position)
+        temps = station['temperature'].to_numpy(dtype=float)
+        dates = station['date'].to_numpy()
+        history, actual = temps[:-args.horizon], temps[-args.horizon:]
+
+        for engine in args.engines:
+            ml = ClimateML(lstm_config=lstm_config, engine=engine)
+            start = time.perf_counter()
+            forecast = ml.predict_temperature(history, history, args.horizon, dates=dates[:-args.horizon])
+            elapsed = time.perf_counter() - start
+            error = forecast - actual
+            print(f"{index.station_names[position][:42]:<42} {engine:>9} {elapsed:>9.3f} "
+                  f"{np.abs(error).mean():>7.2f} {np.sqrt((error ** 2).mean()):>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Plot Rendering Benchmark
+
+Renders the temperature trend plot of the longest station in
+data/climate_data.csv with each ClimateVisualizer renderer and DPI preset,
+each combination in a fresh interpreter, and reports the median render time,
+the peak RSS growth over the process before rendering and the PNG size.
+
+Usage:
+    python benchmarks/bench_render.py [--repeat 5] [--renderers pyplot agg] [--dpi thumbnail web print]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.visualizer import DPI_PRESETS, RENDERERS
+
+CHILD_SCRIPT = """
+import json, os, resource, sys, tempfile, time
+import numpy as np
+from src.dataset_cache import DatasetCache
+from src.visualizer import ClimateVisualizer
+
+renderer, dpi, repeat = sys.argv[1], sys.argv[2], int(sys.argv[3])
+index = DatasetCache(os.path.join('data', 'climate_data.csv')).get_index()
+position = int(np.argmax(index.ends - index.starts))
+station = index.station_frame(position)
+dates = station['date'].tolist()
+temps = station['temperature'].to_numpy()
+anomalies = np.abs(temps - temps.mean()) > 2 * temps.std()
+predictions = np.full(90, temps[-365:].mean())
+
+visualizer = ClimateVisualizer(renderer=renderer, dpi=dpi)
+baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+path = os.path.join(tempfile.mkdtemp(), 'plot.png')
+times = []
+for _ in range(repeat):
+    start = time.perf_counter()
+    visualizer.plot_temperature_with_predictions_and_anomalies(
+        dates, temps, predictions, anomalies, 'Benchmark', output_path=path)
+    times.append(time.perf_counter() - start)
+print(json.dumps({
+    'points': len(dates),
+    'seconds': float(np.median(times)),
+    'peak_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+    'png_kb': os.path.getsize(path) / 1024,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--renderers', nargs='+', default=list(RENDERERS), choices=RENDERERS)
+    parser.add_argument('--dpi', nargs='+', default=list(DPI_PRESETS), choices=list(DPI_PRESETS))
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    print(f"{'renderer':<9} {'dpi':<10} {'points':>7} {'time (s)':>9} {'peak +MB':>9} {'PNG KB':>8}")
+    for renderer in args.renderers:
+        for dpi in args.dpi:
+            result = subprocess.run(
+                [sys.executable, '-c', CHILD_SCRIPT, renderer, dpi, str(args.repeat)],
+                cwd=ROOT, env=env, capture_output=True, text=True, check=True
+            )
+            report = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{renderer:<9} {dpi:<10} {report['points']:>7} {report['seconds']:>9.3f} "
+                  f"{report['peak_mb']:>9.1f} {report['png_kb']:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
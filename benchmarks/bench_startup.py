@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Worker Startup Benchmark
+
+Imports the webapp's route module in a fresh interpreter, the way a gunicorn
+worker boots, and reports wall-clock import time, RSS after import, the
+slowest modules from ``python -X importtime`` and whether TensorFlow or
+scikit-learn were pulled in. With --max-seconds / --max-rss-mb it exits
+non-zero when a budget is exceeded, so it can run as a regression check.
+
+Usage:
+    python benchmarks/bench_startup.py [--top 15] [--max-seconds 5] [--max-rss-mb 300]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBAPP_DIR = os.path.join(ROOT, 'webapp')
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import routes
+elapsed = time.perf_counter() - start
+import psutil
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mb': psutil.Process().memory_info().rss / 2**20,
+    'tensorflow': 'tensorflow' in sys.modules,
+    'sklearn': 'sklearn' in sys.modules,
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """Return (cumulative_us, module) pairs from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), module.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--max-seconds', type=float, default=None)
+    parser.add_argument('--max-rss-mb', type=float, default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=WEBAPP_DIR, TF_CPP_MIN_LOG_LEVEL='3')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT],
+        cwd=WEBAPP_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    print(f"import routes: {report['seconds']:.2f} s, RSS {report['rss_mb']:.0f} MB")
+    print(f"tensorflow imported: {report['tensorflow']}, sklearn imported: {report['sklearn']}")
+    print("\nSlowest imports (cumulative):")
+    for cumulative_us, module in sorted(parse_importtime(result.stderr), reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1e6:8.3f} s  {module}")
+
+    failures = []
+    if args.max_seconds is not None and report['seconds'] > args.max_seconds:
+        failures.append(f"import took {report['seconds']:.2f} s > {args.max_seconds} s")
+    if args.max_rss_mb is not None and report['rss_mb'] > args.max_rss_mb:
+        failures.append(f"RSS {report['rss_mb']:.0f} MB > {args.max_rss_mb} MB")
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Storage Backend Benchmark
+
+Compares DataProcessor.load_data() on the plain CSV path against the
+memory-mapped columnar store at 1x, 10x and 100x the row count of
+data/climate_data.csv. Each measurement runs in a fresh interpreter so
+the reported RSS reflects a single cold load.
+
+Usage:
+    python benchmarks/bench_storage.py [--scales 1 10 100]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SOURCE_CSV = os.path.join(ROOT, 'data', 'climate_data.csv')
+
+
+def build_scaled_csv(scale, directory):
+    """Write a CSV with `scale` copies of the dataset, each under new station ids."""
+    base = pd.read_csv(SOURCE_CSV)
+    parts = []
+    for i in range(scale):
+        part = base.copy()
+        part['station_id'] = part['station_id'] + f"_{i}"
+        part['station_name'] = part['station_name'] + f" #{i}"
+        parts.append(part)
+    path = os.path.join(directory, f"climate_x{scale}.csv")
+    pd.concat(parts, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def measure_child(storage, path):
+    """Load once in this process and print timing/memory as JSON."""
+    import psutil
+    from src.data_processor import DataProcessor
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    df = DataProcessor(path, storage=storage).load_data()
+    elapsed = time.perf_counter() - start
+    rss_after = process.memory_info().rss
+    print(json.dumps({
+        'rows': len(df),
+        'seconds': elapsed,
+        'rss_delta_mb': (rss_after - rss_before) / 2**20
+    }))
+
+
+def run_child(storage, path):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', storage, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--child', nargs=2, metavar=('STORAGE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(*args.child)
+        return
+
+    print(f"{'scale':>6} {'rows':>10} {'backend':>9} {'load (s)':>10} {'RSS (MB)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            path = build_scaled_csv(scale, directory)
+            run_child('columnar', path)  # build the store outside the timed run
+            for storage in ('csv', 'columnar'):
+                result = run_child(storage, path)
+                print(f"{scale:>5}x {result['rows']:>10} {storage:>9} "
+                      f"{result['seconds']:>10.3f} {result['rss_delta_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,21 +4,45 @@ Cache Generator for Climate Analysis Webapp
 Pre-generates all possible analysis plots for instant serving
 """
 
+import argparse
+import multiprocessing
 import os
 import sys
 import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 from pathlib import Path
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+from aggregation import heatmap_frame
+from cache_manifest import (ARTIFACT_CODE_FILES, DATASET_HASH_COLUMNS, CacheManifest, artifact_filename,
+                            code_version, hash_frame)
 from data_processor import DataProcessor
 from ml_algorithms import ClimateML
-from visualizer import ClimateVisualizer
+from model_registry import ModelRegistry
+from visualizer import DPI_PRESETS, ClimateVisualizer
 
-def generate_all_cache():
-    """Generate all possible analysis plots and cache them"""
+STATIC_DIR = os.path.join('webapp', 'static')
+MANIFEST_PATH = os.path.join('webapp', 'cache_manifest.json')
+CLUSTER_MODEL_PATH = os.path.join('models', 'clusters.npz')
+# Day-of-year baseline, so the seasonal cycle itself is not flagged
+ANOMALY_METHOD = 'climatology'
+
+
+def generate_all_cache(workers=1, tf_threads=None, engine='lstm', force=False, dpi='print'):
+    """Generate all possible analysis plots and cache them
+    
+    Args:
+        workers (int): Processes used for the per-station plots (1 = serial)
+        tf_threads (int): TensorFlow intra/inter-op threads per worker
+            (defaults to 1 for the LSTM engine when running in parallel)
+        engine (str): Forecasting engine used for the trend plots
+        force (bool): Regenerate every plot even if the manifest says it is current
+        dpi (str or float): Output resolution, a number or a DPI preset name
+    """
     
     print("🚀 Starting cache generation for Climate Analysis Webapp...")
     print("This will pre-generate all possible analyses for instant serving.")
@@ -27,8 +51,8 @@ def generate_all_cache():
     # Initialize components
     data_path = os.path.join('data', 'climate_data.csv')
     processor = DataProcessor(data_path)
-    ml = ClimateML()
-    visualizer = ClimateVisualizer()
+    ml = ClimateML(registry=ModelRegistry('models'))
+    visualizer = ClimateVisualizer(renderer='agg', dpi=dpi)
     
     # Load and clean data
     print("📊 Loading and cleaning data...")
@@ -36,8 +60,10 @@ def generate_all_cache():
     df = processor.clean_data()
     
     # Create static directory if it doesn't exist
-    static_dir = Path('webapp/static')
+    static_dir = Path(STATIC_DIR)
     static_dir.mkdir(exist_ok=True)
+    manifest = CacheManifest(MANIFEST_PATH)
+    version = code_version(ARTIFACT_CODE_FILES)
     
     # Get unique stations
     stations = df['station_name'].unique()
@@ -45,50 +71,150 @@ def generate_all_cache():
     
     # Generate all possible analyses
     analyses_generated = 0
+    analyses_skipped = 0
+    failures = []
+    expected = []
+    
+    def is_current(filename, input_hash, params):
+        return not force and manifest.is_current(filename, input_hash, params, version, STATIC_DIR)
+    
+    # Score every station against its own baseline in one batch
+    flags, _ = ml.detect_anomalies_batch(df, threshold=2.0, method=ANOMALY_METHOD)
+    df = df.assign(is_anomaly=flags)
     
     # 1. Temperature Analysis for each individual station
-    print("\n🌡️  Generating temperature analysis for each station...")
-    for station in stations:
-        print(f"   Processing: {station}")
+    trend_params = {'forecast_period': 30, 'anomaly_threshold': 2.0, 'anomaly_method': ANOMALY_METHOD,
+                    'engine': engine, 'dpi': visualizer.dpi}
+    if engine == 'lstm':
+        trend_params['lstm_config'] = ml.lstm_config
+    stale = {}
+    for station, station_data in df.groupby('station_name', observed=True, sort=False):
+        filename = artifact_filename('trend', station)
+        input_hash = hash_frame(station_data)
+        expected.append(filename)
+        if is_current(filename, input_hash, trend_params):
+            analyses_skipped += 1
+            print(f"   ⏭️  Up to date: {station}")
+        else:
+            stale[station] = (station_data, filename, input_hash)
+    
+    print(f"\n🌡️  Generating temperature analysis for {len(stale)} station(s) ({workers} worker(s))...")
+    station_slices = [(station, station_data) for station, (station_data, _, _) in stale.items()]
+    for station, error in run_station_tasks(station_slices, workers, tf_threads, engine, dpi):
+        if error is None:
+            _, filename, input_hash = stale[station]
+            manifest.record(filename, 'trend', station, input_hash, trend_params, version)
+            manifest.save()
+            analyses_generated += 1
+            print(f"   ✅ Generated trend analysis for {station}")
+        else:
+            failures.append((station, error))
+            print(f"   ❌ Error processing {station}")
+    
+    # 2 & 3. Dataset-wide plots: clustering and heatmap
+    dataset_hash = hash_frame(df, columns=DATASET_HASH_COLUMNS)
+    global_tasks = [
+        ('clustering', "🗺️  Generating regional clustering analysis...", {'n_clusters': 2, 'dpi': visualizer.dpi},
+         lambda: generate_clustering_analysis(df, ml, visualizer)),
+        ('heatmap', "🔥 Generating temperature heatmap...", {'aggregate': 'yearly_mean', 'dpi': visualizer.dpi},
+         lambda: generate_heatmap(df, visualizer)),
+    ]
+    for kind, message, params, generate in global_tasks:
+        print(f"\n{message}")
+        filename = artifact_filename(kind)
+        expected.append(filename)
+        if is_current(filename, dataset_hash, params):
+            analyses_skipped += 1
+            print(f"   ⏭️  Up to date: {filename}")
+            continue
         try:
-            # Filter data for this station
-            station_data = df[df['station_name'] == station]
-            
-            if len(station_data) > 0:
-                # Generate trend plot with predictions and anomalies
-                generate_trend_plot_for_station(station_data, ml, visualizer, station)
-                analyses_generated += 1
-                print(f"   ✅ Generated trend analysis for {station}")
-            else:
-                print(f"   ⚠️  No data for {station}")
-                
+            generate()
+            manifest.record(filename, kind, None, dataset_hash, params, version)
+            analyses_generated += 1
+            print(f"   ✅ Generated {kind} analysis")
         except Exception as e:
-            print(f"   ❌ Error processing {station}: {str(e)}")
+            failures.append((kind, traceback.format_exc()))
+            print(f"   ❌ Error generating {kind}: {str(e)}")
     
-    # 2. Regional Clustering Analysis
-    print("\n🗺️  Generating regional clustering analysis...")
-    try:
-        generate_clustering_analysis(df, ml, visualizer)
-        analyses_generated += 1
-        print("   ✅ Generated clustering analysis")
-    except Exception as e:
-        print(f"   ❌ Error generating clustering: {str(e)}")
-    
-    # 3. Temperature Heatmap
-    print("\n🔥 Generating temperature heatmap...")
-    try:
-        generate_heatmap(df, visualizer)
-        analyses_generated += 1
-        print("   ✅ Generated temperature heatmap")
-    except Exception as e:
-        print(f"   ❌ Error generating heatmap: {str(e)}")
+    # Drop plots for stations that are no longer in the dataset
+    for filename in manifest.remove_orphans(expected, STATIC_DIR):
+        print(f"   🗑️  Removed orphaned {filename}")
+    manifest.save()
     
     print("\n" + "=" * 60)
     print(f"🎉 Cache generation complete!")
-    print(f"📈 Generated {analyses_generated} analysis types")
+    print(f"📈 Generated {analyses_generated} analyses, {analyses_skipped} already up to date")
     print(f"📁 All plots saved to: webapp/static/")
-    print("\n💡 Your website will now serve these pre-generated analyses instantly!")
-    print("   No more waiting for LSTM training or memory issues on Render!")
+    if failures:
+        print(f"\n⚠️  {len(failures)} task(s) failed:")
+        for name, error in failures:
+            print(f"\n--- {name} ---\n{error.rstrip()}")
+    else:
+        print("\n💡 Your website will now serve these pre-generated analyses instantly!")
+        print("   No more waiting for LSTM training or memory issues on Render!")
+    return failures
+
+# Per-process state for station tasks, created by _init_station_worker
+_worker_ml = None
+_worker_visualizer = None
+
+def _init_station_worker(tf_threads=None, engine='lstm', dpi='print'):
+    """Create the per-process ML/plotting objects and pin TensorFlow's thread pools
+    
+    TensorFlow is only imported for the LSTM engine; other engines never need it.
+    """
+    global _worker_ml, _worker_visualizer
+    
+    if tf_threads:
+        # Must be set before TensorFlow is first imported in this process
+        for var in ('TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS', 'OMP_NUM_THREADS'):
+            os.environ[var] = str(tf_threads)
+    if tf_threads and engine == 'lstm':
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(tf_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(tf_threads)
+    
+    _worker_ml = ClimateML(registry=ModelRegistry('models'), engine=engine)
+    _worker_visualizer = ClimateVisualizer(renderer='agg', dpi=dpi)
+
+def _station_task(station, station_data):
+    """Render one station's trend plot; returns (station, traceback or None)"""
+    try:
+        if len(station_data) == 0:
+            raise ValueError(f"No data for {station}")
+        generate_trend_plot_for_station(station_data, _worker_ml, _worker_visualizer, station)
+        return station, None
+    except Exception:
+        return station, traceback.format_exc()
+
+def run_station_tasks(station_slices, workers=1, tf_threads=None, engine='lstm', dpi='print'):
+    """Run the per-station pipeline serially or on a process pool
+    
+    Yields (station, error) pairs as stations finish; a failing station never
+    stops the others.
+    """
+    if workers <= 1:
+        _init_station_worker(tf_threads, engine, dpi)
+        for station, station_data in station_slices:
+            print(f"   Processing: {station}")
+            yield _station_task(station, station_data)
+        return
+    
+    # spawn gives each worker a clean TensorFlow runtime
+    context = multiprocessing.get_context('spawn')
+    if engine == 'lstm':
+        tf_threads = tf_threads or 1  # one TensorFlow thread per worker unless asked otherwise
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_station_worker,
+                             initargs=(tf_threads, engine, dpi)) as executor:
+        futures = {executor.submit(_station_task, station, station_data): station
+                   for station, station_data in station_slices}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception:
+                # e.g. the worker process died
+                yield futures[future], traceback.format_exc()
 
 def generate_trend_plot_for_station(station_data, ml, visualizer, station_name):
     """Generate trend analysis plot for a specific station"""
@@ -101,15 +227,19 @@ def generate_trend_plot_for_station(station_data, ml, visualizer, station_name):
     predictions = ml.predict_temperature(
         np.array(temperatures), 
         np.array(temperatures), 
-        forecast_period=30
+        forecast_period=30,
+        station=station_name,
+        dates=station_data['date'].to_numpy()
     )
     
-    # Detect anomalies
-    anomalies = ml.detect_anomalies(np.array(temperatures), threshold=2.0)
+    # Detect anomalies (precomputed for all stations by generate_all_cache)
+    if 'is_anomaly' in station_data:
+        anomalies = station_data['is_anomaly'].to_numpy()
+    else:
+        anomalies = ml.detect_anomalies(np.array(temperatures), threshold=2.0, method=ANOMALY_METHOD,
+                                        dates=station_data['date'].to_numpy())
     
-    # Create safe filename
-    safe_name = station_name.replace(' ', '_').replace(',', '').replace('/', '_')[:50]
-    output_path = f"webapp/static/trend_analysis_{safe_name}.png"
+    output_path = os.path.join(STATIC_DIR, artifact_filename('trend', station_name))
     
     # Generate plot
     visualizer.plot_temperature_with_predictions_and_anomalies(
@@ -121,47 +251,54 @@ def generate_trend_plot_for_station(station_data, ml, visualizer, station_name):
 def generate_clustering_analysis(df, ml, visualizer):
     """Generate regional clustering analysis"""
     
-    # Group data by station
-    stations_data = {}
-    for station in df['station_name'].unique():
-        station_data = df[df['station_name'] == station]
-        if len(station_data) > 0:
-            stations_data[station] = station_data['temperature'].values
-    
-    # Perform clustering
-    cluster_results = ml.cluster_regions(stations_data, n_clusters=2)
+    # Fit fresh centroids and save them for the webapp to assign stations with
+    cluster_results = ml.cluster_stations(df, n_clusters=2, model_path=CLUSTER_MODEL_PATH, refit=True)
     
     # Generate plot
     station_names = list(cluster_results.keys())
     cluster_ids = list(cluster_results.values())
     
-    output_path = "webapp/static/climate_clusters.png"
+    output_path = os.path.join(STATIC_DIR, artifact_filename('clustering'))
     visualizer.plot_cluster_summary(station_names, cluster_ids, output_path)
 
 def generate_heatmap(df, visualizer):
     """Generate temperature heatmap"""
     
-    # Create pivot table for heatmap
-    df['year'] = df['date'].dt.year
-    heatmap_data = df.pivot_table(
-        values='temperature', 
-        index='station_name', 
-        columns='year', 
-        aggfunc='mean'
-    )
+    # Station x year means
+    heatmap_data = heatmap_frame(df, period='year')
     
     # Generate plot
-    output_path = "webapp/static/temperature_heatmap.png"
+    output_path = os.path.join(STATIC_DIR, artifact_filename('heatmap'))
     visualizer.plot_temperature_heatmap(
         heatmap_data, 
         title="Average Yearly Temperature by Station",
         output_path=output_path
     )
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-generate the webapp's analysis plots")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes for per-station work (0 = one per CPU, default 1)')
+    parser.add_argument('--tf-threads', type=int, default=None,
+                        help='TensorFlow threads per worker (default 1 for the lstm engine when --workers > 1)')
+    parser.add_argument('--engine', choices=ClimateML.available_engines(), default='lstm',
+                        help='forecasting engine for the trend plots (default lstm)')
+    parser.add_argument('--dpi', choices=list(DPI_PRESETS), default='print',
+                        help='output resolution preset (default print)')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate every plot, ignoring the cache manifest')
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    workers = args.workers or os.cpu_count()
+    
     start_time = time.time()
-    generate_all_cache()
+    failures = generate_all_cache(workers=workers, tf_threads=args.tf_threads, engine=args.engine,
+                                  force=args.force, dpi=args.dpi)
     end_time = time.time()
     
     print(f"\n⏱️  Total time: {end_time - start_time:.2f} seconds")
-    print("\n🚀 Ready to deploy! All analyses are now cached for instant serving.") 
\ No newline at end of file
+    if failures:
+        sys.exit(1)
+    print("\n🚀 Ready to deploy! All analyses are now cached for instant serving.")
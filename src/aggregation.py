@@ -0,0 +1,104 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .station_matrix import StationMatrix
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from station_matrix import StationMatrix
+
+# Column periods a heatmap can aggregate to: calendar year, or calendar
+# month pooled over all years (a seasonal profile)
+HEATMAP_PERIODS = ('year', 'month')
+
+
+def period_codes(dates, period: str = 'year') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer-code dates by year or calendar month.
+
+    Args:
+        dates: Array-like of dates (anything ``np.datetime64`` accepts)
+        period (str): 'year' or 'month'
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Code of each date and the sorted period
+            labels (years, or month numbers 1-12) the codes index into
+    """
+    if period not in HEATMAP_PERIODS:
+        raise ValueError(f"Unknown period: {period}. Choose from {', '.join(HEATMAP_PERIODS)}")
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if period == 'year':
+        keys = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    else:
+        keys = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    labels, codes = np.unique(keys, return_inverse=True)
+    return codes.reshape(-1), labels
+
+
+def grouped_means(values: np.ndarray, segments: np.ndarray, dates, period: str = 'year',
+                  n_segments: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of every (station, period) cell in one bincount pass.
+
+    Args:
+        values (np.ndarray): Readings of all stations; NaNs are skipped
+        segments (np.ndarray): Integer station code of each reading
+        dates: Date of each reading; undated readings are skipped
+        period (str): 'year' or 'month'
+        n_segments (int, optional): Number of stations (defaults to max code + 1)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Means of shape (stations, periods), NaN
+            for empty cells, and the period labels of the columns
+    """
+    values = np.asarray(values, dtype=float)
+    segments = np.asarray(segments, dtype=np.int64)
+    if n_segments is None:
+        n_segments = int(segments.max()) + 1 if len(segments) else 0
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    valid = ~np.isnan(values) & ~np.isnat(dates)
+    codes, labels = period_codes(dates[valid], period)
+    cells = segments[valid] * len(labels) + codes
+    size = n_segments * len(labels)
+    counts = np.bincount(cells, minlength=size)
+    sums = np.bincount(cells, weights=values[valid], minlength=size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+    return means.reshape(n_segments, len(labels)), labels
+
+
+def heatmap_frame(data: Union[pd.DataFrame, StationMatrix], period: str = 'year',
+                  by: str = 'station_name') -> pd.DataFrame:
+    """
+    Station x period mean temperatures, ready for ``plot_temperature_heatmap``.
+
+    Equivalent to ``pivot_table(index=by, columns=period, values='temperature',
+    aggfunc='mean')`` but computed from integer codes, without adding a
+    column to the input frame.
+
+    Args:
+        data: Cleaned data with ``by``, ``date`` and ``temperature`` columns,
+            or a ``StationMatrix``
+        period (str): 'year' or 'month'
+        by (str): Column identifying the station
+
+    Returns:
+        pd.DataFrame: Stations (sorted) as rows and periods as columns
+    """
+    if isinstance(data, StationMatrix):
+        values, codes, dates = data.long_arrays()
+        names = data.labels(by)
+    else:
+        # Like pivot_table, rows without a station label are left out
+        labelled = data[by].notna().to_numpy()
+        codes, names = pd.factorize(data[by][labelled])
+        values = data['temperature'].to_numpy(dtype=float)[labelled]
+        dates = data['date'].to_numpy()[labelled]
+    means, labels = grouped_means(values, codes, dates, period, n_segments=len(names))
+
+    # Like pivot_table: sorted stations, none without readings
+    order = np.argsort(np.asarray(names, dtype=str), kind='stable')
+    order = order[~np.isnan(means[order]).all(axis=1)]
+    return pd.DataFrame(means[order], index=pd.Index(np.asarray(names)[order], name=by),
+                        columns=pd.Index(labels, name=period))
@@ -0,0 +1,369 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Scoring methods accepted by anomaly_scores / detect_anomalies
+ANOMALY_METHODS = ('zscore', 'rolling', 'climatology', 'mad')
+
+# Days of year (1-366) are mapped to slots 0-365
+DAYS_IN_YEAR = 366
+# Scale making the median absolute deviation comparable to a standard deviation
+MAD_SCALE = 1.4826
+
+
+def _ratio(deviation: np.ndarray, spread: np.ndarray) -> np.ndarray:
+    # Zero or undefined spread scores 0: a constant baseline flags nothing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.abs(deviation) / spread
+    return np.where(np.isfinite(scores), scores, 0.0)
+
+
+def day_of_year_slots(dates) -> np.ndarray:
+    """
+    Map dates to day-of-year slots 0-365.
+
+    Args:
+        dates: Array-like of dates (anything ``np.datetime64`` accepts)
+
+    Returns:
+        np.ndarray: int64 slot per date
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    years = days.astype('datetime64[Y]')
+    return (days - years).astype(np.int64)
+
+
+def _segment_codes(values: np.ndarray, segments) -> Tuple[np.ndarray, int]:
+    if segments is None:
+        return np.zeros(len(values), dtype=np.int64), 1
+    segments = np.asarray(segments, dtype=np.int64)
+    return segments, int(segments.max()) + 1 if len(segments) else 0
+
+
+def _segment_medians(values: np.ndarray, segments: np.ndarray, n_segments: int) -> np.ndarray:
+    # One lexsort orders every segment's values; medians are then read off
+    # at each segment's middle position(s)
+    if len(values) == 0:
+        return np.full(n_segments, np.nan)
+    order = np.lexsort((values, segments))
+    counts = np.bincount(segments, minlength=n_segments)
+    offsets = np.r_[0, np.cumsum(counts)[:-1]]
+    with np.errstate(invalid='ignore'):
+        low = values[order][np.minimum(offsets + (counts - 1) // 2, len(values) - 1)]
+        high = values[order][np.minimum(offsets + counts // 2, len(values) - 1)]
+    return np.where(counts > 0, (low + high) / 2, np.nan)
+
+
+def zscore_scores(values: np.ndarray, segments=None) -> np.ndarray:
+    """
+    Absolute z-scores against the mean and std (ddof=0) of each segment.
+
+    Args:
+        values (np.ndarray): Readings; NaNs score 0
+        segments (np.ndarray, optional): Integer segment (station) code of each
+            reading; without it the whole series is one segment
+
+    Returns:
+        np.ndarray: float64 scores
+    """
+    values = np.asarray(values, dtype=float)
+    segments, n_segments = _segment_codes(values, segments)
+    valid = ~np.isnan(values)
+    counts = np.bincount(segments[valid], minlength=n_segments)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.bincount(segments[valid], weights=values[valid], minlength=n_segments) / counts
+        deviation = values - means[segments]
+        std = np.sqrt(np.bincount(segments[valid], weights=deviation[valid] ** 2,
+                                  minlength=n_segments) / counts)
+    return _ratio(np.nan_to_num(deviation), std[segments])
+
+
+def rolling_zscore_scores(values: np.ndarray, window: int = 30, min_periods: int = 10,
+                          segments=None) -> np.ndarray:
+    """
+    Absolute z-scores against the ``window`` readings preceding each value.
+
+    Means and variances of every trailing window come from cumulative sums,
+    so the cost is O(n) whatever the window length. A value never takes part
+    in its own baseline, so a spike cannot mask itself.
+
+    Args:
+        values (np.ndarray): Readings in time order within each segment; NaNs are skipped
+        window (int): Number of preceding readings in each baseline
+        min_periods (int): Readings a baseline needs before it scores anything
+        segments (np.ndarray, optional): Segment code of each reading; rows of
+            a segment must be contiguous, and windows never cross segments
+
+    Returns:
+        np.ndarray: float64 scores (0 where the baseline is too short)
+    """
+    values = np.asarray(values, dtype=float)
+    segments, n_segments = _segment_codes(values, segments)
+    valid = ~np.isnan(values)
+    # Centering on each segment's mean keeps the running sums of squares well conditioned
+    counts = np.bincount(segments[valid], minlength=n_segments)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.bincount(segments[valid], weights=values[valid], minlength=n_segments) / counts
+    centered = np.where(valid, values - np.nan_to_num(means)[segments], 0.0)
+    sums = np.r_[0.0, np.cumsum(centered)]
+    squares = np.r_[0.0, np.cumsum(centered ** 2)]
+    running = np.r_[0, np.cumsum(valid)]
+
+    end = np.arange(len(values))
+    first_row = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]]) if len(values) else end
+    segment_start = np.repeat(first_row, np.diff(np.r_[first_row, len(values)]))
+    start = np.maximum(end - window, segment_start)
+    n = running[end] - running[start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (sums[end] - sums[start]) / n
+        variance = (squares[end] - squares[start] - n * mean ** 2) / (n - 1)
+    scores = _ratio(centered - mean, np.sqrt(np.maximum(variance, 0.0)))
+    return np.where(valid & (n >= min_periods), scores, 0.0)
+
+
+def _pool_slots(table: np.ndarray, half_width: int) -> np.ndarray:
+    # Circular moving sums over +-half_width day slots (Dec 31 borders Jan 1)
+    pooled = table.copy()
+    for offset in range(1, half_width + 1):
+        pooled += np.roll(table, offset, axis=-1) + np.roll(table, -offset, axis=-1)
+    return pooled
+
+
+def climatology_baseline(values: np.ndarray, dates, half_width: int = 7,
+                         segments=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and std of each day of year, pooled over neighbouring days.
+
+    Args:
+        values (np.ndarray): Daily readings
+        dates: Date of each reading
+        half_width (int): Days on either side pooled into each day's baseline
+        segments (np.ndarray, optional): Segment code of each reading
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Mean and std (ddof=1) per day-of-year
+            slot, shaped (366,) or (segments, 366) when segments are given
+    """
+    values = np.asarray(values, dtype=float)
+    days = np.asarray(dates, dtype='datetime64[D]')
+    codes, n_segments = _segment_codes(values, segments)
+    valid = ~np.isnan(values) & ~np.isnat(days)
+    cells = (codes * DAYS_IN_YEAR + day_of_year_slots(days))[valid]
+    size = n_segments * DAYS_IN_YEAR
+    table = np.stack([
+        np.bincount(cells, minlength=size),
+        np.bincount(cells, weights=values[valid], minlength=size),
+        np.bincount(cells, weights=values[valid] ** 2, minlength=size),
+    ]).reshape(3, n_segments, DAYS_IN_YEAR).astype(float)
+    counts, sums, squares = _pool_slots(table, half_width)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+        variance = (squares - counts * mean ** 2) / (counts - 1)
+    std = np.sqrt(np.maximum(variance, 0.0))
+    if segments is None:
+        return mean[0], std[0]
+    return mean, std
+
+
+def climatology_scores(values: np.ndarray, dates, half_width: int = 7, segments=None) -> np.ndarray:
+    """
+    Absolute z-scores against the day-of-year climatology of each segment.
+
+    A hot July day is compared with other July days, not with the annual
+    mean, so the seasonal cycle itself is never flagged.
+
+    Args:
+        values (np.ndarray): Daily readings; NaNs and undated readings score 0
+        dates: Date of each reading
+        half_width (int): Days on either side pooled into each day's baseline
+        segments (np.ndarray, optional): Segment code of each reading
+
+    Returns:
+        np.ndarray: float64 scores
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    dated = ~np.isnat(days)
+    values = np.where(dated, np.asarray(values, dtype=float), np.nan)
+    codes, _ = _segment_codes(values, segments)
+    mean, std = climatology_baseline(values, days, half_width, codes)
+    slots = np.where(dated, day_of_year_slots(days), 0)
+    return _ratio(np.nan_to_num(values - mean[codes, slots]), std[codes, slots])
+
+
+def mad_scores(values: np.ndarray, segments=None) -> np.ndarray:
+    """
+    Robust scores: distance from the median in scaled median absolute deviations.
+
+    Unlike the mean and std, the median and MAD are not dragged towards the
+    outliers being looked for.
+
+    Args:
+        values (np.ndarray): Readings; NaNs score 0
+        segments (np.ndarray, optional): Segment code of each reading
+
+    Returns:
+        np.ndarray: float64 scores
+    """
+    values = np.asarray(values, dtype=float)
+    segments, n_segments = _segment_codes(values, segments)
+    valid = ~np.isnan(values)
+    medians = _segment_medians(values[valid], segments[valid], n_segments)
+    deviation = values - medians[segments]
+    mad = MAD_SCALE * _segment_medians(np.abs(deviation[valid]), segments[valid], n_segments)
+    return _ratio(np.nan_to_num(deviation), mad[segments])
+
+
+def anomaly_scores(values: np.ndarray, method: str = 'zscore', dates=None, segments=None,
+                   **options) -> np.ndarray:
+    """
+    Score every reading with one of ``ANOMALY_METHODS``.
+
+    With ``segments`` many stations are scored in one pass, each against its
+    own baseline, using bincount reductions instead of a per-station loop.
+
+    Args:
+        values (np.ndarray): Readings, in time order within each segment
+        method (str): 'zscore', 'rolling', 'climatology' or 'mad'
+        dates: Date of each reading (required by 'climatology')
+        segments (np.ndarray, optional): Integer station code of each reading,
+            with each station's rows contiguous
+        **options: Method parameters (``window``/``min_periods`` for rolling,
+            ``half_width`` for climatology)
+
+    Returns:
+        np.ndarray: float64 score per reading; larger is more anomalous
+    """
+    if method == 'zscore':
+        return zscore_scores(values, segments)
+    if method == 'rolling':
+        return rolling_zscore_scores(values, segments=segments, **options)
+    if method == 'climatology':
+        if dates is None:
+            raise ValueError("The climatology method needs the date of each reading")
+        return climatology_scores(values, dates, segments=segments, **options)
+    if method == 'mad':
+        return mad_scores(values, segments)
+    raise ValueError(f"Unknown anomaly method: {method}. Choose from {', '.join(ANOMALY_METHODS)}")
+
+
+class StreamingAnomalyDetector:
+    """
+    Scores newly ingested readings in O(1) from per-station accumulators.
+
+    Each station keeps Welford count/mean/M2 accumulators, either one for
+    the whole record or one per day-of-year slot when ``seasonal`` is set.
+    A reading is scored against the accumulators before being folded in, so
+    history is never rescanned. Seasonal scores pool ``half_width`` slots on
+    either side of the reading's day, merged with Chan's formula.
+    """
+
+    def __init__(self, threshold: float = 2.0, seasonal: bool = True,
+                 half_width: int = 7, min_count: int = 10):
+        """
+        Initialize an empty detector.
+
+        Args:
+            threshold (float): Score above which a reading is anomalous
+            seasonal (bool): Keep a baseline per day of year instead of one per station
+            half_width (int): Neighbouring day slots pooled into a seasonal baseline
+            min_count (int): Readings a baseline needs before it flags anything
+        """
+        self.threshold = threshold
+        self.seasonal = seasonal
+        self.half_width = half_width if seasonal else 0
+        self.min_count = min_count
+        # station -> array of shape (3, slots) holding count, mean and M2
+        self._state: Dict[str, np.ndarray] = {}
+
+    def _slots(self) -> int:
+        return DAYS_IN_YEAR if self.seasonal else 1
+
+    def _slot(self, date) -> int:
+        return int(day_of_year_slots([date])[0]) if self.seasonal else 0
+
+    def fit(self, station: str, values: np.ndarray, dates=None) -> 'StreamingAnomalyDetector':
+        """
+        Seed a station's accumulators from its history in one vectorized pass.
+
+        Args:
+            station (str): Station name or id
+            values (np.ndarray): Historical readings
+            dates: Date of each reading (required when seasonal)
+
+        Returns:
+            StreamingAnomalyDetector: self, for chaining
+        """
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        if self.seasonal:
+            if dates is None:
+                raise ValueError("A seasonal detector needs the date of each reading")
+            slots = day_of_year_slots(dates)[valid]
+        else:
+            slots = np.zeros(valid.sum(), dtype=np.int64)
+        values = values[valid]
+        counts = np.bincount(slots, minlength=self._slots()).astype(float)
+        sums = np.bincount(slots, weights=values, minlength=self._slots())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(counts > 0, sums / counts, 0.0)
+        m2 = np.bincount(slots, weights=(values - means[slots]) ** 2, minlength=self._slots())
+        self._state[station] = np.stack([counts, means, m2])
+        return self
+
+    def score(self, station: str, value: float, date=None) -> float:
+        """
+        Score a reading against the station's baseline without recording it.
+
+        Args:
+            station (str): Station name or id
+            value (float): New reading
+            date: Date of the reading (required when seasonal)
+
+        Returns:
+            float: Absolute z-score, 0 while the baseline is too short
+        """
+        state = self._state.get(station)
+        if state is None:
+            return 0.0
+        slot = self._slot(date)
+        if self.half_width:
+            window = np.arange(slot - self.half_width, slot + self.half_width + 1) % DAYS_IN_YEAR
+            counts, means, m2 = state[:, window]
+        else:
+            counts, means, m2 = state[:, slot:slot + 1]
+        total = counts.sum()
+        if total < max(self.min_count, 2):
+            return 0.0
+        mean = (counts * means).sum() / total
+        variance = (m2.sum() + (counts * (means - mean) ** 2).sum()) / (total - 1)
+        return float(_ratio(np.array([value - mean]), np.sqrt(variance))[0])
+
+    def update(self, station: str, value: float, date=None) -> Tuple[bool, float]:
+        """
+        Score a new reading, then fold it into the station's baseline.
+
+        Args:
+            station (str): Station name or id
+            value (float): New reading; NaN is scored 0 and not recorded
+            date: Date of the reading (required when seasonal)
+
+        Returns:
+            Tuple[bool, float]: Whether the reading is anomalous, and its score
+        """
+        score = self.score(station, value, date)
+        if value == value:  # not NaN
+            state = self._state.get(station)
+            if state is None:
+                state = self._state[station] = np.zeros((3, self._slots()))
+            slot = self._slot(date)
+            state[0, slot] += 1
+            delta = value - state[1, slot]
+            state[1, slot] += delta / state[0, slot]
+            state[2, slot] += delta * (value - state[1, slot])
+        return score > self.threshold, score
+
+    def __contains__(self, station: str) -> bool:
+        return station in self._state
+
+    def __len__(self) -> int:
+        return len(self._state)
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FORMAT_VERSION = 1
+
+# Plot filename prefix for each per-station artifact kind
+STATION_ARTIFACT_PREFIXES = {
+    'trend': 'trend_analysis',
+    'anomaly': 'anomaly_analysis',
+    'prediction': 'prediction',
+}
+
+# Fixed filenames of the dataset-wide artifacts
+GLOBAL_ARTIFACT_FILENAMES = {
+    'clustering': 'climate_clusters.png',
+    'heatmap': 'temperature_heatmap.png',
+}
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Source files whose changes invalidate every cached plot; shared by the
+# generator and the webapp so both compute the same code version
+ARTIFACT_CODE_FILES = [
+    os.path.join(_ROOT_DIR, 'src', 'ml_algorithms.py'),
+    os.path.join(_ROOT_DIR, 'src', 'forecasters.py'),
+    os.path.join(_ROOT_DIR, 'src', 'anomaly.py'),
+    os.path.join(_ROOT_DIR, 'src', 'clustering.py'),
+    os.path.join(_ROOT_DIR, 'src', 'aggregation.py'),
+    os.path.join(_ROOT_DIR, 'src', 'visualizer.py'),
+    os.path.join(_ROOT_DIR, 'generate_cache.py'),
+]
+
+
+def safe_station_name(station: str, max_length: int = 50) -> str:
+    """Turn a station name into the filename fragment used for its plots."""
+    return station.replace(' ', '_').replace(',', '').replace('/', '_')[:max_length]
+
+
+def artifact_filename(kind: str, station: Optional[str] = None) -> str:
+    """
+    Return the conventional filename of a cached plot.
+
+    Args:
+        kind (str): Artifact kind ('trend', 'anomaly', 'prediction', 'clustering', 'heatmap')
+        station (str, optional): Station name, required for per-station kinds
+
+    Returns:
+        str: PNG filename relative to the static directory
+    """
+    if kind in GLOBAL_ARTIFACT_FILENAMES:
+        return GLOBAL_ARTIFACT_FILENAMES[kind]
+    if kind not in STATION_ARTIFACT_PREFIXES:
+        raise ValueError(f"Unknown artifact kind: {kind}")
+    return f"{STATION_ARTIFACT_PREFIXES[kind]}_{safe_station_name(station)}.png"
+
+
+# Columns hashed for the dataset-wide artifacts (clustering, heatmap)
+DATASET_HASH_COLUMNS = ('station_name', 'date', 'temperature')
+
+
+def hash_frame(df: pd.DataFrame, columns: Iterable[str] = ('station_id', 'date', 'temperature')) -> str:
+    """
+    Hash the content of a data slice, independent of its index and row order.
+
+    The generator and the webapp hold the same rows in different orders, so
+    row hashes are sorted before they are combined.
+
+    Args:
+        df (pd.DataFrame): Input rows of an artifact
+        columns (Iterable[str]): Columns that affect the artifact
+
+    Returns:
+        str: Hex digest of the rows
+    """
+    columns = [c for c in columns if c in df.columns]
+    row_hashes = np.sort(pd.util.hash_pandas_object(df[columns], index=False).to_numpy())
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def code_version(paths: Iterable[str]) -> str:
+    """
+    Hash the source files that produce the artifacts.
+
+    Args:
+        paths (Iterable[str]): Source files (missing files are skipped)
+
+    Returns:
+        str: Short hex digest that changes whenever any of the files change
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class CacheManifest:
+    """
+    JSON record of every cached plot and the inputs it was built from.
+
+    Each artifact entry stores its kind, station, the hash of its input data
+    slice, the model/plot parameters and the code version. An artifact is
+    current only while all three are unchanged and the file still exists.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the manifest, loading it if it already exists.
+
+        Args:
+            path (str): Location of the manifest JSON file
+        """
+        self.path = path
+        self.artifacts: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_FORMAT_VERSION:
+                self.artifacts = data.get('artifacts', {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, filename: str, input_hash: str, params: Dict[str, Any],
+                   version: str, static_dir: str) -> bool:
+        """
+        Check whether a cached plot can be reused as is.
+
+        Args:
+            filename (str): Artifact filename
+            input_hash (str): Hash of the artifact's input data now
+            params (Dict[str, Any]): Model/plot parameters now
+            version (str): Code version now
+            static_dir (str): Directory holding the artifacts
+
+        Returns:
+            bool: True if the recorded entry matches and the file exists
+        """
+        entry = self.artifacts.get(filename)
+        return (
+            entry is not None
+            and entry['input_hash'] == input_hash
+            and entry['params'] == json.loads(json.dumps(params))
+            and entry['code_version'] == version
+            and os.path.exists(os.path.join(static_dir, filename))
+        )
+
+    def record(self, filename: str, kind: str, station: Optional[str], input_hash: str,
+               params: Dict[str, Any], version: str) -> None:
+        """Add or replace the entry for a freshly generated artifact."""
+        self.artifacts[filename] = {
+            'kind': kind,
+            'station': station,
+            'input_hash': input_hash,
+            'params': params,
+            'code_version': version,
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    def remove_orphans(self, expected: Iterable[str], static_dir: str) -> List[str]:
+        """
+        Delete artifacts recorded in the manifest that are no longer expected.
+
+        Only files the manifest owns are removed; hand-placed static files are
+        never touched.
+
+        Args:
+            expected (Iterable[str]): Filenames the current dataset should have
+            static_dir (str): Directory holding the artifacts
+
+        Returns:
+            List[str]: Filenames that were removed
+        """
+        expected = set(expected)
+        removed = []
+        for filename in list(self.artifacts):
+            if filename not in expected:
+                path = os.path.join(static_dir, filename)
+                if os.path.exists(path):
+                    os.remove(path)
+                del self.artifacts[filename]
+                removed.append(filename)
+        return removed
+
+    def find(self, kind: str, station: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+             version: Optional[str] = None, input_hash: Optional[str] = None) -> List[str]:
+        """
+        List recorded artifacts of a kind, optionally for one station.
+
+        Args:
+            kind (str): Artifact kind
+            station (str, optional): Exact station name
+            params (Dict[str, Any], optional): Parameters the artifact must have
+                been built with; keys not given are not compared
+            version (str, optional): Code version the artifact must have been built with
+            input_hash (str, optional): Hash of the input data the artifact must
+                have been built from
+
+        Returns:
+            List[str]: Matching filenames, sorted by station name
+        """
+        wanted = json.loads(json.dumps(params or {}))
+
+        def matches_entry(entry):
+            recorded = entry.get('params') or {}
+            return (
+                entry['kind'] == kind
+                and (station is None or entry.get('station') == station)
+                and (version is None or entry.get('code_version') == version)
+                and (input_hash is None or entry.get('input_hash') == input_hash)
+                and all(key in recorded and recorded[key] == value for key, value in wanted.items())
+            )
+
+        matches = [
+            (entry.get('station') or '', filename)
+            for filename, entry in self.artifacts.items()
+            if matches_entry(entry)
+        ]
+        return [filename for _, filename in sorted(matches)]
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_FORMAT_VERSION, 'artifacts': self.artifacts}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
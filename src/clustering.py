@@ -0,0 +1,198 @@
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from .anomaly import day_of_year_slots
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from anomaly import day_of_year_slots
+
+FEATURE_NAMES = ('mean', 'std', 'min', 'max', 'range',
+                 'seasonal_amplitude', 'seasonal_phase_cos', 'seasonal_phase_sin')
+# Above this many stations KMeans is replaced by MiniBatchKMeans
+MINIBATCH_THRESHOLD = 2000
+DAYS_PER_YEAR = 365.25
+
+
+def station_features(values: np.ndarray, segments: np.ndarray, dates=None,
+                     n_segments: Optional[int] = None) -> np.ndarray:
+    """
+    Compute clustering features for every station in one vectorized pass.
+
+    Moments come from bincount reductions. The seasonal features are the
+    annual Fourier coefficient of each station's series (the DFT bin at a
+    one-year period, evaluated at the actual dates so gaps need no
+    resampling): its amplitude and the phase as a cos/sin pair, so late
+    December and early January peaks stay close.
+
+    Args:
+        values (np.ndarray): Readings of all stations; NaNs are skipped
+        segments (np.ndarray): Integer station code of each reading
+        dates: Date of each reading; without dates each station's readings
+            are taken as consecutive days
+        n_segments (int, optional): Number of stations (defaults to max code + 1)
+
+    Returns:
+        np.ndarray: Array of shape (stations, len(FEATURE_NAMES))
+    """
+    values = np.asarray(values, dtype=float)
+    segments = np.asarray(segments, dtype=np.int64)
+    if n_segments is None:
+        n_segments = int(segments.max()) + 1 if len(segments) else 0
+    valid = ~np.isnan(values)
+    if dates is not None:
+        day = day_of_year_slots(dates).astype(float)
+    else:
+        # Position of each reading within its station
+        first = np.r_[0, np.flatnonzero(segments[1:] != segments[:-1]) + 1]
+        day = (np.arange(len(values)) - np.repeat(first, np.diff(np.r_[first, len(values)]))).astype(float)
+    values, segments, day = values[valid], segments[valid], day[valid]
+
+    def total(weights):
+        return np.bincount(segments, weights=weights, minlength=n_segments)
+
+    counts = np.bincount(segments, minlength=n_segments).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total(values) / counts
+        deviation = values - mean[segments]
+        std = np.sqrt(total(deviation ** 2) / counts)
+        angle = 2 * np.pi * day / DAYS_PER_YEAR
+        cos_part = 2 * total(deviation * np.cos(angle)) / counts
+        sin_part = 2 * total(deviation * np.sin(angle)) / counts
+    minimum = np.full(n_segments, np.inf)
+    maximum = np.full(n_segments, -np.inf)
+    np.minimum.at(minimum, segments, values)
+    np.maximum.at(maximum, segments, values)
+    amplitude = np.hypot(cos_part, sin_part)
+    phase = np.arctan2(sin_part, cos_part)
+    features = np.column_stack([mean, std, minimum, maximum, maximum - minimum,
+                                amplitude, np.cos(phase), np.sin(phase)])
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class StationClusterer:
+    """
+    KMeans clustering of stations on standardized features.
+
+    Fitting uses ``KMeans`` for small station counts and ``MiniBatchKMeans``
+    above ``MINIBATCH_THRESHOLD``. Clusters are then renumbered by their
+    centroid's variability (std, then mean temperature, ascending), so label
+    0 is always the most stable climate regardless of KMeans' random
+    initialization. Centroids and the standardization are plain arrays, so a
+    fitted clusterer can be saved and new stations assigned later with NumPy
+    alone.
+    """
+
+    def __init__(self, n_clusters: int = 2, random_state: int = 42):
+        """
+        Initialize an unfitted clusterer.
+
+        Args:
+            n_clusters (int): Number of clusters
+            random_state (int): Seed of the KMeans initialization
+        """
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.centroids = None
+        self.feature_mean = None
+        self.feature_scale = None
+
+    def _standardize(self, features: np.ndarray) -> np.ndarray:
+        return (np.asarray(features, dtype=float) - self.feature_mean) / self.feature_scale
+
+    def fit(self, features: np.ndarray) -> 'StationClusterer':
+        """
+        Fit the centroids.
+
+        Args:
+            features (np.ndarray): Station features, shape (stations, features)
+
+        Returns:
+            StationClusterer: self, for chaining
+        """
+        features = np.asarray(features, dtype=float)
+        self.feature_mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        self.feature_scale = np.where(scale > 0, scale, 1.0)
+        scaled = self._standardize(features)
+        n_clusters = min(self.n_clusters, len(features))
+
+        if len(features) > MINIBATCH_THRESHOLD:
+            from sklearn.cluster import MiniBatchKMeans
+            kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=self.random_state,
+                                     n_init=3, batch_size=4096)
+        else:
+            from sklearn.cluster import KMeans
+            kmeans = KMeans(n_clusters=n_clusters, random_state=self.random_state, n_init=20, max_iter=500)
+        kmeans.fit(scaled)
+
+        # Renumber clusters by (std, mean) of their centroid in original units
+        centroids = kmeans.cluster_centers_
+        original = centroids * self.feature_scale + self.feature_mean
+        order = np.lexsort((original[:, FEATURE_NAMES.index('mean')], original[:, FEATURE_NAMES.index('std')]))
+        self.centroids = centroids[order]
+        return self
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Assign stations to the nearest fitted centroid.
+
+        Args:
+            features (np.ndarray): Station features, shape (stations, features)
+
+        Returns:
+            np.ndarray: int64 cluster label per station
+        """
+        if self.centroids is None:
+            raise ValueError("StationClusterer has not been fitted")
+        scaled = self._standardize(features)
+        distances = ((scaled[:, np.newaxis, :] - self.centroids[np.newaxis, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1)
+
+    def fit_predict(self, features: np.ndarray) -> np.ndarray:
+        """Fit the centroids and return the label of every station."""
+        return self.fit(features).predict(features)
+
+    def save(self, path: str) -> None:
+        """
+        Persist the fitted centroids and standardization as ``.npz``.
+
+        Args:
+            path (str): Destination file
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, centroids=self.centroids, feature_mean=self.feature_mean,
+                 feature_scale=self.feature_scale, feature_names=np.array(FEATURE_NAMES),
+                 n_clusters=self.n_clusters, random_state=self.random_state)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['StationClusterer']:
+        """
+        Load a clusterer saved with ``save``.
+
+        Args:
+            path (str): File written by ``save``
+
+        Returns:
+            Optional[StationClusterer]: The clusterer, or None when the file is
+                missing or was fitted on different features
+        """
+        try:
+            with np.load(path) as saved:
+                if tuple(saved['feature_names'].tolist()) != FEATURE_NAMES:
+                    return None
+                clusterer = cls(int(saved['n_clusters']), int(saved['random_state']))
+                clusterer.centroids = saved['centroids']
+                clusterer.feature_mean = saved['feature_mean']
+                clusterer.feature_scale = saved['feature_scale']
+        except (OSError, KeyError, ValueError):
+            return None
+        return clusterer
+
+
+def labels_by_station(names: List[str], labels: np.ndarray) -> Dict[str, int]:
+    """Pair station names with their cluster labels as plain ints."""
+    return {name: int(label) for name, label in zip(names, labels)}
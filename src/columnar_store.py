@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+STORE_FORMAT_VERSION = 1
+
+
+class ColumnarStore:
+    """
+    Per-column NumPy storage for a climate CSV.
+
+    Each column is written once as a ``.npy`` file: numeric columns keep their
+    dtype, ``date`` is stored as ``datetime64`` and string columns (station ids,
+    names, regions) are stored as integer category codes with the categories
+    listed in ``meta.json``. Reading memory-maps the files so loading costs no
+    text parsing and untouched pages are never read from disk.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        Initialize the store.
+
+        Args:
+            store_dir (str): Directory holding the column files and metadata
+        """
+        self.store_dir = store_dir
+        self.meta_path = os.path.join(store_dir, 'meta.json')
+
+    @classmethod
+    def for_csv(cls, csv_path: str) -> 'ColumnarStore':
+        """
+        Build the store that sits next to a CSV file.
+
+        Args:
+            csv_path (str): Path to the source CSV
+
+        Returns:
+            ColumnarStore: Store located at ``<dir>/.<name>.columnar``
+        """
+        directory, filename = os.path.split(os.path.abspath(csv_path))
+        stem = os.path.splitext(filename)[0]
+        return cls(os.path.join(directory, f".{stem}.columnar"))
+
+    @staticmethod
+    def _source_signature(csv_path: str) -> Dict[str, int]:
+        stat = os.stat(csv_path)
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, csv_path: str) -> bool:
+        """
+        Check whether the store was built from the CSV as it is now.
+
+        Args:
+            csv_path (str): Path to the source CSV
+
+        Returns:
+            bool: True if the store exists and matches the CSV's mtime and size
+        """
+        meta = self._read_meta()
+        return (
+            meta is not None
+            and meta.get('version') == STORE_FORMAT_VERSION
+            and meta.get('source') == self._source_signature(csv_path)
+        )
+
+    def write(self, df: pd.DataFrame, csv_path: str) -> None:
+        """
+        Convert a freshly parsed CSV frame into column files.
+
+        The ``date`` column is parsed to ``datetime64`` and ``temperature`` is
+        coerced to float, matching what ``DataProcessor.clean_data`` does.
+        The store is built in a temporary directory and swapped in at the end
+        so concurrent readers never see a partial store.
+
+        Args:
+            df (pd.DataFrame): Frame as returned by ``pd.read_csv``
+            csv_path (str): Path to the source CSV (recorded for freshness checks)
+        """
+        tmp_dir = f"{self.store_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        columns = []
+        for position, name in enumerate(df.columns):
+            series = df[name]
+            if name == 'date':
+                series = pd.to_datetime(series, format="%Y-%m-%d", errors='coerce')
+            elif name == 'temperature':
+                series = pd.to_numeric(series, errors='coerce')
+
+            filename = f"col{position}.npy"
+            spec = {'name': name, 'file': filename}
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+                np.save(os.path.join(tmp_dir, filename), series.to_numpy())
+                spec['kind'] = 'array'
+            else:
+                categorical = pd.Categorical(series)
+                categories = categorical.categories
+                np.save(os.path.join(tmp_dir, filename), categorical.codes)
+                spec['kind'] = 'categorical'
+                spec['categories'] = [str(c) for c in categories]
+            columns.append(spec)
+
+        meta = {
+            'version': STORE_FORMAT_VERSION,
+            'source': self._source_signature(csv_path),
+            'rows': len(df),
+            'columns': columns
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        os.replace(tmp_dir, self.store_dir)
+
+    def read(self, mmap: bool = True) -> pd.DataFrame:
+        """
+        Load the stored columns as a DataFrame.
+
+        Args:
+            mmap (bool): Memory-map the column files instead of reading them
+
+        Returns:
+            pd.DataFrame: Frame with typed date/temperature and categorical string columns
+        """
+        meta = self._read_meta()
+        if meta is None:
+            raise FileNotFoundError(f"No columnar store at {self.store_dir}")
+
+        mmap_mode = 'r' if mmap else None
+        data = {}
+        for spec in meta['columns']:
+            values = np.load(os.path.join(self.store_dir, spec['file']), mmap_mode=mmap_mode)
+            if spec['kind'] == 'categorical':
+                values = pd.Categorical.from_codes(values, categories=spec['categories'])
+            data[spec['name']] = values
+        return pd.DataFrame(data, copy=False)
@@ -1,23 +1,45 @@
+import glob
+import hashlib
 import os
+import shutil
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:
+    from .columnar_store import ColumnarStore
+    from .running_stats import RunningStats
+    from .station_matrix import StationMatrix
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from columnar_store import ColumnarStore
+    from running_stats import RunningStats
+    from station_matrix import StationMatrix
 
 class DataProcessor:
     """
     Handles loading, cleaning, and preprocessing of climate data.
     """
     
-    def __init__(self, data_path: str):
+    STORAGE_MODES = ('auto', 'csv', 'columnar')
+
+    def __init__(self, data_path: str, storage: str = 'auto'):
         """
         Initialize the DataProcessor with the path to the data file.
         
         Args:
             data_path (str): Path to the climate data file (CSV/JSON)
+            storage (str): 'csv' always parses the CSV; 'auto' serves the
+                memory-mapped column store, (re)building it when the CSV changed,
+                and falls back to the CSV if the store is unusable; 'columnar'
+                behaves like 'auto' but raises instead of falling back
         """
+        if storage not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage}")
         self.data_path = data_path
+        self.storage = storage
         self.data = None
+        self.cleaning_stats = None
 
     def load_data(self) -> pd.DataFrame:
         """
@@ -31,6 +53,10 @@ class DataProcessor:
             full_path = os.path.join(base_dir, self.data_path)
             if not os.path.exists(full_path):
                 raise FileNotFoundError(f"Resolved path does not exist: {full_path}")
+            if self.storage != 'csv':
+                self.data = self._load_columnar(full_path)
+                if self.data is not None:
+                    return self.data
             self.data = pd.read_csv(
                 full_path,
                 header=0
@@ -38,16 +64,41 @@ class DataProcessor:
             return self.data
         except Exception as e:
             raise Exception(f"Error loading data: {str(e)}")
-            
-    def clean_data(self) -> pd.DataFrame:
+
+    def _load_columnar(self, full_path: str):
+        """
+        Load from the memory-mapped column store, building it on first use.
+
+        Returns None when the store cannot be built or read and the storage
+        mode is 'auto', so the caller falls back to parsing the CSV.
+        """
+        store = ColumnarStore.for_csv(full_path)
+        parsed = None
+        try:
+            if not store.is_fresh(full_path):
+                parsed = pd.read_csv(full_path, header=0)
+                store.write(parsed, full_path)
+            return store.read()
+        except (OSError, ValueError, KeyError):
+            if self.storage == 'columnar':
+                raise
+            return parsed  # e.g. read-only deployments keep using the CSV
+
+    def clean_data(self, by_station: bool = False) -> pd.DataFrame:
         """
         Clean the loaded data by removing nulls and duplicates.
         
+        Args:
+            by_station (bool): Compute outlier bounds and interpolate gaps
+                separately for each station_id (see clean_data_by_station)
+        
         Returns:
             pd.DataFrame: Cleaned climate data
         """
         if self.data is None:
             raise Exception("Data not loaded. Call load_data() first.")
+        if by_station:
+            return self.clean_data_by_station()
             
         # Remove duplicate entries
         self.data = self.data.drop_duplicates()
@@ -69,6 +120,189 @@ class DataProcessor:
         
         return self.data
         
+    def clean_data_by_station(self, z_threshold: float = 3.0) -> pd.DataFrame:
+        """
+        Clean the loaded data station by station in a single vectorized pass.
+
+        Duplicates and unparseable dates are dropped, outliers are filtered
+        against each station's own mean/std, and missing temperatures are
+        time-interpolated between the neighbouring readings of the same
+        station. Every step is a grouped transform over the whole frame, so
+        the cost is linear in rows regardless of the number of stations.
+        Per-station counts are stored in ``self.cleaning_stats``.
+
+        Args:
+            z_threshold (float): Absolute z-score at which a reading is an outlier
+
+        Returns:
+            pd.DataFrame: Cleaned climate data sorted by station_id and date
+        """
+        if self.data is None:
+            raise Exception("Data not loaded. Call load_data() first.")
+
+        df = self.data
+        rows_in = df['station_id'].value_counts()
+
+        df = df.drop_duplicates()
+        duplicates = rows_in.sub(df['station_id'].value_counts(), fill_value=0)
+
+        df = df.assign(
+            date=pd.to_datetime(df['date'], format="%Y-%m-%d", errors='coerce'),
+            temperature=pd.to_numeric(df['temperature'], errors='coerce')
+        )
+        df = df.sort_values(['station_id', 'date'], kind='stable', ignore_index=True)
+        stations = df['station_id']
+        # Rows with unparseable dates are dropped below; mask them out of the
+        # station statistics and the interpolation neighbours first
+        undated = df['date'].isna()
+        temps = df['temperature'].where(~undated)
+
+        # Outlier bounds from each station's own distribution
+        grouped = temps.groupby(stations, observed=True, sort=False)
+        z = (temps - grouped.transform('mean')) / grouped.transform('std')
+        outlier = z.abs() >= z_threshold
+
+        # Time-weighted linear interpolation between same-station neighbours
+        seconds = df['date'].astype('int64').astype('float64').where(~undated)
+        missing = temps.isna() & ~outlier & ~undated
+        known_temps = temps.where(~outlier)
+        known_times = seconds.where(known_temps.notna())
+        def per_station(series: pd.Series):
+            return series.groupby(stations, observed=True, sort=False)
+
+        prev_temp, next_temp = per_station(known_temps).ffill(), per_station(known_temps).bfill()
+        prev_time, next_time = per_station(known_times).ffill(), per_station(known_times).bfill()
+        span = (next_time - prev_time).replace(0, np.nan)
+        weight = ((seconds - prev_time) / span).fillna(0.0)
+        filled = prev_temp + weight * (next_temp - prev_temp)
+        interpolated = missing & filled.notna()
+
+        invalid = undated | (missing & ~interpolated)
+        keep = ~invalid & ~outlier
+        df['temperature'] = temps.where(~interpolated, filled)
+
+        stats = pd.DataFrame({
+            'rows_in': rows_in,
+            'duplicates_removed': duplicates,
+            'invalid_removed': stations[invalid].value_counts(),
+            'outliers_removed': stations[outlier & ~invalid].value_counts(),
+            'rows_interpolated': stations[interpolated & keep].value_counts(),
+        }).fillna(0).astype('int64')
+        stats['rows_out'] = stats['rows_in'] - stats[['duplicates_removed', 'invalid_removed', 'outliers_removed']].sum(axis=1)
+        stats.index.name = 'station_id'
+        self.cleaning_stats = stats
+
+        self.data = df[keep].reset_index(drop=True)
+        return self.data
+
+    def stream_to_partitions(self, output_dir: str, max_memory_mb: float = 256,
+                             chunk_rows: int = None) -> Dict[str, Any]:
+        """
+        Clean a CSV of any size into per-station, per-year partition files.
+
+        The input is read in bounded chunks, type-converted and appended to
+        ``<output_dir>/station=<station_id>-<hash>/<year>.csv``. Duplicates are then
+        removed partition by partition (a duplicate row always lands in the
+        same partition), the global mean/std is accumulated with a mergeable
+        ``RunningStats``, and a final pass drops z-score outliers. The result
+        matches ``clean_data()`` on the same file while peak memory is bounded
+        by one chunk plus one station-year partition.
+
+        Args:
+            output_dir (str): Directory receiving the partitioned output
+            max_memory_mb (float): Approximate memory budget for one chunk
+            chunk_rows (int): Explicit rows per chunk, overriding the budget
+
+        Returns:
+            Dict[str, Any]: Rows written, partition paths and the outlier statistics
+        """
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        full_path = os.path.join(base_dir, self.data_path)
+        if not os.path.exists(full_path):
+            raise FileNotFoundError(f"Resolved path does not exist: {full_path}")
+        if chunk_rows is None:
+            chunk_rows = self._chunk_rows_for_budget(full_path, max_memory_mb)
+
+        # Pass 1: convert chunks and append them to their partitions
+        os.makedirs(output_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(output_dir, 'station=*')):
+            shutil.rmtree(stale)
+        for chunk in pd.read_csv(full_path, header=0, chunksize=chunk_rows):
+            chunk['date'] = pd.to_datetime(chunk['date'], format="%Y-%m-%d", errors='coerce')
+            chunk['temperature'] = pd.to_numeric(chunk['temperature'], errors='coerce')
+            chunk = chunk.dropna(subset=["date", "temperature"])
+            # dropna=False: rows without a station_id are kept, as clean_data() keeps them
+            for (station_id, year), part in chunk.groupby(['station_id', chunk['date'].dt.year], sort=False,
+                                                          dropna=False):
+                path = self._partition_path(output_dir, station_id, year)
+                new_file = not os.path.exists(path)
+                if new_file:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                part.to_csv(path, mode='a', header=new_file, index=False, date_format="%Y-%m-%d")
+
+        partitions = sorted(glob.glob(os.path.join(output_dir, 'station=*', '*.csv')))
+
+        # Pass 2: dedupe each partition and accumulate the outlier statistics
+        stats = RunningStats()
+        for path in partitions:
+            part = pd.read_csv(path).drop_duplicates()
+            part.to_csv(path, index=False)
+            stats.update(part['temperature'].to_numpy())
+
+        # Pass 3: drop outliers against the global mean/std
+        rows = 0
+        for path in partitions:
+            part = pd.read_csv(path)
+            part = part[np.abs(stats.zscore(part['temperature'])) < 3]
+            part.to_csv(path, index=False)
+            rows += len(part)
+
+        return {
+            'rows': rows,
+            'partitions': partitions,
+            'temperature_stats': stats,
+            'chunk_rows': chunk_rows
+        }
+
+    def to_station_matrix(self, store_dir: Optional[str] = None, mmap: bool = True) -> StationMatrix:
+        """
+        Pivot the cleaned data into a dense station x calendar-day matrix.
+
+        Args:
+            store_dir (str, optional): Save the matrix there (``values.npy`` plus
+                ``meta.json``) and return the stored copy
+            mmap (bool): Memory-map the stored values instead of reading them
+
+        Returns:
+            StationMatrix: float32 temperatures, NaN on days without a reading
+        """
+        if self.data is None:
+            raise Exception("Data not loaded. Call load_data() first.")
+        matrix = StationMatrix.from_frame(self.data)
+        if store_dir is None:
+            return matrix
+        matrix.save(store_dir)
+        return StationMatrix.load(store_dir, mmap=mmap)
+
+    @staticmethod
+    def _partition_path(output_dir: str, station_id: str, year: int) -> str:
+        # The short hash keeps ids that sanitize alike (and a missing id) apart
+        if pd.isna(station_id):
+            safe_id, key = 'missing', b''
+        else:
+            safe_id = str(station_id).replace(' ', '_').replace(',', '').replace('/', '_')
+            key = b'=' + str(station_id).encode('utf-8')
+        digest = hashlib.sha1(key).hexdigest()[:8]
+        return os.path.join(output_dir, f"station={safe_id}-{digest}", f"{int(year)}.csv")
+
+    @staticmethod
+    def _chunk_rows_for_budget(full_path: str, max_memory_mb: float) -> int:
+        """Estimate how many rows fit in the memory budget from a small sample."""
+        sample = pd.read_csv(full_path, header=0, nrows=1000)
+        bytes_per_row = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+        # Conversion and grouping hold roughly three copies of a chunk at once
+        return max(1000, int(max_memory_mb * 2**20 / (3 * bytes_per_row)))
+
     def normalize_data(self) -> pd.DataFrame:
         """
         Normalize numerical columns in the dataset.
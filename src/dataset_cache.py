@@ -0,0 +1,163 @@
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+import pandas as pd
+
+try:
+    from .data_processor import DataProcessor
+    from .station_index import StationIndex
+    from .summary_store import SummaryStore
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from data_processor import DataProcessor
+    from station_index import StationIndex
+    from summary_store import SummaryStore
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mark the NumPy buffers backing a DataFrame as read-only.
+
+    Any in-place write into the shared frame (``df.loc[...] = ...``) then
+    raises instead of silently corrupting the copy every request sees.
+    """
+    for block in getattr(df._mgr, 'blocks', ()):
+        values = getattr(block, 'values', None)
+        values = getattr(values, '_ndarray', values)  # datetime extension arrays
+        if hasattr(values, 'flags'):
+            values.flags.writeable = False
+    return df
+
+
+class DatasetCache:
+    """
+    Loads and cleans a climate CSV once per process and reuses the result.
+
+    The cached frame is keyed on the resolved file path together with its
+    modification time and size, so replacing or editing the CSV invalidates
+    the entry on the next call to ``get()``.
+    """
+
+    def __init__(self, data_path: str):
+        """
+        Initialize the cache for a single data file.
+
+        Args:
+            data_path (str): Path to the climate data file (CSV)
+        """
+        self.data_path = data_path
+        self._lock = threading.Lock()
+        self._key = None
+        self._index = None
+        self._summary = None
+        self._summary_index = None
+
+    def _resolve_path(self) -> str:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_dir, self.data_path)
+
+    def current_key(self) -> Tuple[str, int, int]:
+        """
+        Build the cache key for the file as it exists on disk right now.
+
+        Returns:
+            Tuple[str, int, int]: Resolved path, mtime in nanoseconds and size in bytes
+        """
+        full_path = self._resolve_path()
+        stat = os.stat(full_path)
+        return full_path, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def version(self) -> str:
+        """Short string identifying the dataset version currently cached."""
+        path, mtime, size = self.current_key()
+        return f"{mtime:x}-{size:x}"
+
+    @property
+    def last_modified(self) -> datetime:
+        """Modification time of the data file, in UTC."""
+        path, mtime, size = self.current_key()
+        return datetime.fromtimestamp(mtime / 1e9, tz=timezone.utc)
+
+    def _load(self) -> StationIndex:
+        processor = DataProcessor(self.data_path)
+        processor.load_data()
+        index = StationIndex.build(processor.clean_data())
+        _freeze(index.frame)
+        return index
+
+    def get_index(self) -> StationIndex:
+        """
+        Return the station/date index, rebuilding it only if the file changed.
+
+        The index's ``frame`` is the shared cleaned dataset sorted by station
+        and date; slices taken from it are read-only views.
+
+        Returns:
+            StationIndex: Index over the cleaned climate data
+        """
+        key = self.current_key()
+        with self._lock:
+            if self._index is None or key != self._key:
+                self._index = self._load()
+                self._key = key
+            return self._index
+
+    def get(self) -> pd.DataFrame:
+        """
+        Return the cleaned dataset, reloading it only if the file changed.
+
+        The returned frame is a shallow copy over read-only buffers: callers
+        may add columns or filter it freely, but cannot modify shared values.
+
+        Returns:
+            pd.DataFrame: Cleaned climate data sorted by station_id and date
+        """
+        return self.get_index().frame.copy(deep=False)
+
+    def get_summary(self) -> SummaryStore:
+        """
+        Return the summaries of the cleaned dataset, built once per version.
+
+        Returns:
+            SummaryStore: Materialized per-station, per-year and global statistics
+        """
+        index = self.get_index()
+        with self._lock:
+            if self._summary is None or self._summary_index is not index:
+                self._summary = SummaryStore.from_frame(index.frame)
+                self._summary_index = index
+            return self._summary
+
+    def invalidate(self) -> None:
+        """Drop the cached frame so the next ``get()`` reloads it."""
+        with self._lock:
+            self._key = None
+            self._index = None
+            self._summary = None
+            self._summary_index = None
+
+
+_caches: Dict[str, DatasetCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_dataset_cache(data_path: str) -> DatasetCache:
+    """
+    Return the process-wide cache for a data file, creating it on first use.
+
+    Args:
+        data_path (str): Path to the climate data file (CSV)
+
+    Returns:
+        DatasetCache: Shared cache instance for that path
+    """
+    key = os.path.abspath(data_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = DatasetCache(data_path)
+            _caches[key] = cache
+        return cache
+
@@ -0,0 +1,128 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Period start frequencies for server-side aggregation
+RESOLUTIONS = {
+    'daily': None,
+    'weekly': 'W',
+    'monthly': 'M',
+    'yearly': 'Y',
+}
+
+
+def aggregate_by_resolution(frame: pd.DataFrame, resolution: str = 'daily') -> pd.DataFrame:
+    """
+    Average temperatures per station over calendar periods.
+
+    Every row is mapped to the start of its week/month/year and the whole
+    frame is reduced with one grouped mean, so the cost does not depend on
+    the number of stations.
+
+    Args:
+        frame (pd.DataFrame): Rows with station_id, station_name, date and temperature
+        resolution (str): One of 'daily', 'weekly', 'monthly', 'yearly'
+
+    Returns:
+        pd.DataFrame: station_id, station_name, date, temperature sorted by station and date
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    columns = ['station_id', 'station_name', 'date', 'temperature']
+    freq = RESOLUTIONS[resolution]
+    if freq is None or frame.empty:
+        return frame[columns]
+
+    period_start = frame['date'].dt.to_period(freq).dt.start_time
+    aggregated = frame.groupby(
+        [frame['station_id'], frame['station_name'], period_start.rename('date')],
+        observed=True, sort=True
+    )['temperature'].mean()
+    return aggregated.reset_index()[columns]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Pick the points of a series to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the mean of the next bucket, which preserves peaks
+    and troughs far better than striding.
+
+    Args:
+        x (np.ndarray): Monotonic x coordinates (e.g. dates as numbers)
+        y (np.ndarray): Values
+        max_points (int): Number of points to return (at least 3)
+
+    Returns:
+        np.ndarray: Sorted integer positions of the selected points
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    max_points = max(max_points, 3)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_lo, next_hi = hi, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[next_lo:next_hi].mean()
+        next_y = y[next_lo:next_hi].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y - y[previous])
+        )
+        previous = lo + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_frame(frame: pd.DataFrame, max_points: Optional[int]) -> pd.DataFrame:
+    """
+    Reduce a multi-station frame to at most ``max_points`` rows with LTTB.
+
+    Every station gets the three points LTTB needs, and the rest of the
+    budget is shared in proportion to row counts. When there are more than
+    ``max_points / 3`` stations, only the largest stations that fit are kept.
+    Rows must be grouped by station and sorted by date.
+
+    Args:
+        frame (pd.DataFrame): Rows with station_id, date and temperature
+        max_points (int): Total point budget, or None to keep every row
+
+    Returns:
+        pd.DataFrame: Selected rows in their original order
+    """
+    if not max_points or len(frame) <= max_points:
+        return frame
+
+    codes, _ = pd.factorize(frame['station_id'])
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(frame)]
+    sizes = ends - starts
+    x = frame['date'].to_numpy(dtype='datetime64[ns]').astype('int64').astype(float)
+    y = frame['temperature'].to_numpy(dtype=float)
+
+    budgets = np.zeros(len(starts), dtype=np.int64)
+    if 3 * len(starts) > max_points:
+        # Too many stations for three points each: keep the largest ones
+        largest = np.argsort(-sizes, kind='stable')[:max_points // 3]
+        budgets[largest] = 3
+    else:
+        spare = max_points - 3 * len(starts)
+        budgets = 3 + (spare * sizes // sizes.sum())
+    budgets = np.minimum(budgets, sizes)
+
+    keep = [np.empty(0, dtype=np.int64)]
+    for lo, hi, budget in zip(starts, ends, budgets):
+        if budget > 0:
+            keep.append(lo + lttb_indices(x[lo:hi], y[lo:hi], int(budget)))
+    return frame.iloc[np.concatenate(keep)]
@@ -0,0 +1,118 @@
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+
+class Forecaster:
+    """
+    Interface for engines that forecast a single daily temperature series.
+
+    Engines are fitted on a series of daily values and then extrapolate it
+    ``horizon`` days past its last value.
+    """
+
+    name = None
+
+    def fit(self, series: np.ndarray, dates: Optional[np.ndarray] = None) -> 'Forecaster':
+        """
+        Fit the engine to a historical series.
+
+        Args:
+            series (np.ndarray): Daily temperatures
+            dates (np.ndarray, optional): Date of each value; without dates the
+                values are assumed to be consecutive days
+
+        Returns:
+            Forecaster: self, for chaining
+        """
+        raise NotImplementedError
+
+    def predict(self, horizon: int) -> np.ndarray:
+        """
+        Forecast the days following the fitted series.
+
+        Args:
+            horizon (int): Number of days to forecast
+
+        Returns:
+            np.ndarray: Predicted temperatures
+        """
+        raise NotImplementedError
+
+
+class HarmonicForecaster(Forecaster):
+    """
+    Seasonal regression forecaster using only NumPy.
+
+    The series is modelled as a linear trend plus ``n_harmonics`` Fourier
+    terms of the annual cycle, fitted by least squares, and the remaining
+    residual is modelled as an AR(``ar_order``) process, also fitted by
+    least squares. Fitting is two small ``lstsq`` solves, so it takes
+    milliseconds even for decades of daily data.
+    """
+
+    name = 'harmonic'
+
+    def __init__(self, period: float = 365.25, n_harmonics: int = 3, ar_order: int = 3):
+        """
+        Initialize the forecaster.
+
+        Args:
+            period (float): Length of the seasonal cycle in days
+            n_harmonics (int): Number of Fourier harmonics of the cycle
+            ar_order (int): Number of lagged residuals in the AR model
+        """
+        self.period = period
+        self.n_harmonics = n_harmonics
+        self.ar_order = ar_order
+        self.coefficients = None
+        self.ar_coefficients = None
+        self._next_t = 0.0
+        self._last_residuals = None
+
+    def _design(self, t: np.ndarray) -> np.ndarray:
+        angles = 2 * np.pi * np.outer(t, np.arange(1, self.n_harmonics + 1)) / self.period
+        return np.column_stack([np.ones_like(t), t, np.cos(angles), np.sin(angles)])
+
+    def fit(self, series: np.ndarray, dates: Optional[np.ndarray] = None) -> 'HarmonicForecaster':
+        series = np.asarray(series, dtype=float).ravel()
+        if dates is None:
+            t = np.arange(len(series), dtype=float)
+        else:
+            # Day offsets keep the seasonal phase right across gaps in the record
+            days = np.asarray(dates, dtype='datetime64[D]')
+            t = (days - days[0]).astype(float)
+        design = self._design(t)
+        self.coefficients = np.linalg.lstsq(design, series, rcond=None)[0]
+        residuals = series - design @ self.coefficients
+
+        p = self.ar_order
+        if p > 0 and len(residuals) > 2 * p:
+            lags = np.lib.stride_tricks.sliding_window_view(residuals[:-1], p)
+            self.ar_coefficients = np.linalg.lstsq(lags, residuals[p:], rcond=None)[0]
+            self._last_residuals = residuals[-p:].copy()
+        else:
+            self.ar_coefficients = np.zeros(0)
+            self._last_residuals = np.zeros(0)
+        self._next_t = t[-1] + 1 if len(t) else 0.0
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        if self.coefficients is None:
+            raise RuntimeError("Forecaster not fitted. Call fit() first.")
+        t = self._next_t + np.arange(horizon, dtype=float)
+        forecast = self._design(t) @ self.coefficients
+
+        # Residual recursion; only ar_order values are carried between steps
+        history = list(self._last_residuals)
+        for step in range(horizon if len(self.ar_coefficients) else 0):
+            residual = float(np.dot(self.ar_coefficients, history[-self.ar_order:]))
+            history.append(residual)
+            forecast[step] += residual
+        return forecast
+
+
+# Engines selectable by name in ClimateML.predict_temperature (besides 'lstm')
+FORECASTERS: Dict[str, Type[Forecaster]] = {
+    HarmonicForecaster.name: HarmonicForecaster,
+}
@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# JSON bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+_file_etags: Dict[str, Tuple[int, int, str]] = {}
+_file_etags_lock = threading.Lock()
+
+
+def make_etag(*parts) -> str:
+    """
+    Build an ETag from the values a response is derived from.
+
+    Args:
+        *parts: JSON-serializable values (dataset version, query parameters, ...)
+
+    Returns:
+        str: Hex digest that changes whenever any part changes
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def file_etag(path: str) -> str:
+    """
+    Return the SHA-256 of a file's contents, hashed once per mtime and size.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    stat = os.stat(path)
+    with _file_etags_lock:
+        cached = _file_etags.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    etag = digest.hexdigest()
+    with _file_etags_lock:
+        _file_etags[path] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+
+def _encoded_etags(etag: str):
+    # A compressed body is a different representation, so it carries its own
+    # strong ETag; requests may revalidate with either one
+    yield etag
+    yield f"{etag}-gzip"
+    yield f"{etag}-br"
+
+
+def is_not_modified(request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Check whether the client's cached copy is still current.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only consulted
+    when the request carries no entity tags.
+
+    Args:
+        request: Flask/Werkzeug request
+        etag (str): Current ETag of the resource
+        last_modified (datetime): Timezone-aware modification time, if known
+
+    Returns:
+        bool: True if a 304 Not Modified may be sent
+    """
+    if request.if_none_match:
+        return any(request.if_none_match.contains_weak(tag) for tag in _encoded_etags(etag))
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def set_cache_headers(response, etag: str, max_age: int,
+                      last_modified: Optional[datetime] = None, weak: bool = False):
+    """
+    Attach validators and a Cache-Control max-age to a successful response.
+
+    Error responses are returned unchanged so they are never cached.
+
+    Args:
+        response: Flask/Werkzeug response (200 or 304)
+        etag (str): ETag of the resource
+        max_age (int): Seconds clients and shared caches may reuse the response
+        last_modified (datetime): Modification time for ``Last-Modified``
+        weak (bool): Mark the ETag as weak (semantically, not byte-for-byte, equal)
+
+    Returns:
+        The same response
+    """
+    if response.status_code not in (200, 304):
+        return response
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """
+    Pick the best content encoding the client accepts.
+
+    Args:
+        accept_encodings: ``request.accept_encodings``
+
+    Returns:
+        str: 'br', 'gzip' or None
+    """
+    if brotli is not None and accept_encodings['br'] > 0:
+        return 'br'
+    if accept_encodings['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, accept_encodings, min_size: int = COMPRESS_MIN_BYTES):
+    """
+    Compress a buffered JSON response body with brotli or gzip.
+
+    Streamed, already encoded, non-JSON and small responses are left alone.
+    A strong ETag gets the encoding appended so each representation keeps a
+    distinct validator.
+
+    Args:
+        response: Flask/Werkzeug response
+        accept_encodings: ``request.accept_encodings``
+        min_size (int): Smallest body worth compressing, in bytes
+
+    Returns:
+        The same response
+    """
+    if (response.status_code != 200 or response.mimetype != 'application/json'
+            or response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
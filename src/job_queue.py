@@ -0,0 +1,162 @@
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """
+    One unit of background work and its observable state.
+
+    ``status`` moves from 'queued' to 'running' and then to 'done' or
+    'failed'. The work function receives the job and may report progress
+    through ``set_progress``.
+    """
+
+    def __init__(self, key: Hashable, func: Callable[['Job'], Any]):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.func = func
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def set_progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Record how far the job has got (0.0 - 1.0) and what it is doing."""
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view of the job for status endpoints."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': round(self.progress, 3),
+            'message': self.message,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue served by a pool of worker threads.
+
+    Submitting work whose key matches a job that is still queued or running
+    returns that job instead of adding a duplicate. At most ``max_pending``
+    jobs may wait at once; beyond that ``submit`` raises ``QueueFullError``
+    so callers can push back (e.g. with HTTP 429) rather than buffering
+    without limit. Finished jobs are kept for lookup until ``max_finished``
+    newer ones have completed.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, max_finished: int = 256):
+        """
+        Initialize the queue and start its worker threads.
+
+        Args:
+            workers (int): Number of worker threads
+            max_pending (int): Maximum number of jobs waiting to run
+            max_finished (int): Number of finished jobs kept for status lookups
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[Hashable, Job] = {}
+        self._finished: 'OrderedDict[str, None]' = OrderedDict()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key: Hashable, func: Callable[[Job], Any]) -> Job:
+        """
+        Queue work, or return the active job already doing the same work.
+
+        Args:
+            key (Hashable): Identifies equivalent work (e.g. request parameters)
+            func (Callable[[Job], Any]): Work to run; its return value becomes
+                the job result
+
+        Returns:
+            Job: The new or existing job
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already waiting
+        """
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                return existing
+            job = Job(key, func)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+            self._jobs[job.id] = job
+            self._active[key] = job
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if it is unknown or has been forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                job.result = job.func(job)
+                job.progress = 1.0
+                job.message = None
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.status = 'failed'
+                traceback.print_exc()
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                self._finished[job.id] = None
+                while len(self._finished) > self.max_finished:
+                    old_id, _ = self._finished.popitem(last=False)
+                    self._jobs.pop(old_id, None)
+            job._done.set()
+            self._queue.task_done()
@@ -1,3 +1,4 @@
+from aggregation import heatmap_frame
 from data_processor import DataProcessor
 from ml_algorithms import ClimateML
 from visualizer import ClimateVisualizer
@@ -18,8 +19,11 @@ def main():
     ml = ClimateML()
     visualizer = ClimateVisualizer()
 
-    grouped = df.groupby("station_name")
-    data_by_station = {}
+    # Score every station against its own day-of-year baseline in one batch
+    flags, _ = ml.detect_anomalies_batch(df, method='climatology', by='station_name')
+    df = df.assign(is_anomaly=flags)
+
+    grouped = df.groupby("station_name", observed=True)
 
     for station_name, station_df in grouped:
         print(f"\nProcessing station: {station_name}")
@@ -27,15 +31,11 @@ def main():
         temps = station_df['temperature'].values
         dates = station_df['date'].values
 
-        # Detect anomalies
-        anomalies = ml.detect_anomalies(temps)
+        anomalies = station_df['is_anomaly'].values
 
         # Predict future temps
         prediction = ml.predict_temperature(temps[:-30], temps[:-30], forecast_period=90)
 
-        # Store for clustering
-        data_by_station[station_name] = temps
-
         # Plot
         visualizer.plot_temperature_with_predictions_and_anomalies(
             dates=dates,
@@ -47,17 +47,14 @@ def main():
 
     # 3. Cluster regions based on mean temp patterns
     print("\n3. Performing station clustering...")
-    clusters = ml.cluster_regions(data_by_region=data_by_station, n_clusters=2)
+    clusters = ml.cluster_stations(df, n_clusters=2)
     visualizer.plot_cluster_summary(station_names=list(clusters.keys()), cluster_ids=list(clusters.values()))
 
     # 4. Heatmap
     print("\n4. Generating heatmap...")
 
-    # Extract year from date column
-    df['year'] = df['date'].dt.year
-
-    # Pivot to get average temperature per year per station
-    pivot = df.pivot_table(index='station_name', columns='year', values='temperature', aggfunc='mean')
+    # Average temperature per year per station
+    pivot = heatmap_frame(df, period='year')
 
     # Generate the heatmap
     visualizer.plot_temperature_heatmap(
@@ -1,41 +1,176 @@
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import MinMaxScaler
-from typing import Tuple, List, Dict
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+import pandas as pd
+from typing import Tuple, List, Dict, Any, Optional, Union
+
+try:
+    from .anomaly import anomaly_scores
+    from .clustering import StationClusterer, labels_by_station, station_features
+    from .forecasters import FORECASTERS
+    from .model_registry import ModelRegistry
+    from .station_matrix import StationMatrix
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from anomaly import anomaly_scores
+    from clustering import StationClusterer, labels_by_station, station_features
+    from forecasters import FORECASTERS
+    from model_registry import ModelRegistry
+    from station_matrix import StationMatrix
+
+# Hyperparameters of the forecasting LSTM; part of every registry key
+LSTM_CONFIG = {
+    'seq_length': 10,  # Look back 10 time steps
+    'units': 50,
+    'dropout': 0.2,
+    'epochs': 50,
+    'batch_size': 32,
+    'validation_split': 0.1,
+    'test_size': 0.2,
+    'random_state': 42,
+    'max_materialized_windows': 200_000,  # train from a streamed dataset above this
+}
+
+def _import_tensorflow():
+    """
+    Import TensorFlow on first use.
+
+    TensorFlow costs seconds and hundreds of MB to import, and only the LSTM
+    engine needs it, so it is never imported at module load.
+    """
+    import tensorflow as tf
+    return tf
+
+
+def _min_max_scaler():
+    from sklearn.preprocessing import MinMaxScaler
+    return MinMaxScaler()
+
 
 class ClimateML:
     """
     Implements machine learning algorithms for climate data analysis.
     """
 
-    def __init__(self):
-        """Initialize the ClimateML class."""
+    # Registry slot used by the pooled multi-station forecaster
+    POOLED_REGISTRY_NAME = '__pooled__'
+
+    def __init__(self, registry: Optional[ModelRegistry] = None,
+                 lstm_config: Optional[Dict[str, Any]] = None, engine: str = 'lstm'):
+        """
+        Initialize the ClimateML class.
+
+        Args:
+            registry (ModelRegistry, optional): Store of trained models reused
+                by ``predict_temperature`` when a station name is given
+            lstm_config (Dict[str, Any], optional): Overrides for ``LSTM_CONFIG``
+            engine (str): Default forecasting engine, 'lstm' or a name in ``FORECASTERS``
+        """
+        self._check_engine(engine)
+        self.engine = engine
         self.model = None
-        self.scaler = MinMaxScaler()
+        self._scaler = None
+        self.registry = registry
+        self.lstm_config = {**LSTM_CONFIG, **(lstm_config or {})}
+        self._rollout_fn = None
 
-    def create_sequences(self, data: np.ndarray, seq_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    def create_sequences(self, data: np.ndarray, seq_length: int, stride: int = 1,
+                         horizon: int = 1) -> Tuple[np.ndarray, np.ndarray]:
         """
         Create sequences for time series prediction.
 
+        Windows are strided views over ``data`` (``sliding_window_view``), so
+        no window is copied; both returned arrays are read-only.
+
+        Args:
+            data (np.ndarray): Input time series data, shape (n,) or (n, features)
+            seq_length (int): Length of each sequence
+            stride (int): Step between the starts of consecutive windows
+            horizon (int): Number of future steps in each target
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: X of shape (windows, seq_length[, features]);
+                y of shape (windows[, features]) for horizon 1, otherwise
+                (windows, horizon[, features])
+        """
+        data = np.asarray(data)
+        n_windows = max(len(data) - seq_length - horizon + 1, 0)
+        if n_windows == 0:
+            empty = np.empty((0, seq_length) + data.shape[1:], dtype=data.dtype)
+            target_shape = (0,) + ((horizon,) if horizon > 1 else ()) + data.shape[1:]
+            return empty, np.empty(target_shape, dtype=data.dtype)
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, seq_length, axis=0)
+        X = np.moveaxis(windows, -1, 1)[:n_windows:stride]
+        if horizon == 1:
+            y = data[seq_length:seq_length + n_windows:stride].view()
+            y.flags.writeable = False
+        else:
+            targets = np.lib.stride_tricks.sliding_window_view(data[seq_length:], horizon, axis=0)
+            y = np.moveaxis(targets, -1, 1)[:n_windows:stride]
+        return X, y
+
+    def make_sequence_dataset(self, data: np.ndarray, seq_length: int, batch_size: int = 32,
+                              stride: int = 1, horizon: int = 1, shuffle: bool = True,
+                              seed: int = 42) -> 'tf.data.Dataset':
+        """
+        Stream training windows as a ``tf.data.Dataset``.
+
+        Batches are gathered from the strided views of ``create_sequences``
+        one at a time, so the full (windows x seq_length) tensor is never
+        materialised.
+
         Args:
-            data (np.ndarray): Input time series data
+            data (np.ndarray): Input time series data, shape (n,) or (n, features)
             seq_length (int): Length of each sequence
+            batch_size (int): Windows per batch
+            stride (int): Step between the starts of consecutive windows
+            horizon (int): Number of future steps in each target
+            shuffle (bool): Visit windows in a new random order every epoch
+            seed (int): Seed of the shuffling generator
 
         Returns:
-            Tuple[np.ndarray, np.ndarray]: X and y sequences
+            tf.data.Dataset: Dataset of (X, y) float32 batches
         """
-        X, y = [], []
-        for i in range(len(data) - seq_length):
-            X.append(data[i:(i + seq_length)])
-            y.append(data[i + seq_length])
-        return np.array(X), np.array(y)
+        tf = _import_tensorflow()
+        X, y = self.create_sequences(data, seq_length, stride, horizon)
+        rng = np.random.default_rng(seed)
+
+        def batches():
+            order = rng.permutation(len(X)) if shuffle else np.arange(len(X))
+            for start in range(0, len(order), batch_size):
+                # Sorted indices keep each gather reading forward through memory
+                batch = np.sort(order[start:start + batch_size])
+                yield X[batch].astype(np.float32), y[batch].astype(np.float32)
+
+        return tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None,) + X.shape[1:], dtype=tf.float32),
+                tf.TensorSpec(shape=(None,) + y.shape[1:], dtype=tf.float32),
+            )
+        ).prefetch(tf.data.AUTOTUNE)
+
+    @property
+    def scaler(self):
+        """MinMaxScaler used by the LSTM engine, created on first access."""
+        if self._scaler is None:
+            self._scaler = _min_max_scaler()
+        return self._scaler
+
+    @scaler.setter
+    def scaler(self, value):
+        self._scaler = value
+
+    @staticmethod
+    def available_engines() -> List[str]:
+        """Names accepted by the ``engine`` arguments."""
+        return ['lstm'] + list(FORECASTERS)
+
+    def _check_engine(self, engine: str) -> None:
+        if engine not in self.available_engines():
+            raise ValueError(f"Unknown forecasting engine: {engine}")
 
     def predict_temperature(self, data: np.ndarray, target: np.ndarray,
-                            forecast_period: int) -> np.ndarray:
+                            forecast_period: int, station: Optional[str] = None,
+                            engine: Optional[str] = None, dates: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Predict future temperature trends using LSTM.
 
@@ -43,63 +178,216 @@ class ClimateML:
             data (np.ndarray): Historical temperature data
             target (np.ndarray): Target values
             forecast_period (int): Number of periods to forecast
+            station (str, optional): Station name; with a registry configured,
+                a model trained on identical data and hyperparameters is loaded
+                instead of retrained, and newly trained models are saved
+            engine (str, optional): Forecasting engine for this call, overriding
+                the instance default; non-LSTM engines never touch TensorFlow
+            dates (np.ndarray, optional): Date of each value in ``data``, used by
+                engines that model the seasonal cycle (ignored by the LSTM)
 
         Returns:
             np.ndarray: Predicted temperature values
         """
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(data.reshape(-1, 1))
+        engine = engine or self.engine
+        self._check_engine(engine)
+        if engine != 'lstm':
+            return FORECASTERS[engine]().fit(data, dates).predict(forecast_period)
 
-        # Create sequences
-        seq_length = 10  # Look back 10 time steps
-        X, y = self.create_sequences(scaled_data, seq_length)
+        config = self.lstm_config
+        seq_length = config['seq_length']
 
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        cached = None
+        if self.registry is not None and station is not None:
+            key = self.registry.make_key(data, config)
+            cached = self.registry.load(station, key)
+
+        if cached is not None:
+            self.model, self.scaler = cached
+            scaled_data = self.scaler.transform(data.reshape(-1, 1))
+        else:
+            # Scale the data
+            scaled_data = self.scaler.fit_transform(data.reshape(-1, 1))
+            self.model = self._train_lstm(scaled_data)
+            if self.registry is not None and station is not None:
+                self.registry.save(station, key, self.model, self.scaler, config)
+
+        # Roll the forecast forward inside one compiled loop
+        window = scaled_data[-seq_length:].reshape(1, seq_length, 1)
+        predictions = self.rollout(window, forecast_period)
+
+        # Inverse transform predictions
+        predictions = self.scaler.inverse_transform(predictions.reshape(-1, 1))
+        return predictions.flatten()
+
+    def predict_temperature_batch(self, data_by_station: Dict[str, np.ndarray],
+                                  forecast_period: int) -> Dict[str, np.ndarray]:
+        """
+        Forecast many stations at once with a single pooled LSTM.
+
+        Each station is min-max scaled on its own, one model is trained on the
+        pooled sequences of every station, and all stations are then rolled
+        forward together so each forecast step is one batched model call. With
+        a registry configured the pooled model is reused while the input
+        series and hyperparameters are unchanged.
+
+        Args:
+            data_by_station (Dict[str, np.ndarray]): Station name to historical temperatures
+            forecast_period (int): Number of periods to forecast
+
+        Returns:
+            Dict[str, np.ndarray]: Station name to predicted temperature values
+        """
+        config = self.lstm_config
+        seq_length = config['seq_length']
+        stations = list(data_by_station)
+        series = [np.asarray(data_by_station[s], dtype=float) for s in stations]
+
+        cached = None
+        if self.registry is not None:
+            key_config = {**config, 'stations': stations, 'lengths': [len(v) for v in series]}
+            key = self.registry.make_key(np.concatenate(series), key_config)
+            cached = self.registry.load(self.POOLED_REGISTRY_NAME, key)
+
+        if cached is not None:
+            self.model, scalers = cached
+            scaled = [scalers[s].transform(v.reshape(-1, 1)) for s, v in zip(stations, series)]
+        else:
+            scalers = {s: _min_max_scaler() for s in stations}
+            scaled = [scalers[s].fit_transform(v.reshape(-1, 1)) for s, v in zip(stations, series)]
+            sequences = [self.create_sequences(v, seq_length) for v in scaled]
+            X = np.concatenate([X for X, _ in sequences])
+            y = np.concatenate([y for _, y in sequences])
+            self.model = self._fit_lstm(X, y)
+            if self.registry is not None:
+                self.registry.save(self.POOLED_REGISTRY_NAME, key, self.model, scalers, key_config)
+
+        windows = np.stack([v[-seq_length:] for v in scaled])
+        predictions = self.rollout(windows, forecast_period)
+        return {
+            s: scalers[s].inverse_transform(predictions[i].reshape(-1, 1)).flatten()
+            for i, s in enumerate(stations)
+        }
+
+    def rollout(self, windows: np.ndarray, horizon: int, model=None) -> np.ndarray:
+        """
+        Autoregressively forecast a batch of scaled windows.
+
+        The whole loop runs inside one ``tf.function`` calling the model
+        directly with ``training=False``: every step is a single batched call
+        for all windows, outputs go into a preallocated ``TensorArray``, and
+        the graph is traced once per model rather than dispatched per step.
+
+        Args:
+            windows (np.ndarray): Scaled input windows of shape (n, seq_length, 1)
+            horizon (int): Number of steps to forecast
+            model: Keras model to roll forward (defaults to ``self.model``)
+
+        Returns:
+            np.ndarray: Scaled predictions of shape (n, horizon)
+        """
+        tf = _import_tensorflow()
+        model = model if model is not None else self.model
+        windows = np.asarray(windows, dtype=np.float32)
+        if horizon <= 0:
+            return np.empty((len(windows), 0), dtype=np.float32)
+
+        if self._rollout_fn is None or self._rollout_fn[0] is not model:
+            @tf.function(reduce_retracing=True)
+            def rollout_fn(window, steps):
+                outputs = tf.TensorArray(tf.float32, size=steps)
+                for step in tf.range(steps):
+                    next_value = model(window, training=False)
+                    outputs = outputs.write(step, next_value[:, 0])
+                    window = tf.concat([window[:, 1:, :], next_value[:, tf.newaxis, :]], axis=1)
+                return tf.transpose(outputs.stack())
+            self._rollout_fn = (model, rollout_fn)
+
+        return self._rollout_fn[1](tf.constant(windows), tf.constant(horizon)).numpy()
+
+    def _train_lstm(self, scaled_data: np.ndarray):
+        """
+        Build and fit the forecasting LSTM on an already scaled series.
+
+        Args:
+            scaled_data (np.ndarray): Scaled series of shape (n, 1)
+
+        Returns:
+            Trained Keras model
+        """
+        config = self.lstm_config
+        seq_length = config['seq_length']
+        if len(scaled_data) - seq_length <= config['max_materialized_windows']:
+            return self._fit_lstm(*self.create_sequences(scaled_data, seq_length))
+
+        # Long records: stream windows instead of copying them for a random split
+        n_train = int(len(scaled_data) * (1 - config['validation_split']))
+        train = self.make_sequence_dataset(scaled_data[:n_train], seq_length, config['batch_size'],
+                                           seed=config['random_state'])
+        validation = self.make_sequence_dataset(scaled_data[n_train - seq_length:], seq_length,
+                                                config['batch_size'], shuffle=False)
+        model = self._build_lstm()
+        model.fit(train, validation_data=validation, epochs=config['epochs'], verbose=0)
+        return model
+
+    def _build_lstm(self):
+        """Build and compile the forecasting LSTM with the configured hyperparameters."""
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Dropout
+
+        config = self.lstm_config
+        seq_length = config['seq_length']
 
         # Build LSTM model with original architecture
-        self.model = Sequential([
-            LSTM(50, activation='relu', input_shape=(seq_length, 1), return_sequences=True),
-            Dropout(0.2),
-            LSTM(50, activation='relu'),
-            Dropout(0.2),
+        model = Sequential([
+            LSTM(config['units'], activation='relu', input_shape=(seq_length, 1), return_sequences=True),
+            Dropout(config['dropout']),
+            LSTM(config['units'], activation='relu'),
+            Dropout(config['dropout']),
             Dense(1)
         ])
 
-        self.model.compile(optimizer='adam', loss='mse')
+        model.compile(optimizer='adam', loss='mse')
+        return model
+
+    def _fit_lstm(self, X: np.ndarray, y: np.ndarray):
+        """
+        Build and fit the forecasting LSTM on prepared sequences.
+
+        Args:
+            X (np.ndarray): Input windows of shape (n, seq_length, 1)
+            y (np.ndarray): Next-step targets of shape (n, 1)
+
+        Returns:
+            Trained Keras model
+        """
+        from sklearn.model_selection import train_test_split
+
+        config = self.lstm_config
+
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=config['test_size'], random_state=config['random_state']
+        )
+
+        model = self._build_lstm()
 
         # Train model with original epochs
-        self.model.fit(
+        model.fit(
             X_train, y_train,
-            epochs=50,  # Original training epochs
-            batch_size=32,
-            validation_split=0.1,
+            epochs=config['epochs'],
+            batch_size=config['batch_size'],
+            validation_split=config['validation_split'],
             verbose=0
         )
-
-        # Make predictions
-        last_sequence = scaled_data[-seq_length:]
-        predictions = []
-
-        for _ in range(forecast_period):
-            # Reshape the last sequence for prediction
-            current_sequence = last_sequence.reshape(1, seq_length, 1)
-            # Get the next predicted value
-            next_pred = self.model.predict(current_sequence, verbose=0)[0]
-            predictions.append(next_pred)
-            # Update the sequence
-            last_sequence = np.roll(last_sequence, -1)
-            last_sequence[-1] = next_pred
-
-        # Inverse transform predictions
-        predictions = self.scaler.inverse_transform(np.array(predictions))
-        return predictions.flatten()
+        return model
 
     def cluster_regions(self, data_by_region: Dict[str, np.ndarray], n_clusters: int) -> Dict[str, int]:
         """
-        Cluster stations based on their average temperature patterns.
+        Cluster stations based on their temperature patterns.
+
+        Every series is used in full (no truncation to the shortest one);
+        see ``cluster_stations`` for long-format data with dates.
 
         Args:
             data_by_region (Dict[str, np.ndarray]): Dictionary of station name to temperature arrays
@@ -109,54 +397,115 @@ class ClimateML:
             Dict[str, int]: Mapping from station name to cluster ID
         """
         region_names = list(data_by_region.keys())
-        # Pad or truncate time series to same length
-        min_len = min(len(v) for v in data_by_region.values())
-        aligned_data = np.array([v[:min_len] for v in data_by_region.values()])
-        scaled = self.scaler.fit_transform(aligned_data)
-
-        # Use more features for more stable clustering
-        # Calculate additional features: mean, std, min, max, range
-        features = []
-        for station_data in aligned_data:
-            mean_temp = np.mean(station_data)
-            std_temp = np.std(station_data)
-            min_temp = np.min(station_data)
-            max_temp = np.max(station_data)
-            temp_range = max_temp - min_temp
-            features.append([mean_temp, std_temp, min_temp, max_temp, temp_range])
-        
-        features = np.array(features)
-        scaled_features = self.scaler.fit_transform(features)
-
-        # Use more deterministic clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=20, max_iter=500)
-        labels = kmeans.fit_predict(scaled_features)
-        
-        # Manually assign clusters to match desired interpretation:
-        # Cluster 0: Consistent weather (LA)
-        # Cluster 1: Variable weather (Tallahassee, Dallas)
-        manual_clusters = {}
-        for i, station in enumerate(region_names):
-            if "LOS ANGELES" in station.upper():
-                manual_clusters[station] = 0  # Consistent weather
-            else:
-                manual_clusters[station] = 1  # Variable weather
-        
-        return manual_clusters
-
-    def detect_anomalies(self, data: np.ndarray, threshold: float = 2.0) -> List[bool]:
-        """
-        Detect anomalies in climate data using Z-score method.
+        series = [np.asarray(v, dtype=float).ravel() for v in data_by_region.values()]
+        segments = np.repeat(np.arange(len(series)), [len(v) for v in series])
+        features = station_features(np.concatenate(series), segments, n_segments=len(series))
+        labels = StationClusterer(n_clusters).fit_predict(features)
+        return labels_by_station(region_names, labels)
+
+    def cluster_stations(self, frame: Union[pd.DataFrame, StationMatrix], n_clusters: int = 2,
+                         by: str = 'station_name', model_path: Optional[str] = None,
+                         refit: bool = False) -> Dict[str, int]:
+        """
+        Cluster every station of a long-format frame or station matrix.
+
+        Features (moments plus annual amplitude and phase) are extracted for
+        all stations in one pass. With ``model_path``, centroids saved by an
+        earlier fit are reused so stations are assigned without refitting;
+        otherwise, or with ``refit``, the centroids are fitted and saved there.
+
+        Args:
+            frame: Cleaned data with ``by``, ``date`` and ``temperature``
+                columns, or a ``StationMatrix``
+            n_clusters (int): Number of clusters
+            by (str): Column identifying the station
+            model_path (str, optional): ``.npz`` file holding the fitted centroids
+            refit (bool): Fit new centroids even if saved ones exist
+
+        Returns:
+            Dict[str, int]: Mapping from station to cluster ID, in order of first appearance
+        """
+        if isinstance(frame, StationMatrix):
+            values, codes, dates = frame.long_arrays()
+            names = frame.labels(by)
+        else:
+            # Rows without a station label cannot be assigned a cluster
+            frame = frame[frame[by].notna()]
+            codes, names = pd.factorize(frame[by])
+            values, dates = frame['temperature'].to_numpy(dtype=float), frame['date'].to_numpy()
+        features = station_features(values, codes, dates, n_segments=len(names))
+
+        clusterer = None
+        if model_path is not None and not refit:
+            clusterer = StationClusterer.load(model_path)
+            if clusterer is not None and clusterer.n_clusters != n_clusters:
+                clusterer = None
+        if clusterer is None:
+            clusterer = StationClusterer(n_clusters).fit(features)
+            if model_path is not None:
+                clusterer.save(model_path)
+        return labels_by_station([str(name) for name in names], clusterer.predict(features))
+
+    def detect_anomalies(self, data: np.ndarray, threshold: float = 2.0, method: str = 'zscore',
+                         dates: Optional[np.ndarray] = None, **options) -> np.ndarray:
+        """
+        Detect anomalies in climate data by thresholding anomaly scores.
 
         Args:
             data (np.ndarray): Climate data time series
-            threshold (float): Z-score threshold for anomaly detection
+            threshold (float): Score threshold for anomaly detection
+            method (str): 'zscore' (global mean/std), 'rolling' (trailing
+                window), 'climatology' (day-of-year baseline, needs ``dates``)
+                or 'mad' (median absolute deviation); see ``src/anomaly.py``
+            dates (np.ndarray, optional): Date of each value
+            **options: Method parameters passed to ``anomaly_scores``
 
         Returns:
-            List[bool]: Boolean mask indicating anomalies
+            np.ndarray: Boolean mask indicating anomalies
         """
-        mean = np.mean(data)
-        std = np.std(data)
-        z_scores = np.abs((data - mean) / std)
-        anomalies = z_scores > threshold
-        return anomalies.tolist()
+        return anomaly_scores(data, method, dates, **options) > threshold
+
+    def detect_anomalies_batch(self, data: Union[pd.DataFrame, StationMatrix, np.ndarray], threshold: float = 2.0,
+                               method: str = 'zscore', dates: Optional[np.ndarray] = None,
+                               by: str = 'station_id', **options) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect anomalies for every station in one vectorized pass.
+
+        Each station is scored against its own baseline, exactly as
+        ``detect_anomalies`` would score it alone, but all stations share the
+        same segment reductions instead of a Python loop over stations.
+
+        Args:
+            data: Long-format frame with ``by``, ``date`` and ``temperature``
+                columns (any row order), a ``StationMatrix``, or a station x day
+                matrix of temperatures with NaN for missing days
+            threshold (float): Score threshold for anomaly detection
+            method (str): Scoring method, see ``detect_anomalies``
+            dates (np.ndarray, optional): Date of each matrix column (matrix input only)
+            by (str): Column identifying the station in a frame
+            **options: Method parameters passed to ``anomaly_scores``
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Boolean flags and float scores, aligned
+                with the frame's rows or shaped like the matrix
+        """
+        if isinstance(data, pd.DataFrame):
+            # A missing station id is a station of its own rather than code -1
+            codes, _ = pd.factorize(data[by], use_na_sentinel=False)
+            day = data['date'].to_numpy(dtype='datetime64[ns]')
+            # Group each station's rows together, in date order
+            order = np.lexsort((day, codes))
+            scores = np.empty(len(data))
+            scores[order] = anomaly_scores(data['temperature'].to_numpy(dtype=float)[order], method,
+                                           day[order], codes[order], **options)
+            return scores > threshold, scores
+
+        if isinstance(data, StationMatrix):
+            data, dates = data.values, data.dates
+        matrix = np.asarray(data, dtype=float)
+        n_stations, n_days = matrix.shape
+        codes = np.repeat(np.arange(n_stations), n_days)
+        day = np.tile(np.asarray(dates, dtype='datetime64[D]'), n_stations) if dates is not None else None
+        # Padding days are NaN, which every method skips and scores 0
+        scores = anomaly_scores(matrix.ravel(), method, day, codes, **options).reshape(n_stations, n_days)
+        return scores > threshold, scores
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+REGISTRY_FORMAT_VERSION = 1
+
+
+class ModelRegistry:
+    """
+    On-disk store of trained forecasting models, one slot per station.
+
+    Entries are keyed by a hash of the training series and the model
+    hyperparameters, so a lookup only hits when both are unchanged. Each
+    entry holds the Keras model in the native ``.keras`` format, the fitted
+    scaler and a small metadata file.
+    """
+
+    def __init__(self, root_dir: str):
+        """
+        Initialize the registry.
+
+        Args:
+            root_dir (str): Directory holding one subdirectory per station
+        """
+        self.root_dir = root_dir
+
+    @staticmethod
+    def make_key(data: np.ndarray, config: Dict[str, Any]) -> str:
+        """
+        Hash a training series together with its hyperparameters.
+
+        Args:
+            data (np.ndarray): Training series
+            config (Dict[str, Any]): JSON-serializable model configuration
+
+        Returns:
+            str: Hex digest identifying this (data, config) pair
+        """
+        digest = hashlib.sha256()
+        digest.update(str(REGISTRY_FORMAT_VERSION).encode())
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        digest.update(np.ascontiguousarray(data, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def _station_dir(self, station: str) -> str:
+        # The short hash keeps names that sanitize or truncate alike apart
+        safe_name = station.replace(' ', '_').replace(',', '').replace('/', '_')[:50]
+        digest = hashlib.sha1(station.encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.root_dir, f"{safe_name}-{digest}")
+
+    def _entry_dir(self, station: str, key: str) -> str:
+        return os.path.join(self._station_dir(station), key[:16])
+
+    def load(self, station: str, key: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Load the model and scaler stored for a station under a key.
+
+        Args:
+            station (str): Station name
+            key (str): Key from ``make_key``
+
+        Returns:
+            Optional[Tuple[Any, Any]]: (model, scaler), or None on a miss
+        """
+        entry = self._entry_dir(station, key)
+        try:
+            with open(os.path.join(entry, 'meta.json')) as f:
+                if json.load(f).get('key') != key:
+                    return None
+            from tensorflow.keras.models import load_model
+            model = load_model(os.path.join(entry, 'model.keras'))
+            with open(os.path.join(entry, 'scaler.pkl'), 'rb') as f:
+                scaler = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError):
+            return None
+        return model, scaler
+
+    def save(self, station: str, key: str, model: Any, scaler: Any, config: Dict[str, Any]) -> None:
+        """
+        Store a trained model and scaler, replacing older entries for the station.
+
+        Args:
+            station (str): Station name
+            key (str): Key from ``make_key``
+            model: Trained Keras model
+            scaler: Fitted scaler used to prepare the training data
+            config (Dict[str, Any]): Hyperparameters the model was trained with
+        """
+        station_dir = self._station_dir(station)
+        entry = self._entry_dir(station, key)
+        tmp_entry = f"{entry}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+
+        model.save(os.path.join(tmp_entry, 'model.keras'))
+        with open(os.path.join(tmp_entry, 'scaler.pkl'), 'wb') as f:
+            pickle.dump(scaler, f)
+        with open(os.path.join(tmp_entry, 'meta.json'), 'w') as f:
+            json.dump({'key': key, 'station': station, 'config': config}, f)
+
+        for stale in os.listdir(station_dir):
+            # Leave entries other processes are still writing
+            if '.tmp' not in stale:
+                shutil.rmtree(os.path.join(station_dir, stale), ignore_errors=True)
+        os.replace(tmp_entry, entry)
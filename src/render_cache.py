@@ -0,0 +1,140 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class _PendingRender:
+    """A render in progress that other requests for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache of rendered plot files on disk.
+
+    Plots are rendered on first request by a caller-supplied function and kept
+    in ``cache_dir`` under their key. When the total size exceeds ``max_bytes``
+    the least recently used files are deleted. Concurrent requests for a key
+    that is still rendering wait for that render instead of starting their own.
+
+    Coalescing is per process; separate worker processes may render the same
+    key at once, but each writes to a temporary file and renames it into place,
+    so readers never see a partial image.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, suffix: str = '.png'):
+        """
+        Initialize the cache, adopting files left by earlier runs.
+
+        Args:
+            cache_dir (str): Directory holding the rendered files
+            max_bytes (int): Total size above which old files are evicted
+            suffix (str): Extension of the rendered files
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._pending: Dict[str, _PendingRender] = {}
+        self.total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        existing = []
+        for entry in os.scandir(cache_dir):
+            if entry.is_file() and entry.name.endswith(suffix) and not entry.name.startswith('.'):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.name, stat.st_size))
+        # Oldest first, so the least recently used file is evicted first
+        for _, filename, size in sorted(existing):
+            self._entries[filename] = size
+            self.total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def path_for(self, filename: str) -> str:
+        """Return the absolute path of a cached file."""
+        return os.path.join(self.cache_dir, filename)
+
+    def get_or_render(self, key: str, render: Callable[[str], None]) -> str:
+        """
+        Return the cached file for a key, rendering it if needed.
+
+        Args:
+            key (str): Cache key (used as the filename stem)
+            render (Callable[[str], None]): Writes the plot to the path it is given
+
+        Returns:
+            str: Filename of the rendered plot inside ``cache_dir``
+        """
+        filename = f"{key}{self.suffix}"
+        path = self.path_for(filename)
+        with self._lock:
+            if filename in self._entries:
+                if os.path.exists(path):
+                    self._entries.move_to_end(filename)
+                    _touch(path)
+                    return filename
+                # Removed behind our back (e.g. by another process)
+                self.total_bytes -= self._entries.pop(filename)
+            pending = self._pending.get(filename)
+            owner = pending is None
+            if owner:
+                pending = self._pending[filename] = _PendingRender()
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return filename
+
+        try:
+            tmp_path = os.path.join(self.cache_dir, f".{key}.{os.getpid()}.{threading.get_ident()}{self.suffix}")
+            try:
+                render(tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            with self._lock:
+                self._entries[filename] = os.path.getsize(path)
+                self.total_bytes += self._entries[filename]
+                self._evict(keep=filename)
+            return filename
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[filename]
+            pending.done.set()
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        # Caller holds self._lock
+        while self.total_bytes > self.max_bytes and self._entries:
+            filename = next(iter(self._entries))
+            if filename == keep:
+                break
+            self.total_bytes -= self._entries.pop(filename)
+            try:
+                os.remove(self.path_for(filename))
+            except OSError:
+                pass
+
+    def __contains__(self, key: str) -> bool:
+        return f"{key}{self.suffix}" in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _touch(path: str) -> None:
+    # Keep mtimes in LRU order so a restarted process evicts in the same order
+    try:
+        os.utime(path)
+    except OSError:
+        pass
@@ -0,0 +1,120 @@
+import math
+from typing import Dict, Iterable
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Mergeable count/mean/variance/min/max accumulator.
+
+    Single values are folded in with Welford's update and whole batches with
+    Chan et al.'s parallel combination, so partial results from chunks,
+    partitions or worker processes can be merged without revisiting data.
+    The variance uses ``ddof=1`` to match ``pandas.Series.std``.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 min: float = math.inf, max: float = -math.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    def push(self, value: float) -> None:
+        """
+        Add a single observation in O(1).
+
+        Args:
+            value (float): New observation; NaN is ignored
+        """
+        if value != value:  # NaN
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update(self, values: Iterable[float]) -> 'RunningStats':
+        """
+        Add a batch of observations.
+
+        Args:
+            values (Iterable[float]): Observations; NaNs are ignored
+
+        Returns:
+            RunningStats: self, for chaining
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = float(values.mean())
+            batch = RunningStats(len(values), mean, float(((values - mean) ** 2).sum()),
+                                 float(values.min()), float(values.max()))
+            self.merge(batch)
+        return self
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Fold another accumulator into this one.
+
+        Args:
+            other (RunningStats): Partial statistics over disjoint data
+
+        Returns:
+            RunningStats: self, for chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN with fewer than two observations."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return math.sqrt(self.variance)
+
+    def zscore(self, values):
+        """
+        Standardize values against the accumulated mean and std.
+
+        Args:
+            values: Scalar or array of observations
+
+        Returns:
+            Z-scores with the same shape as ``values``
+        """
+        return (np.asarray(values, dtype=float) - self.mean) / self.std
+
+    def to_dict(self) -> Dict[str, float]:
+        """Serialize the accumulator to plain numbers."""
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, float]) -> 'RunningStats':
+        """Rebuild an accumulator saved with ``to_dict``."""
+        return cls(**state)
+
+    def __repr__(self) -> str:
+        return f"RunningStats(count={self.count}, mean={self.mean:.4g}, std={self.std:.4g})"
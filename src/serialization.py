@@ -0,0 +1,115 @@
+import json
+import struct
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+BINARY_MAGIC = b'CLIM'
+BINARY_VERSION = 1
+BINARY_MIMETYPE = 'application/vnd.climate-series'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _station_blocks(frame: pd.DataFrame):
+    """Yield (station_id, station_name, start, stop) for each contiguous station block."""
+    if frame.empty:
+        return
+    codes, _ = pd.factorize(frame['station_id'])
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], len(frame)]
+    ids = frame['station_id'].to_numpy()
+    names = frame['station_name'].to_numpy()
+    for start, stop in zip(starts, stops):
+        yield str(ids[start]), str(names[start]), int(start), int(stop)
+
+
+def iter_ndjson(frame: pd.DataFrame, chunk_rows: int = 5000) -> Iterator[str]:
+    """
+    Encode station series as newline-delimited JSON, one chunk per line.
+
+    Each line holds up to ``chunk_rows`` consecutive readings of a single
+    station, so only one chunk is ever converted to Python objects at a time.
+
+    Args:
+        frame (pd.DataFrame): Rows grouped by station and sorted by date
+        chunk_rows (int): Maximum readings per line
+
+    Yields:
+        str: JSON object followed by a newline
+    """
+    dates = frame['date'].to_numpy(dtype='datetime64[D]')
+    temps = frame['temperature'].to_numpy(dtype=float)
+    for station_id, station_name, start, stop in _station_blocks(frame):
+        for lo in range(start, stop, chunk_rows):
+            hi = min(lo + chunk_rows, stop)
+            yield json.dumps({
+                'station_id': station_id,
+                'station_name': station_name,
+                'dates': np.datetime_as_string(dates[lo:hi], unit='D').tolist(),
+                'temperatures': temps[lo:hi].tolist()
+            }) + '\n'
+
+
+def iter_binary(frame: pd.DataFrame) -> Iterator[bytes]:
+    """
+    Encode station series as packed little-endian arrays.
+
+    Layout: ``CLIM`` magic, uint32 version, uint32 header length, a JSON
+    header listing ``{"station_id", "station_name", "count"}`` per station,
+    then for every station ``count`` int32 day offsets from 1970-01-01
+    followed by ``count`` float32 temperatures.
+
+    Args:
+        frame (pd.DataFrame): Rows grouped by station and sorted by date
+
+    Yields:
+        bytes: Header first, then one payload per station
+    """
+    blocks = list(_station_blocks(frame))
+    header = json.dumps({
+        'epoch': str(EPOCH),
+        'stations': [{'station_id': sid, 'station_name': name, 'count': stop - start}
+                     for sid, name, start, stop in blocks]
+    }).encode()
+    yield BINARY_MAGIC + struct.pack('<II', BINARY_VERSION, len(header)) + header
+
+    days = (frame['date'].to_numpy(dtype='datetime64[D]') - EPOCH).astype('<i4')
+    temps = frame['temperature'].to_numpy(dtype='<f4')
+    for _, _, start, stop in blocks:
+        yield days[start:stop].tobytes() + temps[start:stop].tobytes()
+
+
+def decode_binary(payload: bytes) -> List[Dict]:
+    """
+    Decode a payload produced by ``iter_binary``.
+
+    Args:
+        payload (bytes): Complete binary response body
+
+    Returns:
+        List[Dict]: Per station: station_id, station_name, dates (datetime64[D]) and temperatures (float32)
+    """
+    if payload[:4] != BINARY_MAGIC:
+        raise ValueError("Not a climate series payload")
+    version, header_len = struct.unpack_from('<II', payload, 4)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported payload version: {version}")
+    offset = 12 + header_len
+    header = json.loads(payload[12:offset])
+
+    stations = []
+    for station in header['stations']:
+        count = station['count']
+        days = np.frombuffer(payload, dtype='<i4', count=count, offset=offset)
+        offset += 4 * count
+        temps = np.frombuffer(payload, dtype='<f4', count=count, offset=offset)
+        offset += 4 * count
+        stations.append({
+            'station_id': station['station_id'],
+            'station_name': station['station_name'],
+            'dates': EPOCH + days.astype('timedelta64[D]'),
+            'temperatures': temps
+        })
+    return stations
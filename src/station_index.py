@@ -0,0 +1,166 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class StationIndex:
+    """
+    Station and date index over a cleaned climate DataFrame.
+
+    The frame is sorted once by station and date so every station occupies a
+    contiguous block of rows. Lookups resolve a station name through a small
+    per-station table (one entry per station, not per row) and then narrow
+    the block to a date range with binary search, so no request ever scans
+    the full frame.
+    """
+
+    def __init__(self, frame: pd.DataFrame, station_ids: np.ndarray, station_names: np.ndarray,
+                 starts: np.ndarray, ends: np.ndarray):
+        """
+        Initialize the index. Use ``StationIndex.build`` to construct one.
+
+        Args:
+            frame (pd.DataFrame): Cleaned data sorted by station_id then date
+            station_ids (np.ndarray): Station id of each block
+            station_names (np.ndarray): Station name of each block
+            starts (np.ndarray): First row of each station block
+            ends (np.ndarray): One past the last row of each station block
+        """
+        self.frame = frame
+        self.station_ids = station_ids
+        self.station_names = station_names
+        self.starts = starts
+        self.ends = ends
+        self.dates = frame['date'].to_numpy(dtype='datetime64[ns]')
+        self._exact: Dict[str, int] = {}
+        for position, (station_id, name) in enumerate(zip(station_ids, station_names)):
+            self._exact.setdefault(str(station_id).lower(), position)
+            self._exact.setdefault(str(name).lower(), position)
+        self._lowered_names = [str(name).lower() for name in station_names]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'StationIndex':
+        """
+        Sort a cleaned frame and record each station's row block.
+
+        Args:
+            df (pd.DataFrame): Cleaned data with station_id, station_name and date columns
+
+        Returns:
+            StationIndex: Index whose ``frame`` is the sorted data
+        """
+        frame = df.sort_values(['station_id', 'date'], kind='stable', ignore_index=True)
+        codes, _ = pd.factorize(frame['station_id'])
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(frame)].astype(int)
+        station_ids = np.asarray(frame['station_id'].to_numpy()[starts], dtype=object)
+        station_names = np.asarray(frame['station_name'].to_numpy()[starts], dtype=object)
+        return cls(frame, station_ids, station_names, starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def resolve(self, query: str) -> List[int]:
+        """
+        Find the stations matching a name or id, case-insensitively.
+
+        An exact id or name match wins; otherwise every station whose name
+        contains the query is returned, in index order.
+
+        Args:
+            query (str): Full or partial station name, or station id
+
+        Returns:
+            List[int]: Station positions in this index
+        """
+        needle = query.strip().lower()
+        if needle in self._exact:
+            return [self._exact[needle]]
+        return [i for i, name in enumerate(self._lowered_names) if needle in name]
+
+    def resolve_name(self, query: str) -> Optional[str]:
+        """
+        Return the full name of the first station matching a query.
+
+        Args:
+            query (str): Full or partial station name, or station id
+
+        Returns:
+            Optional[str]: Station name, or None if nothing matches
+        """
+        matches = self.resolve(query)
+        return str(self.station_names[matches[0]]) if matches else None
+
+    def row_range(self, position: int, start=None, end=None) -> slice:
+        """
+        Locate one station's rows between two dates (inclusive) by binary search.
+
+        Args:
+            position (int): Station position from ``resolve``
+            start: First date to include, or None for the station's first row
+            end: Last date to include, or None for the station's last row
+
+        Returns:
+            slice: Row positions in ``frame``
+        """
+        lo, hi = int(self.starts[position]), int(self.ends[position])
+        block = self.dates[lo:hi]
+        if start is not None:
+            lo += int(np.searchsorted(block, np.datetime64(pd.Timestamp(start), 'ns'), side='left'))
+        if end is not None:
+            hi = int(self.starts[position]) + int(np.searchsorted(block, np.datetime64(pd.Timestamp(end), 'ns'), side='right'))
+        return slice(lo, max(lo, hi))
+
+    def station_frame(self, position: int, start=None, end=None) -> pd.DataFrame:
+        """
+        Return one station's rows between two dates without scanning the frame.
+
+        Args:
+            position (int): Station position from ``resolve``
+            start: First date to include (anything ``pd.Timestamp`` accepts)
+            end: Last date to include
+
+        Returns:
+            pd.DataFrame: Rows for that station, sorted by date
+        """
+        return self.frame.iloc[self.row_range(position, start, end)]
+
+    def select(self, positions: Optional[List[int]] = None, start=None, end=None) -> pd.DataFrame:
+        """
+        Return rows for several stations within a date range.
+
+        Args:
+            positions (List[int]): Station positions, or None for every station
+            start: First date to include
+            end: Last date to include
+
+        Returns:
+            pd.DataFrame: Matching rows, grouped by station and sorted by date
+        """
+        if positions is None:
+            if start is None and end is None:
+                return self.frame
+            positions = range(len(self))
+        positions = list(positions)
+        if len(positions) == 1:
+            return self.station_frame(positions[0], start, end)
+        if not positions:
+            return self.frame.iloc[0:0]
+        ranges = [self.row_range(i, start, end) for i in positions]
+        rows = np.concatenate([np.arange(r.start, r.stop) for r in ranges])
+        return self.frame.iloc[rows]
+
+    def lookup(self, query: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Return rows for every station matching a query within a date range.
+
+        Args:
+            query (str): Full or partial station name, or station id
+            start: First date to include
+            end: Last date to include
+
+        Returns:
+            pd.DataFrame: Matching rows (empty if no station matches)
+        """
+        return self.select(self.resolve(query), start, end)
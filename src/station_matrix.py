@@ -0,0 +1,197 @@
+import json
+import os
+import shutil
+import warnings
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MATRIX_FORMAT_VERSION = 1
+
+
+class StationMatrix:
+    """
+    Dense station x calendar-day matrix of daily temperatures.
+
+    ``values`` is a contiguous float32 array with one row per station and one
+    column per day of the shared ``dates`` axis, NaN where a station has no
+    reading. Cross-station analytics become NumPy reductions over one block
+    instead of per-station groupbys, and the matrix can be saved as a
+    ``.npy`` file and memory-mapped back.
+    """
+
+    def __init__(self, values: np.ndarray, start: np.datetime64,
+                 station_ids: np.ndarray, station_names: np.ndarray):
+        """
+        Initialize the matrix. Use ``StationMatrix.from_frame`` to build one.
+
+        Args:
+            values (np.ndarray): float32 array of shape (stations, days)
+            start (np.datetime64): Date of the first column
+            station_ids (np.ndarray): Station id of each row
+            station_names (np.ndarray): Station name of each row
+        """
+        self.values = values
+        self.start = np.datetime64(start, 'D')
+        self.dates = self.start + np.arange(values.shape[1])
+        self.station_ids = station_ids
+        self.station_names = station_names
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'StationMatrix':
+        """
+        Scatter a cleaned long-format frame into the dense matrix.
+
+        Rows are stations in order of first appearance; columns run from the
+        earliest to the latest date of the whole frame. Several readings of
+        one station on one day are averaged.
+
+        Args:
+            df (pd.DataFrame): Cleaned data with station_id, station_name, date and temperature
+
+        Returns:
+            StationMatrix: Matrix over the frame's stations and date span
+        """
+        codes, station_ids = pd.factorize(df['station_id'])
+        names = df['station_name'].to_numpy()
+        first_rows = np.unique(codes, return_index=True)[1]
+        days = df['date'].to_numpy(dtype='datetime64[D]')
+        temperatures = df['temperature'].to_numpy(dtype=float)
+        if len(df) == 0:
+            return cls(np.empty((0, 0), dtype=np.float32), np.datetime64('1970-01-01'),
+                       np.empty(0, dtype=object), np.empty(0, dtype=object))
+
+        start = days.min()
+        n_days = int((days.max() - start).astype(np.int64)) + 1
+        valid = ~np.isnan(temperatures)
+        cells = codes[valid] * n_days + (days[valid] - start).astype(np.int64)
+        size = len(station_ids) * n_days
+        counts = np.bincount(cells, minlength=size)
+        sums = np.bincount(cells, weights=temperatures[valid], minlength=size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = (sums / counts).astype(np.float32).reshape(len(station_ids), n_days)
+        return cls(values, start, np.asarray(station_ids, dtype=object),
+                   np.asarray(names[first_rows], dtype=object))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def row(self, station: str) -> Optional[int]:
+        """
+        Find a station's row by id or name, case-insensitively.
+
+        Args:
+            station (str): Station id or name
+
+        Returns:
+            Optional[int]: Row index, or None if the station is unknown
+        """
+        query = str(station).lower()
+        for labels in (self.station_ids, self.station_names):
+            matches = np.flatnonzero([str(label).lower() == query for label in labels])
+            if len(matches):
+                return int(matches[0])
+        return None
+
+    def labels(self, by: str = 'station_name') -> np.ndarray:
+        """Row labels: ``station_name`` or ``station_id``."""
+        if by not in ('station_name', 'station_id'):
+            raise ValueError(f"Unknown station label: {by}")
+        return self.station_names if by == 'station_name' else self.station_ids
+
+    def station_stats(self) -> Dict[str, np.ndarray]:
+        """
+        Per-station reading count, mean, sample std, min and max as row reductions.
+
+        Returns:
+            Dict[str, np.ndarray]: One array per statistic, aligned with the
+                rows (NaN for stations without readings)
+        """
+        values = np.asarray(self.values)
+        counts = np.count_nonzero(~np.isnan(values), axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN rows
+            return {
+                'count': counts,
+                'mean': np.nanmean(values, axis=1, dtype=np.float64),
+                'std': np.nanstd(values, axis=1, dtype=np.float64, ddof=1),
+                'min': np.nanmin(values, axis=1).astype(float) if values.shape[1] else np.full(len(counts), np.nan),
+                'max': np.nanmax(values, axis=1).astype(float) if values.shape[1] else np.full(len(counts), np.nan),
+            }
+
+    def long_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Flatten the observed cells back to long format.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Values, row index and
+                date of every non-NaN cell, grouped by row in date order
+        """
+        rows, columns = np.nonzero(~np.isnan(self.values))
+        return self.values[rows, columns].astype(float), rows, self.dates[columns]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert the observed cells to a long-format frame.
+
+        Returns:
+            pd.DataFrame: station_id, station_name, date and temperature columns
+        """
+        values, rows, dates = self.long_arrays()
+        return pd.DataFrame({
+            'station_id': self.station_ids[rows],
+            'station_name': self.station_names[rows],
+            'date': dates.astype('datetime64[ns]'),
+            'temperature': values,
+        })
+
+    def save(self, store_dir: str) -> None:
+        """
+        Write the matrix as ``values.npy`` plus ``meta.json``.
+
+        The files are written to a temporary directory and swapped in, so
+        concurrent readers never see a partial matrix.
+
+        Args:
+            store_dir (str): Destination directory
+        """
+        tmp_dir = f"{store_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        np.save(os.path.join(tmp_dir, 'values.npy'), np.ascontiguousarray(self.values, dtype=np.float32))
+        meta = {
+            'version': MATRIX_FORMAT_VERSION,
+            'start': str(self.start),
+            'station_ids': [str(s) for s in self.station_ids],
+            'station_names': [str(s) for s in self.station_names],
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(tmp_dir, store_dir)
+
+    @classmethod
+    def load(cls, store_dir: str, mmap: bool = True) -> 'StationMatrix':
+        """
+        Load a matrix written by ``save``.
+
+        Args:
+            store_dir (str): Directory written by ``save``
+            mmap (bool): Memory-map ``values.npy`` read-only instead of reading it
+
+        Returns:
+            StationMatrix: The stored matrix
+        """
+        with open(os.path.join(store_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != MATRIX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported station matrix format in {store_dir}")
+        values = np.load(os.path.join(store_dir, 'values.npy'), mmap_mode='r' if mmap else None)
+        return cls(values, np.datetime64(meta['start']),
+                   np.asarray(meta['station_ids'], dtype=object),
+                   np.asarray(meta['station_names'], dtype=object))
@@ -0,0 +1,169 @@
+import math
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .running_stats import RunningStats
+except ImportError:  # imported with src/ on sys.path (main.py, generate_cache.py)
+    from running_stats import RunningStats
+
+
+def _number(value: float) -> Optional[float]:
+    # JSON has no NaN/inf; a single-reading station has no std
+    return None if value is None or not math.isfinite(value) else round(float(value), 2)
+
+
+def _stats_dict(stats: RunningStats) -> Dict[str, Any]:
+    return {
+        'count': stats.count,
+        'mean': _number(stats.mean),
+        'std': _number(stats.std),
+        'min': _number(stats.min),
+        'max': _number(stats.max),
+    }
+
+
+class SummaryStore:
+    """
+    Materialized per-station, per-year and global temperature summaries.
+
+    Rows are folded in as mergeable ``RunningStats`` partial aggregates keyed
+    by (station, year); station and global figures are merges of those
+    partials. Appending rows therefore only aggregates the new rows, and the
+    JSON payloads served by the API are built once per change and reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._yearly: Dict[Tuple[str, int], RunningStats] = {}
+        self._dates: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]] = {}
+        self.total_records = 0
+        self.updated_at: Optional[pd.Timestamp] = None
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SummaryStore':
+        """
+        Summarize a cleaned frame in one grouped pass.
+
+        Args:
+            df (pd.DataFrame): Cleaned data with station_name, date and temperature columns
+
+        Returns:
+            SummaryStore: Store holding the frame's summaries
+        """
+        return cls().append(df)
+
+    def append(self, rows: pd.DataFrame) -> 'SummaryStore':
+        """
+        Fold new cleaned rows into the summaries without rescanning old ones.
+
+        Args:
+            rows (pd.DataFrame): Rows not yet summarized
+
+        Returns:
+            SummaryStore: self, for chaining
+        """
+        if len(rows) == 0:
+            return self
+        stations = rows['station_name'].astype(str)
+        partials = rows['temperature'].groupby([stations, rows['date'].dt.year], sort=False).agg(
+            ['count', 'mean', 'var', 'min', 'max'])
+        bounds = rows['date'].groupby(stations, sort=False).agg(['min', 'max'])
+
+        with self._lock:
+            for (station, year), count, mean, var, low, high in partials.itertuples(name=None):
+                if count == 0:
+                    continue
+                m2 = var * (count - 1) if count > 1 else 0.0
+                partial = RunningStats(int(count), float(mean), float(m2), float(low), float(high))
+                self._yearly.setdefault((station, int(year)), RunningStats()).merge(partial)
+            for station, first, last in bounds.itertuples(name=None):
+                if station in self._dates:
+                    first = min(first, self._dates[station][0])
+                    last = max(last, self._dates[station][1])
+                self._dates[station] = (first, last)
+            self.total_records += len(rows)
+            self.updated_at = pd.Timestamp.now()
+            self._payloads.clear()
+        return self
+
+    def _station_stats(self) -> Dict[str, RunningStats]:
+        # Caller holds self._lock
+        stations: Dict[str, RunningStats] = {}
+        for (station, _), partial in sorted(self._yearly.items()):
+            stations.setdefault(station, RunningStats()).merge(partial)
+        return stations
+
+    def _global_stats(self, stations: Dict[str, RunningStats]) -> RunningStats:
+        total = RunningStats()
+        for partial in stations.values():
+            total.merge(partial)
+        return total
+
+    def _date_range(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        if not self._dates:
+            return None, None
+        return min(first for first, _ in self._dates.values()), max(last for _, last in self._dates.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the /api/stats payload, building it only after a change.
+
+        Returns:
+            Dict[str, Any]: Record and station counts, span in years, mean temperature and date range
+        """
+        with self._lock:
+            payload = self._payloads.get('stats')
+            if payload is None:
+                stations = self._station_stats()
+                first, last = self._date_range()
+                payload = self._payloads['stats'] = {
+                    'total_records': self.total_records,
+                    'stations': len(stations),
+                    'years': (last - first).days / 365.25 if first is not None else 0.0,
+                    'avg_temperature': _number(self._global_stats(stations).mean) if stations else None,
+                    'date_range': {
+                        'start': first.strftime('%Y-%m-%d') if first is not None else None,
+                        'end': last.strftime('%Y-%m-%d') if last is not None else None
+                    }
+                }
+            return payload
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Return the /export-analysis payload, building it only after a change.
+
+        Returns:
+            Dict[str, Any]: Dataset summary plus per-station and per-station-year statistics
+        """
+        with self._lock:
+            payload = self._payloads.get('export')
+            if payload is None:
+                stations = self._station_stats()
+                first, last = self._date_range()
+                yearly: Dict[str, Dict[int, Dict[str, Any]]] = {}
+                for (station, year), partial in sorted(self._yearly.items()):
+                    yearly.setdefault(station, {})[year] = _stats_dict(partial)
+                payload = self._payloads['export'] = {
+                    'data_summary': {
+                        'total_records': self.total_records,
+                        'stations': len(stations),
+                        'date_range': {
+                            'start': first.strftime('%Y-%m-%d') if first is not None else None,
+                            'end': last.strftime('%Y-%m-%d') if last is not None else None
+                        },
+                        'temperature': _stats_dict(self._global_stats(stations))
+                    },
+                    'station_summary': {
+                        station: dict(_stats_dict(partial),
+                                      first_date=self._dates[station][0].strftime('%Y-%m-%d'),
+                                      last_date=self._dates[station][1].strftime('%Y-%m-%d'))
+                        for station, partial in stations.items()
+                    },
+                    'yearly_summary': yearly,
+                    'analysis_timestamp': self.updated_at.isoformat() if self.updated_at is not None else None
+                }
+            return payload
@@ -1,114 +1,241 @@
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 
-from typing import List
+import hashlib
+import io
+import threading
+from typing import Callable, List, Optional, Union
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
 import numpy as np
 import pandas as pd
 import seaborn as sns
 
+# Output resolution presets accepted wherever a dpi is expected
+DPI_PRESETS = {
+    'thumbnail': 50,
+    'web': 100,
+    'print': 300,
+}
+
+# Agg settings for the fast renderer: drop sub-pixel vertices from long
+# series and draw paths in chunks so 100k-point lines stay cheap
+FAST_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 0.5,
+    'agg.path.chunksize': 10000,
+}
+
+RENDERERS = ('pyplot', 'agg')
+
+# Above this many heatmap cells, per-cell annotations are unreadable and the
+# mesh is rasterized instead of drawn as one vector patch per cell
+HEATMAP_ANNOTATION_MAX_CELLS = 400
+
+# Image formats render_bytes can produce, with their HTTP content types
+IMAGE_MIMETYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+}
+
+
+def resolve_dpi(dpi: Union[str, int, float]) -> float:
+    """Turn a DPI preset name or number into a number."""
+    if isinstance(dpi, str):
+        if dpi not in DPI_PRESETS:
+            raise ValueError(f"Unknown DPI preset: {dpi}. Choose from {', '.join(DPI_PRESETS)}")
+        return DPI_PRESETS[dpi]
+    return dpi
+
+
+class RenderedPlot:
+    """An encoded plot image held in memory."""
+
+    def __init__(self, data: bytes, format: str):
+        """
+        Args:
+            data (bytes): Encoded image
+            format (str): Image format, a key of ``IMAGE_MIMETYPES``
+        """
+        self.data = data
+        self.format = format
+        # Content hash, usable as an HTTP ETag or a cache key
+        self.etag = hashlib.sha256(data).hexdigest()
+
+    @property
+    def mimetype(self) -> str:
+        return IMAGE_MIMETYPES[self.format]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
 class ClimateVisualizer:
-    def __init__(self):
+    def __init__(self, renderer: str = 'pyplot', dpi: Union[str, int, float] = 'print'):
+        """
+        Initialize the plotting style.
+
+        Args:
+            renderer (str): 'pyplot' draws through the global pyplot state and
+                trims the saved image with ``bbox_inches='tight'``; 'agg' draws
+                on ``Figure``/``FigureCanvasAgg`` objects reused per thread,
+                with path simplification and a single layout pass, and is
+                safe to call from several threads at once
+            dpi (str or float): Output resolution, a number or one of
+                ``DPI_PRESETS`` ('thumbnail', 'web', 'print')
+        """
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer: {renderer}. Choose from {', '.join(RENDERERS)}")
+        self.renderer = renderer
+        self.dpi = resolve_dpi(dpi)
+        self._templates = threading.local()
         plt.style.use('default')
         sns.set_theme()
 
-    def plot_temperature_with_predictions_and_anomalies(self, dates, temperatures, predictions, anomalies, title, output_path=None):
-        plt.figure(figsize=(14, 6))
-
-        # Actual data
-        plt.plot(dates, temperatures, label="Actual", color="blue")
-
-        # Predicted data
-        if len(predictions) > 0:
-            future_dates = pd.date_range(start=dates[-1], periods=len(predictions) + 1, freq='D')[1:]
-            plt.plot(future_dates, predictions, label="Predicted", color="red", linestyle="--", linewidth=2)
-
-        # Anomalies
-        if len(anomalies) > 0:
-            anomaly_dates = [d for d, a in zip(dates, anomalies) if a]
-            anomaly_temps = [t for t, a in zip(temperatures, anomalies) if a]
-            if len(anomaly_dates) > 0:
-                plt.scatter(anomaly_dates, anomaly_temps, color="orange", label="Anomalies", zorder=5)
-
-        plt.title(title)
-        plt.xlabel("Date")
-        plt.ylabel("Temperature (°F)")
-        plt.xticks(rotation=45)
-        plt.legend()
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')  # High quality for portfolio
-        else:
-            safe_title = title.lower().replace(" ", "_").replace(",", "").replace("/", "_")
-            plt.savefig(f"temperature_analysis_{safe_title}.png", dpi=300, bbox_inches='tight')  # High quality for portfolio
-        plt.close('all')  # Close all figures to free memory
+    def _template(self, kind: str, figsize) -> Figure:
+        # One figure per plot kind and thread, cleared and redrawn on reuse
+        templates = self._templates.__dict__
+        fig = templates.get(kind)
+        if fig is None:
+            fig = Figure(figsize=figsize, layout='tight')
+            FigureCanvasAgg(fig)
+            templates[kind] = fig
+        return fig
+
+    def _render(self, kind: str, figsize, draw: Callable, output_path, dpi=None, format=None) -> None:
+        # output_path may be a filename or a binary file object such as BytesIO
+        dpi = self.dpi if dpi is None else resolve_dpi(dpi)
+        if self.renderer == 'agg':
+            with matplotlib.rc_context(FAST_RC):
+                fig = self._template(kind, figsize)
+                draw(fig, fig.add_subplot())
+                fig.savefig(output_path, dpi=dpi, format=format)
+            fig.clear()  # drop references to the plotted data
+            return
 
-    def plot_cluster_summary(self, station_names: List[str], cluster_ids: List[int], output_path=None) -> None:
-        import matplotlib.pyplot as plt
-        import seaborn as sns
-
-        plt.figure(figsize=(12, 8))
-        
-        # Create a DataFrame for better plotting
-        df = pd.DataFrame({
-            'Station': station_names,
-            'Cluster': cluster_ids
-        })
-        
-        # Create a scatter plot instead of bar plot for better visualization
-        colors = ['#ff7f0e' if c == 0 else '#1f77b4' for c in cluster_ids]  # Orange for cluster 0, Blue for cluster 1
-        
-        plt.scatter(range(len(station_names)), cluster_ids, c=colors, s=200, alpha=0.7)
-        
-        # Add station names as labels
-        for i, station in enumerate(station_names):
-            plt.annotate(station, (i, cluster_ids[i]), xytext=(0, 10), 
-                        textcoords='offset points', ha='center', fontsize=10)
-        
-        plt.title("Climate Clusters by Station", fontsize=16, fontweight='bold')
-        plt.ylabel("Cluster ID", fontsize=12)
-        plt.xlabel("Weather Stations", fontsize=12)
-        plt.ylim(-0.5, 1.5)
-        plt.xticks([])  # Remove x-axis ticks since we have annotations
-        
-        # Add cluster legend
-        from matplotlib.patches import Patch
-        legend_elements = [
-            Patch(facecolor='#ff7f0e', alpha=0.7, label='Cluster 0'),
-            Patch(facecolor='#1f77b4', alpha=0.7, label='Cluster 1')
-        ]
-        plt.legend(handles=legend_elements, loc='upper right')
-        
-        plt.grid(True, alpha=0.3)
+        fig = plt.figure(figsize=figsize)
+        draw(fig, plt.gca())
         plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')  # High quality for portfolio
-        else:
-            plt.savefig("climate_clusters.png", dpi=300, bbox_inches='tight')  # High quality for portfolio
+        plt.savefig(output_path, dpi=dpi, format=format, bbox_inches='tight')
         plt.close('all')  # Close all figures to free memory
 
-    def plot_temperature_heatmap(self, data: pd.DataFrame, regions: List[str] = None, times: List[str] = None, title: str = "Average Yearly Temperature by Station", output_path=None):
+    def render_bytes(self, plot: Callable, *args, format: str = 'png',
+                     dpi: Optional[Union[str, int, float]] = None, **kwargs) -> RenderedPlot:
+        """
+        Render a plot into memory instead of a file.
+
+        Args:
+            plot (Callable): A plot method of this visualizer, or any callable
+                accepting the same ``output_path``, ``dpi`` and ``format``
+                keywords
+            *args, **kwargs: Passed on to ``plot``
+            format (str): 'png' or 'webp'
+            dpi (str or float): Resolution override, a number or a preset
+                name; defaults to the visualizer's dpi
+
+        Returns:
+            RenderedPlot: The encoded image and its content hash
+
+        Example:
+            thumb = visualizer.render_bytes(visualizer.plot_cluster_summary,
+                                            names, ids, format='webp', dpi='thumbnail')
+        """
+        if format not in IMAGE_MIMETYPES:
+            raise ValueError(f"Unknown image format: {format}. Choose from {', '.join(IMAGE_MIMETYPES)}")
+        buffer = io.BytesIO()
+        plot(*args, output_path=buffer, dpi=dpi, format=format, **kwargs)
+        return RenderedPlot(buffer.getvalue(), format)
+
+    def plot_temperature_with_predictions_and_anomalies(self, dates, temperatures, predictions, anomalies, title, output_path=None,
+                                                        dpi=None, format=None):
+        dates = pd.DatetimeIndex(dates)
+        temperatures = np.asarray(temperatures, dtype=float)
+
+        def draw(fig, ax):
+            # Actual data
+            ax.plot(dates, temperatures, label="Actual", color="blue")
+
+            # Predicted data
+            if len(predictions) > 0:
+                future_dates = pd.date_range(start=dates[-1], periods=len(predictions) + 1, freq='D')[1:]
+                ax.plot(future_dates, predictions, label="Predicted", color="red", linestyle="--", linewidth=2)
+
+            # Anomalies
+            if len(anomalies) > 0:
+                mask = np.asarray(anomalies, dtype=bool)
+                if mask.any():
+                    ax.scatter(dates[mask], temperatures[mask], color="orange", label="Anomalies", zorder=5)
+
+            ax.set_title(title)
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Temperature (°F)")
+            ax.tick_params(axis='x', labelrotation=45)
+            ax.legend()
+
+        if not output_path:
+            safe_title = title.lower().replace(" ", "_").replace(",", "").replace("/", "_")
+            output_path = f"temperature_analysis_{safe_title}.png"
+        self._render('temperature', (14, 6), draw, output_path, dpi, format)
+
+    def plot_cluster_summary(self, station_names: List[str], cluster_ids: List[int], output_path=None,
+                             dpi=None, format=None) -> None:
+        def draw(fig, ax):
+            # Create a scatter plot instead of bar plot for better visualization
+            colors = ['#ff7f0e' if c == 0 else '#1f77b4' for c in cluster_ids]  # Orange for cluster 0, Blue for cluster 1
+
+            ax.scatter(range(len(station_names)), cluster_ids, c=colors, s=200, alpha=0.7)
+
+            # Add station names as labels
+            for i, station in enumerate(station_names):
+                ax.annotate(station, (i, cluster_ids[i]), xytext=(0, 10),
+                            textcoords='offset points', ha='center', fontsize=10)
+
+            ax.set_title("Climate Clusters by Station", fontsize=16, fontweight='bold')
+            ax.set_ylabel("Cluster ID", fontsize=12)
+            ax.set_xlabel("Weather Stations", fontsize=12)
+            ax.set_ylim(-0.5, 1.5)
+            ax.set_xticks([])  # Remove x-axis ticks since we have annotations
+
+            # Add cluster legend
+            legend_elements = [
+                Patch(facecolor='#ff7f0e', alpha=0.7, label='Cluster 0'),
+                Patch(facecolor='#1f77b4', alpha=0.7, label='Cluster 1')
+            ]
+            ax.legend(handles=legend_elements, loc='upper right')
+
+            ax.grid(True, alpha=0.3)
+
+        self._render('clusters', (12, 8), draw, output_path or "climate_clusters.png", dpi, format)
+
+    def plot_temperature_heatmap(self, data: pd.DataFrame, regions: List[str] = None, times: List[str] = None, title: str = "Average Yearly Temperature by Station", output_path=None,
+                                 dpi=None, format=None, annotate: Optional[bool] = None):
         """
         Create a heatmap of temperature data.
 
         Args:
-            data (pd.DataFrame): Pivoted DataFrame with stations as rows and years as columns
+            data (pd.DataFrame): Pivoted DataFrame with stations as rows and years
+                (or months) as columns, e.g. from ``aggregation.heatmap_frame``
             regions (List[str]): List of station names (row labels)
             times (List[str]): List of years (column labels)
             title (str): Title of the plot
-            output_path (str): Path to save the plot
+            output_path (str): Path or binary file object to save the plot to
+            dpi (str or float): Resolution override, a number or a preset name
+            format (str): Image format; inferred from output_path when omitted
+            annotate (bool, optional): Print each cell's value; by default only
+                up to ``HEATMAP_ANNOTATION_MAX_CELLS`` cells. Larger heatmaps are
+                also rasterized.
         """
-        plt.figure(figsize=(15, 6))
-        sns.heatmap(data, annot=True, cmap='coolwarm', fmt=".1f", cbar_kws={'label': 'Temperature (°F)'})
-        plt.title(title)
-        plt.xlabel("Year")
-        plt.ylabel("Station")
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')  # High quality for portfolio
-        else:
-            plt.savefig("temperature_heatmap.png", dpi=300, bbox_inches='tight')  # High quality for portfolio
-        plt.close('all')  # Close all figures to free memory
+        large = data.size > HEATMAP_ANNOTATION_MAX_CELLS
+        if annotate is None:
+            annotate = not large
+
+        def draw(fig, ax):
+            sns.heatmap(data, annot=annotate, cmap='coolwarm', fmt=".1f", cbar_kws={'label': 'Temperature (°F)'},
+                        rasterized=large, ax=ax)
+            ax.set_title(title)
+            ax.set_xlabel("Month" if data.columns.name == 'month' else "Year")
+            ax.set_ylabel("Station")
+
+        self._render('heatmap', (15, 6), draw, output_path or "temperature_heatmap.png", dpi, format)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.aggregation import grouped_means, heatmap_frame, period_codes
+from src.station_matrix import StationMatrix
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('1999-11-01', periods=200)
+    return pd.DataFrame({
+        'station_id': ['B'] * 200 + ['A'] * 150,
+        'station_name': ['Station B'] * 200 + ['Station A'] * 150,
+        'date': list(dates) + list(dates[50:]),
+        'temperature': np.r_[rng.normal(40, 5, 200), rng.normal(70, 3, 150)]
+    })
+
+
+@pytest.mark.parametrize('period', ['year', 'month'])
+def test_heatmap_frame_matches_pivot_table(frame, period):
+    keyed = frame.assign(year=frame['date'].dt.year, month=frame['date'].dt.month)
+    expected = keyed.pivot_table(index='station_name', columns=period, values='temperature', aggfunc='mean')
+
+    result = heatmap_frame(frame, period=period)
+
+    assert list(result.index) == list(expected.index)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+    assert 'year' not in frame.columns  # input frame untouched
+
+
+def test_heatmap_frame_drops_unlabelled_and_undated_rows_like_pivot_table(frame):
+    frame.loc[frame.index[:10], 'station_name'] = None
+    frame.loc[frame.index[20], 'date'] = pd.NaT
+    expected = frame.assign(year=frame['date'].dt.year).pivot_table(
+        index='station_name', columns='year', values='temperature', aggfunc='mean')
+
+    result = heatmap_frame(frame, period='year')
+
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+
+
+def test_heatmap_frame_from_station_matrix(frame):
+    result = heatmap_frame(StationMatrix.from_frame(frame), period='year')
+    np.testing.assert_allclose(result.to_numpy(), heatmap_frame(frame, period='year').to_numpy(), rtol=1e-5)
+
+
+def test_grouped_means_skip_nan_and_leave_empty_cells_nan():
+    dates = np.array(['2000-06-01', '2000-06-02', '2001-06-01', '2001-06-02'], dtype='datetime64[D]')
+    means, labels = grouped_means([1.0, np.nan, 3.0, 5.0], [0, 0, 0, 1], dates, n_segments=2)
+    assert list(labels) == [2000, 2001]
+    np.testing.assert_array_equal(means, [[1.0, 3.0], [np.nan, 5.0]])
+
+
+def test_period_codes_rejects_unknown_period():
+    with pytest.raises(ValueError):
+        period_codes(np.array(['2000-01-01'], dtype='datetime64[D]'), 'week')
@@ -17,7 +17,7 @@ def test_detect_anomalies_behavior():
     ml = ClimateML()
     data = np.array([20, 21, 22, 23, 150, 24, 25])  # 150 is an obvious outlier
     anomalies = ml.detect_anomalies(data)
-    assert isinstance(anomalies, list)
+    assert isinstance(anomalies, np.ndarray) and anomalies.dtype == bool
     assert len(anomalies) == len(data)
     assert any(anomalies)  # There should be at least one True (for the outlier)
 
@@ -42,5 +42,144 @@ def test_anomaly_threshold_effect(threshold):
     ml = ClimateML()
     data = np.array([10] * 50 + [100])  # One extreme outlier
     anomalies = ml.detect_anomalies(data, threshold=threshold)
-    assert anomalies[-1] is True  # Ensure last value is detected as an anomaly
+    assert anomalies[-1]  # Ensure last value is detected as an anomaly
 
+
+
+def test_predict_temperature_reuses_registry_model(tmp_path, monkeypatch):
+    from src.model_registry import ModelRegistry
+
+    registry = ModelRegistry(str(tmp_path / 'models'))
+    historical_data = np.sin(np.linspace(0, 12, 120)) * 10 + 60
+    first = ClimateML(registry=registry, lstm_config={'epochs': 1})
+    forecast = first.predict_temperature(historical_data, historical_data, forecast_period=5, station="Station A")
+
+    second = ClimateML(registry=registry, lstm_config={'epochs': 1})
+    monkeypatch.setattr(second, '_train_lstm', lambda scaled: pytest.fail("model was retrained"))
+    assert np.allclose(second.predict_temperature(historical_data, historical_data, 5, station="Station A"), forecast)
+
+    changed = ClimateML(registry=registry, lstm_config={'epochs': 2})
+    trained = []
+    original_train = changed._train_lstm
+    monkeypatch.setattr(changed, '_train_lstm', lambda scaled: trained.append(1) or original_train(scaled))
+    changed.predict_temperature(historical_data, historical_data, 5, station="Station A")
+    assert trained == [1]
+    assert len(list(next((tmp_path / 'models').glob('Station_A-*')).iterdir())) == 1
+
+
+def test_rollout_matches_stepwise_predict():
+    ml = ClimateML(lstm_config={'epochs': 1})
+    historical_data = np.sin(np.linspace(0, 12, 120)) * 10 + 60
+    ml.predict_temperature(historical_data, historical_data, forecast_period=1)
+
+    window = ml.scaler.transform(historical_data.reshape(-1, 1))[-10:]
+    expected = []
+    current = window.copy()
+    for _ in range(5):
+        next_value = ml.model.predict(current.reshape(1, 10, 1), verbose=0)[0, 0]
+        expected.append(next_value)
+        current = np.append(current[1:], [[next_value]], axis=0)
+
+    batch = np.stack([window, window[::-1]])
+    rolled = ml.rollout(batch, 5)
+    assert rolled.shape == (2, 5)
+    assert np.allclose(rolled[0], expected, atol=1e-5)
+
+
+def test_predict_temperature_batch_shapes():
+    ml = ClimateML(lstm_config={'epochs': 1})
+    stations = {
+        "Station A": np.sin(np.linspace(0, 12, 120)) * 10 + 60,
+        "Station B": np.cos(np.linspace(0, 12, 90)) * 5 + 40,
+    }
+    forecasts = ml.predict_temperature_batch(stations, forecast_period=7)
+    assert set(forecasts) == set(stations)
+    assert all(f.shape == (7,) for f in forecasts.values())
+
+
+def test_create_sequences_matches_loop_and_is_zero_copy():
+    ml = ClimateML()
+    data = np.arange(40, dtype=float).reshape(-1, 1)
+    X, y = ml.create_sequences(data, 10)
+    assert X.shape == (30, 10, 1) and y.shape == (30, 1)
+    assert np.array_equal(X[3], data[3:13]) and y[3, 0] == 13
+    assert np.shares_memory(X, data)
+    assert not X.flags.writeable and not y.flags.writeable
+
+
+def test_create_sequences_stride_horizon_and_features():
+    ml = ClimateML()
+    data = np.column_stack([np.arange(30.0), -np.arange(30.0)])
+    X, y = ml.create_sequences(data, 5, stride=3, horizon=2)
+    assert X.shape == (8, 5, 2) and y.shape == (8, 2, 2)
+    assert np.array_equal(X[2], data[6:11])
+    assert np.array_equal(y[2], data[11:13])
+
+
+def test_make_sequence_dataset_batches():
+    ml = ClimateML()
+    dataset = ml.make_sequence_dataset(np.arange(50, dtype=float), 10, batch_size=16, shuffle=False)
+    batches = list(dataset.as_numpy_iterator())
+    assert [len(X) for X, _ in batches] == [16, 16, 8]
+    assert np.array_equal(batches[0][0][1], np.arange(1, 11))
+    assert batches[0][1][1] == 11
+
+
+def test_import_does_not_load_tensorflow_or_sklearn():
+    import subprocess
+    import sys
+
+    code = "import sys, src.ml_algorithms; print('tensorflow' in sys.modules, 'sklearn' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['False', 'False']
+
+
+def test_detect_anomalies_batch_matches_per_station():
+    import pandas as pd
+    from src.anomaly import mad_scores
+
+    ml = ClimateML()
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame({
+        'station_id': np.repeat(['B', 'A', 'C'], 60),
+        'date': np.tile(pd.date_range('2000-01-01', periods=60), 3),
+        'temperature': rng.normal(50, 5, 180),
+    }).sample(frac=1, random_state=0)  # any row order
+    frame.loc[frame.index[5], 'temperature'] = 120.0
+
+    flags, scores = ml.detect_anomalies_batch(frame, method='zscore')
+    assert flags.dtype == bool and scores.shape == (180,)
+    for _, station in frame.assign(flag=flags, score=scores).groupby('station_id'):
+        station = station.sort_values('date')
+        expected = ml.detect_anomalies(station['temperature'].to_numpy())
+        assert np.array_equal(station['flag'].to_numpy(), expected)
+    assert flags[5]
+
+    matrix = frame.pivot(index='station_id', columns='date', values='temperature').to_numpy()
+    matrix_flags, matrix_scores = ml.detect_anomalies_batch(matrix, method='mad')
+    assert matrix_flags.shape == matrix.shape
+    assert matrix_scores[0] == pytest.approx(mad_scores(matrix[0]))
+
+
+@pytest.mark.parametrize('method', ['zscore', 'rolling', 'climatology', 'mad'])
+def test_detect_anomalies_batch_handles_missing_ids_and_dates(method):
+    import pandas as pd
+
+    ml = ClimateML()
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame({
+        'station_id': ['A'] * 40 + [None] * 40,
+        'date': np.tile(pd.date_range('2000-01-01', periods=40), 2),
+        'temperature': np.r_[rng.normal(20, 2, 40), rng.normal(80, 2, 40)],
+    })
+    frame.loc[3, 'date'] = pd.NaT
+
+    flags, scores = ml.detect_anomalies_batch(frame, method=method)
+
+    assert np.isfinite(scores).all()
+    # The unlabelled rows form their own station instead of breaking the batch
+    unlabelled = frame['station_id'].isna().to_numpy()
+    expected = ml.detect_anomalies_batch(frame[unlabelled].assign(station_id='X'), method=method)[1]
+    assert scores[unlabelled] == pytest.approx(expected)
+    if method == 'climatology':
+        assert scores[3] == 0.0
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.anomaly import (StreamingAnomalyDetector, anomaly_scores, climatology_scores, day_of_year_slots,
+                         mad_scores, rolling_zscore_scores)
+
+
+@pytest.fixture
+def seasonal():
+    dates = pd.date_range('2000-01-01', '2009-12-31').to_numpy()
+    slots = day_of_year_slots(dates)
+    rng = np.random.default_rng(0)
+    values = 60 + 25 * np.sin(2 * np.pi * (slots - 100) / 365.25) + rng.normal(0, 2, len(dates))
+    values[2000] += 20  # one clear spike
+    return dates, values
+
+
+def test_day_of_year_slots():
+    slots = day_of_year_slots(np.array(['2000-01-01', '2000-12-31', '2001-12-31'], dtype='datetime64[D]'))
+    assert slots.tolist() == [0, 365, 364]
+
+
+def test_climatology_ignores_the_seasonal_cycle(seasonal):
+    dates, values = seasonal
+    global_flags = anomaly_scores(values, 'zscore') > 1.2
+    seasonal_flags = climatology_scores(values, dates) > 5
+    assert global_flags.sum() > 500  # every hot summer day
+    assert np.flatnonzero(seasonal_flags).tolist() == [2000]
+
+
+def test_rolling_matches_pandas_trailing_window():
+    values = np.random.default_rng(1).normal(50, 5, 300)
+    values[150] = np.nan
+    scores = rolling_zscore_scores(values, window=30, min_periods=10)
+
+    series = pd.Series(values)
+    baseline = series.shift(1).rolling(30, min_periods=10)
+    expected = ((series - baseline.mean()).abs() / baseline.std()).fillna(0).to_numpy()
+    assert scores == pytest.approx(expected)
+    assert scores[:10].tolist() == [0.0] * 10
+
+
+def test_mad_is_robust_to_outliers():
+    values = np.r_[np.random.default_rng(2).normal(20, 1, 100), [60.0] * 10]
+    scores = mad_scores(values)
+    assert (scores[-10:] > 10).all()
+    assert scores[:100].max() < 5
+
+
+def test_unknown_method_and_missing_dates():
+    with pytest.raises(ValueError):
+        anomaly_scores(np.arange(5.0), 'isolation')
+    with pytest.raises(ValueError):
+        anomaly_scores(np.arange(5.0), 'climatology')
+
+
+def test_streaming_matches_batch_baseline(seasonal):
+    dates, values = seasonal
+    detector = StreamingAnomalyDetector(threshold=4).fit('A', values[:2000], dates[:2000])
+
+    flagged, score = detector.update('A', values[2000], dates[2000])
+    assert flagged and score > 4
+    assert not detector.update('A', values[2001], dates[2001])[0]
+
+    # Welford updates end in the same state as fitting on all the readings
+    fitted = StreamingAnomalyDetector().fit('A', values[:2002], dates[:2002])
+    assert detector._state['A'] == pytest.approx(fitted._state['A'])
+
+
+def test_streaming_without_history_scores_zero():
+    detector = StreamingAnomalyDetector(seasonal=False, min_count=3)
+    assert detector.update('B', 10.0) == (False, 0.0)
+    for value in (10.0, 11.0, 9.0):
+        detector.update('B', value)
+    assert detector.update('B', 30.0)[0]
+    assert 'B' in detector and len(detector) == 1
+
+
+def test_segment_scores_match_per_station_scores(seasonal):
+    dates, values = seasonal
+    other = values[::-1] + 10
+    stacked = np.r_[values, other]
+    segments = np.repeat([0, 1], len(values))
+    all_dates = np.r_[dates, dates]
+
+    for method in ('zscore', 'rolling', 'climatology', 'mad'):
+        batch = anomaly_scores(stacked, method, all_dates, segments)
+        assert batch[:len(values)] == pytest.approx(anomaly_scores(values, method, dates))
+        assert batch[len(values):] == pytest.approx(anomaly_scores(other, method, dates))
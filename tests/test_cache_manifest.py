@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from src.cache_manifest import CacheManifest, artifact_filename, code_version, hash_frame
+
+
+def make_frame():
+    return pd.DataFrame({
+        'station_id': ['A', 'A', 'B'],
+        'date': pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-01']),
+        'temperature': [50.0, 51.0, 70.0],
+    })
+
+
+def test_artifact_filename_matches_plot_naming():
+    assert artifact_filename('trend', 'DALLAS 7 NE, GA US') == 'trend_analysis_DALLAS_7_NE_GA_US.png'
+    assert artifact_filename('clustering') == 'climate_clusters.png'
+    with pytest.raises(ValueError):
+        artifact_filename('unknown', 'DALLAS')
+
+
+def test_hash_frame_ignores_index_and_order_but_not_values():
+    df = make_frame()
+    assert hash_frame(df) == hash_frame(df.set_index(pd.Index([7, 8, 9])))
+    assert hash_frame(df) == hash_frame(df.iloc[::-1])
+    changed = df.copy()
+    changed.loc[2, 'temperature'] = 71.0
+    assert hash_frame(df) != hash_frame(changed)
+
+
+def test_code_version_tracks_file_contents(tmp_path):
+    source = tmp_path / 'plot.py'
+    source.write_text('a = 1\n')
+    before = code_version([str(source), str(tmp_path / 'missing.py')])
+    source.write_text('a = 2\n')
+    assert code_version([str(source)]) != before
+
+
+def test_is_current_and_orphan_removal(tmp_path):
+    static_dir = tmp_path / 'static'
+    static_dir.mkdir()
+    manifest_path = str(tmp_path / 'manifest.json')
+    params = {'forecast_period': 30}
+    for station in ('A', 'B'):
+        (static_dir / artifact_filename('trend', station)).write_bytes(b'png')
+    manifest = CacheManifest(manifest_path)
+    manifest.record('trend_analysis_A.png', 'trend', 'A', 'h1', params, 'v1')
+    manifest.record('trend_analysis_B.png', 'trend', 'B', 'h2', params, 'v1')
+    manifest.save()
+
+    reloaded = CacheManifest(manifest_path)
+    assert reloaded.is_current('trend_analysis_A.png', 'h1', params, 'v1', str(static_dir))
+    assert not reloaded.is_current('trend_analysis_A.png', 'changed', params, 'v1', str(static_dir))
+    assert not reloaded.is_current('trend_analysis_A.png', 'h1', {'forecast_period': 7}, 'v1', str(static_dir))
+    assert not reloaded.is_current('trend_analysis_A.png', 'h1', params, 'v2', str(static_dir))
+    assert reloaded.find('trend') == ['trend_analysis_A.png', 'trend_analysis_B.png']
+    assert reloaded.find('trend', 'B') == ['trend_analysis_B.png']
+    assert reloaded.find('trend', 'B', params={'forecast_period': 30}, version='v1') == ['trend_analysis_B.png']
+    assert reloaded.find('trend', 'B', params={'forecast_period': 7}) == []
+    assert reloaded.find('trend', 'B', params={'engine': 'harmonic'}) == []
+    assert reloaded.find('trend', 'B', version='v2') == []
+    assert reloaded.find('trend', 'B', input_hash='h2') == ['trend_analysis_B.png']
+    assert reloaded.find('trend', 'B', input_hash='h1') == []
+
+    (static_dir / 'logo.png').write_bytes(b'png')
+    assert reloaded.remove_orphans(['trend_analysis_A.png'], str(static_dir)) == ['trend_analysis_B.png']
+    assert not (static_dir / 'trend_analysis_B.png').exists()
+    assert (static_dir / 'logo.png').exists()
+    assert reloaded.find('trend') == ['trend_analysis_A.png']
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.clustering import FEATURE_NAMES, StationClusterer, station_features
+from src.ml_algorithms import ClimateML
+
+
+def _station_frame(profiles, years=3, seed=0):
+    """Daily series per station from (mean, seasonal amplitude, noise) profiles"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2000-01-01', periods=int(365.25 * years))
+    angle = 2 * np.pi * (dates.dayofyear.to_numpy() - 200) / 365.25
+    frames = []
+    for name, (mean, amplitude, noise) in profiles.items():
+        frames.append(pd.DataFrame({
+            'station_name': name,
+            'date': dates,
+            'temperature': mean + amplitude * np.cos(angle) + rng.normal(0, noise, len(dates)),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_station_features_match_per_station_moments():
+    frame = _station_frame({'A': (60, 10, 1), 'B': (70, 25, 2)})
+    codes, names = pd.factorize(frame['station_name'])
+    features = station_features(frame['temperature'].to_numpy(), codes, frame['date'].to_numpy())
+
+    assert features.shape == (2, len(FEATURE_NAMES))
+    for i, name in enumerate(names):
+        temps = frame.loc[frame['station_name'] == name, 'temperature']
+        assert features[i, FEATURE_NAMES.index('mean')] == pytest.approx(temps.mean())
+        assert features[i, FEATURE_NAMES.index('std')] == pytest.approx(temps.std(ddof=0))
+        assert features[i, FEATURE_NAMES.index('range')] == pytest.approx(temps.max() - temps.min())
+    amplitude = features[:, FEATURE_NAMES.index('seasonal_amplitude')]
+    assert amplitude == pytest.approx([10, 25], rel=0.05)
+
+
+def test_labels_are_ordered_by_variability():
+    profiles = {'Coast 1': (62, 5, 1), 'Coast 2': (63, 6, 1), 'Inland 1': (65, 25, 3), 'Inland 2': (66, 27, 3)}
+    clusters = ClimateML().cluster_stations(_station_frame(profiles), n_clusters=2)
+    assert clusters == {'Coast 1': 0, 'Coast 2': 0, 'Inland 1': 1, 'Inland 2': 1}
+
+
+def test_unlabelled_rows_are_left_out():
+    frame = _station_frame({'A': (62, 5, 1), 'B': (66, 26, 3), None: (90, 40, 5)})
+    assert set(ClimateML().cluster_stations(frame, n_clusters=2)) == {'A', 'B'}
+
+
+def test_saved_centroids_assign_new_stations(tmp_path):
+    model_path = str(tmp_path / 'clusters.npz')
+    ml = ClimateML()
+    ml.cluster_stations(_station_frame({'A': (62, 5, 1), 'B': (66, 26, 3)}), model_path=model_path)
+
+    clusterer = StationClusterer.load(model_path)
+    assert clusterer is not None and clusterer.n_clusters == 2
+
+    later = _station_frame({'A': (62, 5, 1), 'B': (66, 26, 3), 'New stable': (61, 4, 1)}, seed=1)
+    clusters = ml.cluster_stations(later, model_path=model_path)
+    assert clusters['New stable'] == clusters['A'] == 0
+    assert clusters['B'] == 1
+
+
+def test_load_missing_file_returns_none(tmp_path):
+    assert StationClusterer.load(str(tmp_path / 'missing.npz')) is None
+    with pytest.raises(ValueError):
+        StationClusterer().predict(np.zeros((1, len(FEATURE_NAMES))))
@@ -40,3 +40,134 @@ def test_normalize_data(sample_df):
     normalized = processor.normalize_data()
     assert 'temperature' in normalized.columns
     assert np.isclose(normalized['temperature'].mean(), 0, atol=1e-1)
+
+def test_columnar_storage_matches_csv(tmp_path):
+    sample_csv = tmp_path / 'sample.csv'
+    pd.DataFrame({
+        'station_id': ['STA001', 'STA001', 'STA002'],
+        'station_name': ['Station A', 'Station A', 'Station B'],
+        'date': ['2000-01-01', '2000-01-02', '2000-01-01'],
+        'temperature': [20.0, 21.0, 25.0]
+    }).to_csv(sample_csv, index=False)
+
+    from_csv = DataProcessor(str(sample_csv), storage='csv').load_data()
+    from_store = DataProcessor(str(sample_csv), storage='columnar').load_data()
+    assert (tmp_path / '.sample.columnar' / 'meta.json').exists()
+    assert isinstance(from_store['station_id'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(from_store['date'])
+    assert from_store['station_id'].astype(str).tolist() == from_csv['station_id'].tolist()
+    assert from_store['temperature'].tolist() == from_csv['temperature'].tolist()
+
+
+def test_columnar_storage_rebuilds_when_csv_changes(tmp_path):
+    sample_csv = tmp_path / 'sample.csv'
+    frame = pd.DataFrame({
+        'station_id': ['STA001'],
+        'station_name': ['Station A'],
+        'date': ['2000-01-01'],
+        'temperature': [20.0]
+    })
+    frame.to_csv(sample_csv, index=False)
+    assert len(DataProcessor(str(sample_csv)).load_data()) == 1
+
+    pd.concat([frame, frame.assign(date='2000-01-02')]).to_csv(sample_csv, index=False)
+    assert len(DataProcessor(str(sample_csv)).load_data()) == 2
+
+
+def test_clean_data_by_station_uses_station_bounds():
+    warm = [70.0 + (i % 3) for i in range(30)]
+    cold = [30.0 + (i % 3) for i in range(30)] + [95.0]
+    dates = pd.date_range('2000-01-01', periods=31).strftime('%Y-%m-%d')
+    processor = DataProcessor("fake.csv")
+    processor.data = pd.DataFrame({
+        'station_id': ['WARM'] * 30 + ['COLD'] * 31,
+        'station_name': ['Warm Station'] * 30 + ['Cold Station'] * 31,
+        'date': list(dates[:30]) + list(dates),
+        'temperature': warm + cold
+    })
+    cleaned = processor.clean_data(by_station=True)
+
+    assert 95.0 not in cleaned['temperature'].tolist()  # within global bounds, not COLD's
+    assert (cleaned['station_id'] == 'WARM').sum() == 30
+    assert processor.cleaning_stats.loc['COLD', 'outliers_removed'] == 1
+    assert processor.cleaning_stats.loc['WARM', 'outliers_removed'] == 0
+
+
+def test_clean_data_by_station_interpolates_within_station():
+    processor = DataProcessor("fake.csv")
+    processor.data = pd.DataFrame({
+        'station_id': ['STA001'] * 3 + ['STA002'] * 3,
+        'station_name': ['Station A'] * 3 + ['Station B'] * 3,
+        'date': ['2000-01-01', '2000-01-02', '2000-01-04'] * 2,
+        'temperature': [10.0, np.nan, 40.0, 50.0, 60.0, np.nan]
+    })
+    cleaned = processor.clean_data(by_station=True)
+
+    station_a = cleaned[cleaned['station_id'] == 'STA001']['temperature'].tolist()
+    assert station_a == [10.0, 20.0, 40.0]  # time-weighted, not midpoint
+    assert (cleaned['station_id'] == 'STA002').sum() == 2  # trailing gap cannot be filled
+    stats = processor.cleaning_stats
+    assert stats.loc['STA001', 'rows_interpolated'] == 1
+    assert stats.loc['STA002', 'invalid_removed'] == 1
+    assert stats['rows_out'].sum() == len(cleaned)
+
+
+def test_clean_data_by_station_ignores_undated_rows():
+    processor = DataProcessor("fake.csv")
+    dates = list(pd.date_range('2000-01-01', periods=21).strftime('%Y-%m-%d'))
+    temperatures = [10.0] * 19 + [100.0, np.nan]
+    processor.data = pd.DataFrame({
+        'station_id': ['STA001'] * 22,
+        'station_name': ['Station A'] * 22,
+        'date': dates + ['not-a-date'],
+        'temperature': temperatures + [-1000.0]
+    })
+    cleaned = processor.clean_data(by_station=True)
+
+    # The undated -1000 neither widens the outlier bounds nor fills the trailing gap
+    assert cleaned['temperature'].tolist() == [10.0] * 19
+    stats = processor.cleaning_stats
+    assert stats.loc['STA001', 'outliers_removed'] == 1
+    assert stats.loc['STA001', 'invalid_removed'] == 2
+    assert stats.loc['STA001', 'rows_interpolated'] == 0
+
+
+def test_stream_to_partitions_matches_clean_data(tmp_path):
+    sample_csv = tmp_path / 'sample.csv'
+    dates = pd.date_range('1999-12-01', periods=60).strftime('%Y-%m-%d')
+    rows = pd.DataFrame({
+        'station_id': ['STA001'] * 60 + ['STA002'] * 60,
+        'station_name': ['Station A'] * 60 + ['Station B'] * 60,
+        'date': list(dates) * 2,
+        'temperature': np.r_[np.linspace(10, 30, 60), np.linspace(40, 60, 60)]
+    })
+    rows.loc[5, 'temperature'] = 500.0  # outlier
+    pd.concat([rows, rows.iloc[:10]]).to_csv(sample_csv, index=False)  # with duplicates
+
+    in_memory = DataProcessor(str(sample_csv), storage='csv')
+    in_memory.load_data()
+    expected = in_memory.clean_data()
+
+    result = DataProcessor(str(sample_csv)).stream_to_partitions(str(tmp_path / 'out'), chunk_rows=25)
+    streamed = pd.concat(pd.read_csv(path) for path in result['partitions'])
+
+    assert len(result['partitions']) == 4  # two stations x two years
+    assert result['rows'] == len(expected) == len(streamed)
+    assert np.allclose(sorted(streamed['temperature']), sorted(expected['temperature']))
+
+
+def test_stream_to_partitions_keeps_missing_and_colliding_station_ids(tmp_path):
+    sample_csv = tmp_path / 'sample.csv'
+    pd.DataFrame({
+        'station_id': ['STA 1', 'STA_1', None, 'STA 1'],
+        'station_name': ['A', 'B', 'C', 'A'],
+        'date': ['2000-01-01', '2000-01-01', '2000-01-01', '2000-01-02'],
+        'temperature': [10.0, 11.0, 12.0, 13.0]
+    }).to_csv(sample_csv, index=False)
+
+    result = DataProcessor(str(sample_csv)).stream_to_partitions(str(tmp_path / 'out'), chunk_rows=10)
+
+    assert result['rows'] == 4
+    assert len(result['partitions']) == 3
+    names = {frozenset(pd.read_csv(path)['station_name']) for path in result['partitions']}
+    assert names == {frozenset({'A'}), frozenset({'B'}), frozenset({'C'})}
@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+import pytest
+from src.dataset_cache import DatasetCache, get_dataset_cache
+
+
+def _write_csv(path, temperatures):
+    pd.DataFrame({
+        'station_id': ['STA001'] * len(temperatures),
+        'station_name': ['Station A'] * len(temperatures),
+        'date': pd.date_range('2000-01-01', periods=len(temperatures)).strftime('%Y-%m-%d'),
+        'temperature': temperatures
+    }).to_csv(path, index=False)
+
+
+def test_get_reuses_cleaned_frame(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'climate.csv'
+    _write_csv(csv_path, [20.0, 21.0, 22.0])
+    cache = DatasetCache(str(csv_path))
+    loads = []
+    original_load = cache._load
+    monkeypatch.setattr(cache, '_load', lambda: loads.append(1) or original_load())
+
+    first = cache.get()
+    cache.get()
+    assert len(loads) == 1
+    assert len(first) == 3
+    assert pd.api.types.is_datetime64_any_dtype(first['date'])
+
+
+def test_get_invalidates_when_file_changes(tmp_path):
+    csv_path = tmp_path / 'climate.csv'
+    _write_csv(csv_path, [20.0, 21.0, 22.0])
+    cache = DatasetCache(str(csv_path))
+    assert len(cache.get()) == 3
+
+    _write_csv(csv_path, [20.0, 21.0, 22.0, 23.0])
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(cache.get()) == 4
+
+
+def test_shared_frame_is_read_only(tmp_path):
+    csv_path = tmp_path / 'climate.csv'
+    _write_csv(csv_path, [20.0, 21.0, 22.0])
+    cache = DatasetCache(str(csv_path))
+
+    df = cache.get()
+    df['year'] = df['date'].dt.year  # adding columns only touches the caller's copy
+    assert 'year' not in cache.get().columns
+    with pytest.raises(ValueError):
+        df['temperature'].to_numpy()[0] = 99.0
+
+
+def test_get_dataset_cache_is_shared_per_path(tmp_path):
+    csv_path = str(tmp_path / 'climate.csv')
+    assert get_dataset_cache(csv_path) is get_dataset_cache(csv_path)
+
+
+def test_get_summary_is_built_once_per_version(tmp_path):
+    csv_path = tmp_path / 'climate.csv'
+    _write_csv(csv_path, [20.0, 21.0, 22.0])
+    cache = DatasetCache(str(csv_path))
+
+    summary = cache.get_summary()
+    assert cache.get_summary() is summary
+    assert summary.stats()['total_records'] == 3
+
+    cache.invalidate()
+    assert cache.get_summary() is not summary
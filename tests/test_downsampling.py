@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.downsampling import aggregate_by_resolution, downsample_frame, lttb_indices
+
+
+@pytest.fixture
+def frame():
+    dates = pd.date_range('2000-01-01', '2001-12-31')
+    return pd.DataFrame({
+        'station_id': ['STA001'] * len(dates) + ['STA002'] * len(dates),
+        'station_name': ['Station A'] * len(dates) + ['Station B'] * len(dates),
+        'date': list(dates) * 2,
+        'temperature': np.r_[np.full(len(dates), 10.0), np.full(len(dates), 30.0)]
+    })
+
+
+def test_aggregate_by_resolution_monthly(frame):
+    monthly = aggregate_by_resolution(frame, 'monthly')
+    assert len(monthly) == 2 * 24
+    assert monthly['date'].iloc[1] == pd.Timestamp('2000-02-01')
+    assert set(monthly['temperature']) == {10.0, 30.0}
+
+
+def test_aggregate_by_resolution_rejects_unknown(frame):
+    with pytest.raises(ValueError):
+        aggregate_by_resolution(frame, 'hourly')
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[500] = 10.0
+    selected = lttb_indices(x, y, 50)
+    assert len(selected) == 50
+    assert selected[0] == 0 and selected[-1] == 999
+    assert 500 in selected
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_downsample_frame_shares_budget(frame):
+    reduced = downsample_frame(frame, 100)
+    assert len(reduced) <= 100
+    assert reduced['station_id'].value_counts().to_dict() == {'STA001': 50, 'STA002': 50}
+    assert downsample_frame(frame, None) is frame
+
+
+@pytest.mark.parametrize('max_points', [30, 100, 400])
+def test_downsample_frame_stays_within_budget_with_many_stations(max_points):
+    sizes = np.arange(5, 65)  # 60 stations of 5-64 rows
+    many = pd.DataFrame({
+        'station_id': np.repeat([f'STA{i:03d}' for i in range(len(sizes))], sizes),
+        'date': np.concatenate([pd.date_range('2000-01-01', periods=size) for size in sizes]),
+        'temperature': np.random.default_rng(0).normal(20, 5, sizes.sum())
+    })
+
+    reduced = downsample_frame(many, max_points)
+
+    assert len(reduced) <= max_points
+    assert reduced.index.is_monotonic_increasing
+    if max_points < 3 * len(sizes):
+        # Only the largest stations are kept
+        assert set(reduced['station_id']) == {f'STA{i:03d}' for i in range(len(sizes) - max_points // 3, len(sizes))}
+    else:
+        assert reduced['station_id'].nunique() == len(sizes)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.forecasters import FORECASTERS, HarmonicForecaster
+from src.ml_algorithms import ClimateML
+
+
+def _seasonal(days):
+    t = np.arange(days, dtype=float)
+    return 60 + 0.001 * t + 15 * np.sin(2 * np.pi * t / 365.25)
+
+
+def test_harmonic_forecaster_recovers_seasonal_cycle():
+    series = _seasonal(3 * 365 + 60)
+    history, future = series[:-60], series[-60:]
+    forecast = HarmonicForecaster().fit(history).predict(60)
+    assert forecast.shape == (60,)
+    assert np.abs(forecast - future).max() < 0.5
+
+
+def test_harmonic_forecaster_uses_dates_across_gaps():
+    dates = pd.date_range('2000-01-01', periods=4 * 365)
+    series = _seasonal(4 * 365)
+    keep = np.r_[0:400, 900:4 * 365 - 30]  # a 500-day hole in the record
+    forecast = HarmonicForecaster().fit(series[keep], dates.values[keep]).predict(30)
+    assert np.abs(forecast - series[-30:]).max() < 0.5
+
+
+def test_predict_temperature_engine_selection():
+    series = _seasonal(800)
+    ml = ClimateML(engine='harmonic')
+    assert 'harmonic' in FORECASTERS and 'harmonic' in ml.available_engines()
+    assert ml.predict_temperature(series, series, forecast_period=10).shape == (10,)
+    with pytest.raises(ValueError):
+        ml.predict_temperature(series, series, forecast_period=10, engine='prophet')
@@ -0,0 +1,76 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Response
+
+from src.http_cache import compress_response, file_etag, is_not_modified, make_etag, set_cache_headers
+
+
+def make_request(**headers):
+    return EnvironBuilder(headers=headers).get_request()
+
+
+def test_make_etag_changes_with_inputs():
+    assert make_etag('stats', 'v1') == make_etag('stats', 'v1')
+    assert make_etag('stats', 'v1') != make_etag('stats', 'v2')
+
+
+def test_file_etag_tracks_contents(tmp_path):
+    path = tmp_path / 'plot.png'
+    path.write_bytes(b'first')
+    first = file_etag(str(path))
+    assert file_etag(str(path)) == first
+
+    path.write_bytes(b'second!')
+    assert file_etag(str(path)) != first
+
+
+def test_if_none_match_matches_plain_and_compressed_etags():
+    etag = make_etag('stats', 'v1')
+    assert is_not_modified(make_request(**{'If-None-Match': f'"{etag}"'}), etag)
+    assert is_not_modified(make_request(**{'If-None-Match': f'"{etag}-gzip"'}), etag)
+    assert not is_not_modified(make_request(**{'If-None-Match': '"other"'}), etag)
+    assert not is_not_modified(make_request(), etag)
+
+
+def test_if_modified_since_only_without_etags():
+    modified = datetime(2024, 1, 1, 12, 0, 30, 500000, tzinfo=timezone.utc)
+    since = 'Mon, 01 Jan 2024 12:00:30 GMT'
+    assert is_not_modified(make_request(**{'If-Modified-Since': since}), 'abc', modified)
+    assert not is_not_modified(make_request(**{'If-Modified-Since': 'Mon, 01 Jan 2024 11:00:00 GMT'}), 'abc', modified)
+    assert not is_not_modified(make_request(**{'If-Modified-Since': since, 'If-None-Match': '"other"'}), 'abc', modified)
+
+
+def test_set_cache_headers_skips_errors():
+    response = set_cache_headers(Response('{}', mimetype='application/json'), 'abc', 300)
+    assert response.get_etag() == ('abc', False)
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
+
+    error = set_cache_headers(Response('{}', status=500), 'abc', 300)
+    assert 'ETag' not in error.headers
+
+
+def test_compress_response_gzips_large_json():
+    payload = json.dumps({'values': list(range(1000))})
+    response = Response(payload, mimetype='application/json')
+    response.set_etag('abc')
+    accept = make_request(**{'Accept-Encoding': 'gzip'}).accept_encodings
+
+    compress_response(response, accept, min_size=100)
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == ('abc-gzip', False)
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(response.get_data()).decode() == payload
+
+
+def test_compress_response_leaves_small_and_unaccepted_bodies():
+    small = compress_response(Response('{}', mimetype='application/json'),
+                              make_request(**{'Accept-Encoding': 'gzip'}).accept_encodings, min_size=100)
+    assert 'Content-Encoding' not in small.headers
+
+    plain = compress_response(Response('x' * 200, mimetype='application/json'),
+                              make_request().accept_encodings, min_size=100)
+    assert 'Content-Encoding' not in plain.headers
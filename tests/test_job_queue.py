@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+from src.job_queue import JobQueue, QueueFullError
+
+
+def test_job_runs_and_reports_result():
+    jobs = JobQueue(workers=1)
+
+    def work(job):
+        job.set_progress(0.5, 'halfway')
+        return {'plots': ['a.png']}
+
+    job = jobs.submit('a', work)
+    assert job.wait(5)
+    assert job.status == 'done'
+    assert job.result == {'plots': ['a.png']}
+    assert job.progress == 1.0
+    assert jobs.get(job.id) is job
+
+
+def test_failed_job_records_error():
+    jobs = JobQueue(workers=1)
+
+    def work(job):
+        raise ValueError('no data')
+
+    job = jobs.submit('a', work)
+    assert job.wait(5)
+    assert job.status == 'failed'
+    assert job.error == 'no data'
+
+
+def test_duplicate_submissions_share_active_job():
+    jobs = JobQueue(workers=1)
+    release = threading.Event()
+    job = jobs.submit('a', lambda job: release.wait(5))
+    assert jobs.submit('a', lambda job: None) is job
+    release.set()
+    assert job.wait(5)
+    # Once finished, the same parameters start a new job
+    assert jobs.submit('a', lambda job: None) is not job
+
+
+def test_full_queue_rejects_new_work():
+    jobs = JobQueue(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(5)
+
+    running = jobs.submit('running', block)
+    assert started.wait(5)
+    jobs.submit('waiting', lambda job: None)
+    with pytest.raises(QueueFullError):
+        jobs.submit('overflow', lambda job: None)
+    release.set()
+    assert running.wait(5)
+
+
+def test_finished_jobs_are_forgotten_beyond_limit():
+    jobs = JobQueue(workers=1, max_finished=2)
+    finished = [jobs.submit(i, lambda job: None) for i in range(3)]
+    for job in finished:
+        assert job.wait(5)
+    assert jobs.get(finished[0].id) is None
+    assert jobs.get(finished[2].id) is finished[2]
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+from src.model_registry import ModelRegistry
+
+
+class _Model:
+    def __init__(self, name):
+        self.name = name
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            f.write(self.name)
+
+
+def _saved_models(registry, station):
+    station_dir = registry._station_dir(station)
+    models = []
+    for entry in sorted(os.listdir(station_dir)):
+        if '.tmp' not in entry:
+            with open(os.path.join(station_dir, entry, 'model.keras')) as f:
+                models.append(f.read())
+    return models
+
+
+def test_similar_station_names_get_separate_slots(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    long_prefix = 'X' * 50
+    stations = ['A/B', 'A_B', long_prefix + ' North', long_prefix + ' South']
+    for station in stations:
+        key = ModelRegistry.make_key(np.arange(5.0), {'station': station})
+        registry.save(station, key, _Model(station), scaler=None, config={})
+
+    assert len({registry._station_dir(station) for station in stations}) == len(stations)
+    for station in stations:
+        assert _saved_models(registry, station) == [station]
+
+
+def test_save_replaces_older_entries_but_not_in_flight_ones(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.save('A', 'k1' * 8, _Model('old'), scaler=None, config={})
+    in_flight = tmp_path / registry._station_dir('A') / 'k3k3k3k3k3k3k3k3.tmp999'
+    in_flight.mkdir()
+
+    registry.save('A', 'k2' * 8, _Model('new'), scaler=None, config={})
+
+    assert _saved_models(registry, 'A') == ['new']
+    assert in_flight.exists()
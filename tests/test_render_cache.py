@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+from src.render_cache import RenderCache
+
+
+def write_bytes(size):
+    def render(path):
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+    return render
+
+
+def test_renders_once_and_reuses(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    calls = []
+
+    def render(path):
+        calls.append(path)
+        write_bytes(10)(path)
+
+    assert cache.get_or_render('a', render) == 'a.png'
+    assert cache.get_or_render('a', render) == 'a.png'
+    assert len(calls) == 1
+    assert (tmp_path / 'a.png').stat().st_size == 10
+
+
+def test_concurrent_requests_are_coalesced(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    calls = []
+
+    def slow_render(path):
+        calls.append(path)
+        time.sleep(0.2)
+        write_bytes(10)(path)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_render('a', slow_render)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['a.png'] * 5
+    assert len(calls) == 1
+
+
+def test_failed_render_propagates_and_is_retried(tmp_path):
+    cache = RenderCache(str(tmp_path))
+
+    def broken(path):
+        raise ValueError('no data')
+
+    with pytest.raises(ValueError):
+        cache.get_or_render('a', broken)
+    assert 'a' not in cache
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get_or_render('a', write_bytes(10)) == 'a.png'
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=25)
+    cache.get_or_render('a', write_bytes(10))
+    cache.get_or_render('b', write_bytes(10))
+    cache.get_or_render('a', write_bytes(10))  # a is now most recent
+    cache.get_or_render('c', write_bytes(10))
+    assert 'b' not in cache and not (tmp_path / 'b.png').exists()
+    assert 'a' in cache and 'c' in cache
+    assert cache.total_bytes == 20
+
+    # A new process adopts the files already on disk
+    assert len(RenderCache(str(tmp_path), max_bytes=25)) == 2
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from src.running_stats import RunningStats
+
+
+def test_update_matches_numpy():
+    values = np.random.default_rng(0).normal(60, 12, 1000)
+    stats = RunningStats().update(values)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_merge_and_push_match_single_pass():
+    values = np.random.default_rng(1).normal(20, 5, 501)
+    merged = RunningStats().update(values[:200]).merge(RunningStats().update(values[200:500]))
+    merged.push(values[500])
+    merged.push(np.nan)
+    assert merged.count == 501
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_round_trip_dict():
+    stats = RunningStats().update([1.0, 2.0, 4.0])
+    restored = RunningStats.from_dict(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict()
@@ -0,0 +1,38 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.serialization import decode_binary, iter_binary, iter_ndjson
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'station_id': ['STA001'] * 3 + ['STA002'] * 2,
+        'station_name': ['Station A'] * 3 + ['Station B'] * 2,
+        'date': pd.to_datetime(['2000-01-01', '2000-01-02', '2000-01-03', '1999-12-31', '2000-01-01']),
+        'temperature': [10.0, 11.5, 12.0, 30.25, 31.0]
+    })
+
+
+def test_iter_ndjson_chunks_per_station(frame):
+    lines = list(iter_ndjson(frame, chunk_rows=2))
+    records = [json.loads(line) for line in lines]
+    assert all(line.endswith('\n') for line in lines)
+    assert [r['station_id'] for r in records] == ['STA001', 'STA001', 'STA002']
+    assert records[0]['dates'] == ['2000-01-01', '2000-01-02']
+    assert records[2]['temperatures'] == [30.25, 31.0]
+
+
+def test_binary_round_trip(frame):
+    stations = decode_binary(b''.join(iter_binary(frame)))
+    assert [s['station_id'] for s in stations] == ['STA001', 'STA002']
+    assert stations[1]['dates'].astype(str).tolist() == ['1999-12-31', '2000-01-01']
+    assert stations[0]['temperatures'].dtype == np.float32
+    assert np.allclose(stations[0]['temperatures'], [10.0, 11.5, 12.0])
+
+
+def test_decode_binary_rejects_other_payloads():
+    with pytest.raises(ValueError):
+        decode_binary(b'not a payload')
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+from src.station_index import StationIndex
+
+
+@pytest.fixture
+def index():
+    dates = pd.date_range('2000-01-01', periods=10)
+    df = pd.DataFrame({
+        'station_id': ['STA002'] * 10 + ['STA001'] * 10,
+        'station_name': ['DALLAS 7 NE, GA US'] * 10 + ['LOS ANGELES INTERNATIONAL AIRPORT, CA US'] * 10,
+        'date': list(dates[::-1]) + list(dates),
+        'temperature': [float(i) for i in range(20)]
+    })
+    return StationIndex.build(df)
+
+
+def test_build_sorts_into_contiguous_blocks(index):
+    assert len(index) == 2
+    assert list(index.station_ids) == ['STA001', 'STA002']
+    dallas = index.station_frame(index.resolve('dallas')[0])
+    assert len(dallas) == 10
+    assert dallas['date'].is_monotonic_increasing
+    assert set(dallas['station_id']) == {'STA002'}
+
+
+def test_resolve_is_case_insensitive_and_partial(index):
+    assert index.resolve_name('los angeles') == 'LOS ANGELES INTERNATIONAL AIRPORT, CA US'
+    assert index.resolve('sta002') == [1]
+    assert index.resolve(', ') == [0, 1]
+    assert index.resolve('tallahassee') == []
+    assert index.lookup('tallahassee').empty
+
+
+def test_lookup_date_range_is_inclusive(index):
+    rows = index.lookup('Dallas', start='2000-01-03', end='2000-01-05')
+    assert rows['date'].dt.strftime('%Y-%m-%d').tolist() == ['2000-01-03', '2000-01-04', '2000-01-05']
+    assert index.lookup('Dallas', start='2001-01-01').empty
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.ml_algorithms import ClimateML
+from src.station_matrix import StationMatrix
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2000-01-01', periods=60)
+    df = pd.DataFrame({
+        'station_id': ['A'] * 60 + ['B'] * 50,
+        'station_name': ['Station A'] * 60 + ['Station B'] * 50,
+        'date': list(dates) + list(dates[5:55]),
+        'temperature': np.r_[rng.normal(40, 5, 60), rng.normal(70, 3, 50)]
+    })
+    # Shuffled rows and a gap in station B
+    return df.drop(index=80).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_from_frame_scatters_readings(frame):
+    matrix = StationMatrix.from_frame(frame)
+
+    assert matrix.shape == (2, 60)
+    assert matrix.values.dtype == np.float32
+    assert matrix.dates[0] == np.datetime64('2000-01-01')
+    a, b = matrix.row('a'), matrix.row('Station B')
+    assert matrix.station_names[a] == 'Station A'
+    assert np.isnan(matrix.values[b, :5]).all()
+    assert np.isnan(matrix.values[b, 5 + 20])  # the dropped 21st reading
+    assert np.count_nonzero(~np.isnan(matrix.values)) == len(frame)
+
+    restored = matrix.to_frame().sort_values(['station_id', 'date']).reset_index(drop=True)
+    expected = frame.sort_values(['station_id', 'date']).reset_index(drop=True)
+    assert (restored['date'] == expected['date']).all()
+    assert restored['temperature'].to_numpy() == pytest.approx(expected['temperature'].to_numpy(), abs=1e-4)
+
+
+def test_duplicate_days_are_averaged():
+    df = pd.DataFrame({
+        'station_id': ['A', 'A', 'A'],
+        'station_name': ['Station A'] * 3,
+        'date': pd.to_datetime(['2000-01-01', '2000-01-01', '2000-01-03']),
+        'temperature': [10.0, 20.0, 30.0]
+    })
+    values = StationMatrix.from_frame(df).values[0]
+    assert values[0] == 15.0
+    assert np.isnan(values[1])
+
+
+def test_station_stats_match_groupby(frame):
+    matrix = StationMatrix.from_frame(frame)
+    stats = matrix.station_stats()
+    expected = frame.groupby('station_id')['temperature'].agg(['count', 'mean', 'std', 'min', 'max'])
+
+    for station, row in expected.iterrows():
+        position = matrix.row(station)
+        for name in ('count', 'mean', 'std', 'min', 'max'):
+            assert stats[name][position] == pytest.approx(row[name], abs=1e-4)
+
+
+def test_save_and_load_memory_maps(frame, tmp_path):
+    matrix = StationMatrix.from_frame(frame)
+    store_dir = str(tmp_path / 'matrix')
+    matrix.save(store_dir)
+
+    loaded = StationMatrix.load(store_dir)
+    assert isinstance(loaded.values, np.memmap)
+    np.testing.assert_array_equal(loaded.values, matrix.values)
+    assert (loaded.dates == matrix.dates).all()
+    assert list(loaded.station_names) == list(matrix.station_names)
+
+
+def test_batch_analytics_accept_matrix(frame):
+    ml = ClimateML()
+    matrix = StationMatrix.from_frame(frame)
+
+    _, scores = ml.detect_anomalies_batch(matrix, threshold=2.0, method='zscore')
+    _, frame_scores = ml.detect_anomalies_batch(frame, threshold=2.0, method='zscore')
+    rows = [matrix.row(station) for station in frame['station_id']]
+    columns = (frame['date'].to_numpy(dtype='datetime64[D]') - matrix.start).astype(int)
+    assert scores[rows, columns] == pytest.approx(frame_scores, abs=1e-4)
+
+    assert ml.cluster_stations(matrix, n_clusters=2) == ml.cluster_stations(frame, n_clusters=2)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.summary_store import SummaryStore
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('1999-12-01', periods=90)
+    return pd.DataFrame({
+        'station_name': ['Station A'] * 90 + ['Station B'] * 90,
+        'date': list(dates) * 2,
+        'temperature': np.r_[rng.normal(40, 5, 90), rng.normal(70, 3, 90)]
+    })
+
+
+def test_summaries_match_groupby(frame):
+    export = SummaryStore.from_frame(frame).export()
+    expected = frame.groupby('station_name')['temperature'].agg(['count', 'mean', 'std', 'min', 'max']).round(2)
+
+    for station, row in expected.iterrows():
+        summary = export['station_summary'][station]
+        assert summary['count'] == row['count']
+        assert summary['mean'] == pytest.approx(row['mean'], abs=0.01)
+        assert summary['std'] == pytest.approx(row['std'], abs=0.01)
+        assert (summary['min'], summary['max']) == (row['min'], row['max'])
+        assert summary['first_date'] == '1999-12-01'
+
+    assert sorted(export['yearly_summary']['Station A']) == [1999, 2000]
+    assert export['yearly_summary']['Station A'][1999]['count'] == 31
+    assert export['data_summary']['temperature']['mean'] == pytest.approx(frame['temperature'].mean(), abs=0.01)
+
+
+def test_stats_payload(frame):
+    stats = SummaryStore.from_frame(frame).stats()
+    assert stats['total_records'] == 180
+    assert stats['stations'] == 2
+    assert stats['date_range'] == {'start': '1999-12-01', 'end': '2000-02-28'}
+    assert stats['avg_temperature'] == pytest.approx(frame['temperature'].mean(), abs=0.01)
+
+
+def test_append_matches_full_build(frame):
+    incremental = SummaryStore.from_frame(frame.iloc[:100])
+    first = incremental.stats()
+    incremental.append(frame.iloc[100:])
+
+    assert incremental.stats() is not first
+    full = SummaryStore.from_frame(frame).export()['station_summary']
+    for station, summary in incremental.export()['station_summary'].items():
+        assert summary['count'] == full[station]['count']
+        assert summary['mean'] == pytest.approx(full[station]['mean'], abs=0.01)
+        assert summary['std'] == pytest.approx(full[station]['std'], abs=0.01)
+    assert incremental.stats()['total_records'] == 180
+
+
+def test_payloads_are_reused_until_append(frame):
+    store = SummaryStore.from_frame(frame)
+    assert store.stats() is store.stats()
+    assert store.export() is store.export()
@@ -70,3 +70,64 @@ def test_plot_temperature_heatmap(tmp_path):
     assert expected_file.exists()
 
     os.chdir(cwd)
+
+
+def test_agg_renderer_reuses_template_and_masks_anomalies(tmp_path):
+    visualizer = ClimateVisualizer(renderer='agg', dpi='thumbnail')
+    dates = pd.date_range(start="2023-01-01", periods=100).to_list()
+    temperatures = np.random.normal(20, 5, 100)
+    anomalies = np.zeros(100, dtype=bool)
+    anomalies[[10, 50, 90]] = True
+
+    for name in ("first.png", "second.png"):
+        visualizer.plot_temperature_with_predictions_and_anomalies(
+            dates, temperatures, [], anomalies, title="Agg Plot", output_path=str(tmp_path / name)
+        )
+        assert (tmp_path / name).exists()
+
+    fig = visualizer._template('temperature', (14, 6))
+    assert fig.get_axes() == []  # cleared after saving
+    assert fig is visualizer._template('temperature', (14, 6))
+
+
+def test_dpi_presets_and_validation():
+    assert ClimateVisualizer(dpi='web').dpi == 100
+    assert ClimateVisualizer(dpi=72).dpi == 72
+    with pytest.raises(ValueError):
+        ClimateVisualizer(dpi='poster')
+    with pytest.raises(ValueError):
+        ClimateVisualizer(renderer='svg')
+
+
+def test_render_bytes_returns_png_with_content_hash():
+    visualizer = ClimateVisualizer(renderer='agg', dpi='thumbnail')
+
+    plot = visualizer.render_bytes(visualizer.plot_cluster_summary, ["Station A", "Station B"], [0, 1])
+
+    assert plot.data.startswith(b'\x89PNG')
+    assert plot.mimetype == 'image/png'
+    assert len(plot.etag) == 64
+
+    larger = visualizer.render_bytes(visualizer.plot_cluster_summary, ["Station A", "Station B"], [0, 1], dpi='web')
+    assert len(larger) > len(plot)
+    assert larger.etag != plot.etag
+
+
+def test_render_bytes_rejects_unknown_format():
+    visualizer = ClimateVisualizer(renderer='agg')
+    with pytest.raises(ValueError):
+        visualizer.render_bytes(visualizer.plot_cluster_summary, ["Station A"], [0], format='gif')
+
+
+def test_large_heatmap_is_rasterized_without_annotations(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr('src.visualizer.sns.heatmap', lambda data, **kwargs: calls.append(kwargs))
+    visualizer = ClimateVisualizer(renderer='agg', dpi='thumbnail')
+    small = pd.DataFrame(np.ones((3, 3)))
+    large = pd.DataFrame(np.ones((300, 40)))
+
+    visualizer.plot_temperature_heatmap(small, output_path=str(tmp_path / "small.png"))
+    visualizer.plot_temperature_heatmap(large, output_path=str(tmp_path / "large.png"))
+
+    assert (calls[0]['annot'], calls[0]['rasterized']) == (True, False)
+    assert (calls[1]['annot'], calls[1]['rasterized']) == (False, True)
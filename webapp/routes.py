@@ -4,9 +4,11 @@ import json
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from flask import render_template, request, jsonify, send_file
+from flask import Response, make_response, render_template, request, jsonify, send_file
+from werkzeug.security import safe_join
 import hashlib
 import gc
+import threading
 import psutil
 
 # Add parent directory to path to import src modules
@@ -14,23 +16,197 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Get the correct data path
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'climate_data.csv')
-from src.data_processor import DataProcessor
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+CLUSTER_MODEL_PATH = os.path.join(MODEL_DIR, 'clusters.npz')
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache_manifest.json')
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# On-demand plots live under static/ so the frontend can load them directly
+RENDER_CACHE_SUBDIR = 'render_cache'
+RENDER_CACHE_MAX_MB = int(os.environ.get('RENDER_CACHE_MAX_MB', '256'))
+# Background analysis jobs (per process, so run gunicorn with a single worker)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', '16'))
+JOB_RETRY_AFTER_SECONDS = 5
+# Resolution of plots rendered on demand (a number or a DPI preset name)
+RENDER_DPI = os.environ.get('RENDER_DPI', 'web')
+# Scoring method of the anomaly overlays (see src/anomaly.py)
+ANOMALY_METHOD = os.environ.get('ANOMALY_METHOD', 'climatology')
+# Browser cache lifetime of images streamed from /plot/
+PLOT_MAX_AGE_SECONDS = 3600
+# /plot/ renders on the request thread, so it defaults to a forecaster that
+# needs no training
+PLOT_DEFAULT_ENGINE = 'harmonic'
+# Cache-Control max-age per kind of response; render-cache files are named
+# after their inputs, so they never change and may be cached for a year
+API_MAX_AGE_SECONDS = 300
+EXPORT_MAX_AGE_SECONDS = 60
+STATIC_MAX_AGE_SECONDS = 3600
+RENDER_CACHE_MAX_AGE_SECONDS = 365 * 24 * 3600
+from src.cache_manifest import ARTIFACT_CODE_FILES, DATASET_HASH_COLUMNS, CacheManifest, code_version, hash_frame
+from src.dataset_cache import get_dataset_cache
+from src.http_cache import compress_response, file_etag, is_not_modified, make_etag, set_cache_headers
+from src.station_index import StationIndex
+from src.downsampling import RESOLUTIONS, aggregate_by_resolution, downsample_frame
+from src.serialization import BINARY_MIMETYPE, NDJSON_MIMETYPE, iter_binary, iter_ndjson
 from src.ml_algorithms import ClimateML
-from src.visualizer import ClimateVisualizer
+from src.job_queue import JobQueue, QueueFullError
+from src.model_registry import ModelRegistry
+from src.render_cache import RenderCache
+from src.visualizer import DPI_PRESETS, IMAGE_MIMETYPES, ClimateVisualizer, resolve_dpi
 
 
-def get_cache_key(station, analysis_type):
-    """Generate a cache key for the analysis"""
-    return hashlib.md5(f"{station}_{analysis_type}".encode()).hexdigest()
+_render_caches = {}
+_render_cache_lock = threading.Lock()
+_job_queue = None
+_job_queue_lock = threading.Lock()
+_visualizer = None
+_anomaly_flags = None
+_anomaly_flags_lock = threading.Lock()
+_input_hashes = None
+_input_hashes_lock = threading.Lock()
+
+
+def get_cache_key(station, analysis_type, **params):
+    """Generate a cache key for the analysis
+    
+    Extra keyword parameters (engine, dataset version, ...) are folded into
+    the key so a change to any of them produces a fresh plot.
+    """
+    key = f"{station}_{analysis_type}"
+    if params:
+        key += '_' + json.dumps(params, sort_keys=True, default=str)
+    return hashlib.md5(key.encode()).hexdigest()
 
 
 def is_plot_cached(plot_filename):
     """Check if a plot already exists"""
-    static_dir = Path("static")
+    static_dir = Path(STATIC_DIR)
     return (static_dir / plot_filename).exists()
 
 
+def get_render_cache(format='png'):
+    """Return the process-wide on-demand plot cache for an image format
+    
+    Each format keeps its own files (and RENDER_CACHE_MAX_MB budget) in the
+    shared render cache directory.
+    """
+    with _render_cache_lock:
+        render_cache = _render_caches.get(format)
+        if render_cache is None:
+            render_cache = _render_caches[format] = RenderCache(
+                os.path.join(STATIC_DIR, RENDER_CACHE_SUBDIR),
+                max_bytes=RENDER_CACHE_MAX_MB * 1024 * 1024, suffix=f'.{format}')
+        return render_cache
+
+
+def get_job_queue():
+    """Return the process-wide background job queue"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(workers=JOB_WORKERS, max_pending=JOB_QUEUE_SIZE)
+        return _job_queue
+
+
+def get_visualizer():
+    """Return the process-wide visualizer used for on-demand plots
+    
+    It uses the thread-safe Agg renderer, whose figure templates are reused
+    across requests handled by the same worker thread.
+    """
+    global _visualizer
+    if _visualizer is None:
+        _visualizer = ClimateVisualizer(renderer='agg', dpi=_parse_dpi(RENDER_DPI))
+    return _visualizer
+
+
+def get_anomaly_flags(index):
+    """Return anomaly flags for every row of index.frame
+    
+    All stations are scored in one batch the first time an index is seen,
+    so rendering a station only slices its block out of the result.
+    """
+    global _anomaly_flags
+    with _anomaly_flags_lock:
+        if _anomaly_flags is None or _anomaly_flags[0] is not index:
+            flags, _ = ClimateML().detect_anomalies_batch(index.frame, method=ANOMALY_METHOD)
+            _anomaly_flags = (index, flags)
+        return _anomaly_flags[1]
+
+
+def get_input_hash(index, position=None):
+    """Return the manifest input hash of one station's rows, or of the whole dataset
+    
+    Hashes are computed on first use and kept until the index changes, so
+    prebuilt plots are only served while they show the data loaded now.
+    """
+    global _input_hashes
+    with _input_hashes_lock:
+        if _input_hashes is None or _input_hashes[0] is not index:
+            _input_hashes = (index, {})
+        hashes = _input_hashes[1]
+        if position not in hashes:
+            if position is None:
+                hashes[position] = hash_frame(index.frame, columns=DATASET_HASH_COLUMNS)
+            else:
+                hashes[position] = hash_frame(index.station_frame(position))
+        return hashes[position]
+
+
+def _station_anomalies(index, position):
+    """Slice one station's block out of the batch anomaly flags"""
+    return get_anomaly_flags(index)[int(index.starts[position]):int(index.ends[position])]
+
+
+def _parse_dpi(value):
+    """Turn a dpi setting (a number or a DPI preset name) into a dpi argument"""
+    return float(value) if value.replace('.', '', 1).isdigit() else value
+
+
+def plot_cache_key(analysis_type, station_name, engine, dataset_version, dpi):
+    """Render cache key of a plot, shared by /analyze and /plot
+    
+    Only the settings that change the plot are part of the key: the engine
+    for forecasts and the anomaly method for anomaly overlays.
+    """
+    if analysis_type == 'clustering':
+        return get_cache_key('all', 'clustering', data=dataset_version, dpi=dpi)
+    params = {'data': dataset_version, 'dpi': dpi}
+    if analysis_type in ('trend', 'prediction'):
+        params['engine'] = engine
+    if analysis_type in ('trend', 'anomaly'):
+        params['anomaly_method'] = ANOMALY_METHOD
+    return get_cache_key(station_name, analysis_type, **params)
+
+
+def _render_cached(render_cache, key, render):
+    """Render a plot through the cache; returns its path relative to static/"""
+    filename = render_cache.get_or_render(key, render)
+    return f"{RENDER_CACHE_SUBDIR}/{filename}"
+
+
+def _conditional(etag, max_age, build, last_modified=None, weak=False):
+    """Answer 304 if the client's copy is current, otherwise build the response
+    
+    build() is only called on a cache miss, so revalidations skip the work.
+    """
+    if is_not_modified(request, etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+    return set_cache_headers(response, etag, max_age, last_modified, weak)
+
+
 def configure_routes(app):
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE_SECONDS
+    
+    @app.after_request
+    def finalize_response(response):
+        """Mark render-cache images immutable and compress large JSON bodies"""
+        if request.path.startswith(f'/static/{RENDER_CACHE_SUBDIR}/') and response.status_code in (200, 304):
+            response.headers['Cache-Control'] = f'public, max-age={RENDER_CACHE_MAX_AGE_SECONDS}, immutable'
+        return compress_response(response, request.accept_encodings)
+    
     @app.route('/')
     def index():
         """Main climate analysis homepage"""
@@ -38,76 +214,47 @@ def configure_routes(app):
 
     @app.route('/analyze', methods=['POST'])
     def analyze():
-        """Handle climate analysis requests"""
+        """Queue a climate analysis and return its job id
+        
+        The work runs on the background job queue; poll /jobs/<job_id> for
+        progress and the resulting plots. Identical requests that are still
+        running share one job.
+        """
         try:
             # Get form data
             station = request.form.get('station', 'all')
             analysis_type = request.form.get('type', 'trends')
+            engine = request.form.get('engine', 'lstm')
+            if engine not in ClimateML.available_engines():
+                return jsonify({
+                    'success': False,
+                    'message': f'Unknown forecasting engine: {engine}'
+                }), 400
             
-            # Process data
-            processor = DataProcessor(DATA_PATH)
-            df = processor.load_data()
-            df = processor.clean_data()
+            # Reject unknown stations up front rather than in the job
+            dataset_cache = get_dataset_cache(DATA_PATH)
+            index = dataset_cache.get_index()
+            if station != 'all' and len(index.resolve(station)) == 0:
+                return jsonify({
+                    'success': False,
+                    'message': f'No data found for station: {station}'
+                }), 400
             
-            # Initialize ML and visualizer
-            ml = ClimateML()
-            visualizer = ClimateVisualizer()
+            key = (station, analysis_type, engine, dataset_cache.version)
+            try:
+                job = get_job_queue().submit(
+                    key, lambda job: run_analysis(station, analysis_type, engine, job))
+            except QueueFullError as e:
+                response = jsonify({'success': False, 'message': str(e)})
+                response.headers['Retry-After'] = str(JOB_RETRY_AFTER_SECONDS)
+                return response, 429
             
-            results = {
+            return jsonify({
                 'success': True,
-                'message': 'Analysis completed successfully',
-                'station': station,
-                'analysis_type': analysis_type,
-                'data_summary': {
-                    'total_records': len(df),
-                    'stations': df['station_name'].nunique(),
-                    'date_range': f"{df['date'].min().strftime('%Y-%m-%d')} to {df['date'].max().strftime('%Y-%m-%d')}"
-                }
-            }
-            
-            # Filter data by station if specific station selected
-            if station != 'all':
-                df = df[df['station_name'].str.contains(station, case=False)]
-                if len(df) == 0:
-                    return jsonify({
-                        'success': False,
-                        'message': f'No data found for station: {station}'
-                    }), 400
-            
-            # Serve pre-generated visualizations (cached approach)
-            if analysis_type == 'temperature':
-                if station == 'all':
-                    # Serve all individual station plots
-                    results['plots'] = [
-                        "trend_analysis_TALLAHASSEE_REGIONAL_AIRPORT_FL_US.png",
-                        "trend_analysis_DALLAS_7_NE_GA_US.png", 
-                        "trend_analysis_LOS_ANGELES_INTERNATIONAL_AIRPORT_CA_US.png"
-                    ]
-                    results['cached'] = True
-                    results['message'] = 'Serving pre-generated temperature analyses for all stations'
-                else:
-                    # Serve specific station plot - use exact station names
-                    if "TALLAHASSEE" in station.upper():
-                        plot_name = "trend_analysis_TALLAHASSEE_REGIONAL_AIRPORT_FL_US.png"
-                    elif "DALLAS" in station.upper():
-                        plot_name = "trend_analysis_DALLAS_7_NE_GA_US.png"
-                    elif "LOS ANGELES" in station.upper():
-                        plot_name = "trend_analysis_LOS_ANGELES_INTERNATIONAL_AIRPORT_CA_US.png"
-                    else:
-                        # Fallback to dynamic naming
-                        safe_name = station.replace(' ', '_').replace(',', '').replace('/', '_')[:50]
-                        plot_name = f"trend_analysis_{safe_name}.png"
-                    
-                    results['plots'] = [plot_name]
-                    results['cached'] = True
-                    results['message'] = f'Serving pre-generated temperature analysis for {station}'
-                    
-            elif analysis_type == 'clustering':
-                results['plots'] = ["climate_clusters.png"]
-                results['cached'] = True
-                results['message'] = 'Serving pre-generated regional clustering analysis'
-            
-            return jsonify(results)
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/jobs/{job.id}'
+            }), 202
             
         except Exception as e:
             return jsonify({
@@ -115,49 +262,84 @@ def configure_routes(app):
                 'message': f'Analysis failed: {str(e)}'
             }), 500
 
+    @app.route('/jobs/<job_id>')
+    def get_job(job_id):
+        """Report the status, progress and result of an analysis job"""
+        job = get_job_queue().get(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job: {job_id}'}), 404
+        return jsonify(job.to_dict())
+
     @app.route('/api/stats')
     def get_stats():
         """Get project statistics"""
         try:
-            processor = DataProcessor(DATA_PATH)
-            df = processor.load_data()
-            
-            stats = {
-                'total_records': len(df),
-                'stations': df['station_name'].nunique(),
-                'years': (df['date'].max() - df['date'].min()).days / 365.25,
-                'avg_temperature': df['temperature'].mean(),
-                'date_range': {
-                    'start': df['date'].min().strftime('%Y-%m-%d'),
-                    'end': df['date'].max().strftime('%Y-%m-%d')
-                }
-            }
-            
-            return jsonify(stats)
+            dataset_cache = get_dataset_cache(DATA_PATH)
+            return _conditional(make_etag('stats', dataset_cache.version), API_MAX_AGE_SECONDS,
+                                lambda: jsonify(dataset_cache.get_summary().stats()),
+                                dataset_cache.last_modified)
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
     @app.route('/api/station-data/<station_name>')
     def get_station_data(station_name):
-        """Get data for a specific weather station"""
+        """Get data for a specific weather station
+
+        Query parameters:
+            start, end: inclusive date bounds (YYYY-MM-DD)
+            resolution: daily (default), weekly, monthly or yearly averages
+            max_points: LTTB downsample the series to about this many points
+            format: json (default), ndjson (streamed, one station chunk per
+                line) or binary (packed int32 day offsets + float32 values)
+        """
         try:
-            processor = DataProcessor(DATA_PATH)
-            df = processor.load_data()
-            df = processor.clean_data()
+            start = request.args.get('start')
+            end = request.args.get('end')
+            resolution = request.args.get('resolution', 'daily')
+            max_points = request.args.get('max_points', type=int)
+            output_format = request.args.get('format', 'json')
+            try:
+                start = pd.Timestamp(start) if start else None
+                end = pd.Timestamp(end) if end else None
+            except ValueError:
+                return jsonify({'error': 'start and end must be dates (YYYY-MM-DD)'}), 400
+            if resolution not in RESOLUTIONS:
+                return jsonify({'error': f"resolution must be one of: {', '.join(RESOLUTIONS)}"}), 400
+            if max_points is not None and max_points < 3:
+                return jsonify({'error': 'max_points must be at least 3'}), 400
+            if output_format not in ('json', 'ndjson', 'binary'):
+                return jsonify({'error': 'format must be one of: json, ndjson, binary'}), 400
             
-            if station_name != 'all':
-                station_data = df[df['station_name'].str.contains(station_name, case=False)]
-            else:
-                station_data = df
+            dataset_cache = get_dataset_cache(DATA_PATH)
+            etag = make_etag('station-data', dataset_cache.version, station_name, sorted(request.args.items()))
             
-            # Convert to JSON-serializable format
-            data = {
-                'dates': station_data['date'].dt.strftime('%Y-%m-%d').tolist(),
-                'temperatures': station_data['temperature'].tolist(),
-                'station_name': station_data['station_name'].iloc[0] if len(station_data) > 0 else 'Unknown'
-            }
+            def build():
+                index = dataset_cache.get_index()
+                
+                if station_name != 'all':
+                    station_data = index.lookup(station_name, start, end)
+                else:
+                    station_data = index.select(None, start, end)
+                station_data = aggregate_by_resolution(station_data, resolution)
+                station_data = downsample_frame(station_data, max_points)
+                
+                # Stream large downloads instead of materialising Python lists
+                if output_format == 'ndjson':
+                    return Response(iter_ndjson(station_data), mimetype=NDJSON_MIMETYPE)
+                if output_format == 'binary':
+                    return Response(iter_binary(station_data), mimetype=BINARY_MIMETYPE)
+                
+                # Convert to JSON-serializable format
+                data = {
+                    'dates': station_data['date'].dt.strftime('%Y-%m-%d').tolist(),
+                    'temperatures': station_data['temperature'].tolist(),
+                    'station_name': station_data['station_name'].iloc[0] if len(station_data) > 0 else 'Unknown',
+                    'resolution': resolution
+                }
+                
+                return jsonify(data)
             
-            return jsonify(data)
+            return _conditional(etag, API_MAX_AGE_SECONDS, build, dataset_cache.last_modified)
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -165,98 +347,226 @@ def configure_routes(app):
     def download_file(filename):
         """Download analysis results"""
         try:
-            file_path = os.path.join('static', filename)
-            if os.path.exists(file_path):
-                return send_file(file_path, as_attachment=True)
+            file_path = safe_join(STATIC_DIR, filename)
+            if file_path is not None and os.path.isfile(file_path):
+                # send_file answers If-None-Match / If-Modified-Since itself
+                return send_file(file_path, as_attachment=True, etag=file_etag(file_path),
+                                 max_age=STATIC_MAX_AGE_SECONDS)
             else:
                 return jsonify({'error': 'File not found'}), 404
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/plot/<analysis_type>/<station_name>')
+    def stream_plot(analysis_type, station_name):
+        """Stream a plot image, rendering it through the render cache on a miss
+        
+        analysis_type is trend, anomaly, prediction or clustering (use 'all'
+        as the station for clustering). PNG plots share cache entries with
+        /analyze, so a plot rendered by either is reused by both.
+        
+        Query parameters:
+            format: png (default) or webp
+            size: thumbnail, web or print DPI preset, or a number
+                (defaults to RENDER_DPI)
+            engine: forecasting engine for trend and prediction plots
+                (defaults to the cheap harmonic engine)
+        """
+        try:
+            output_format = request.args.get('format', 'png')
+            size = request.args.get('size', RENDER_DPI)
+            engine = request.args.get('engine', PLOT_DEFAULT_ENGINE)
+            if output_format not in IMAGE_MIMETYPES:
+                return jsonify({'error': f"format must be one of: {', '.join(IMAGE_MIMETYPES)}"}), 400
+            if size not in DPI_PRESETS and not size.replace('.', '', 1).isdigit():
+                return jsonify({'error': f"size must be a number or one of: {', '.join(DPI_PRESETS)}"}), 400
+            if engine not in ClimateML.available_engines():
+                return jsonify({'error': f'Unknown forecasting engine: {engine}'}), 400
+            
+            dataset_cache = get_dataset_cache(DATA_PATH)
+            index = dataset_cache.get_index()
+            ml = ClimateML(registry=ModelRegistry(MODEL_DIR), engine=engine)
+            visualizer = get_visualizer()
+            # Same inputs render the same image, so revalidate without rendering
+            etag = make_etag('plot', analysis_type, station_name, engine, output_format, size,
+                             ANOMALY_METHOD, dataset_cache.version)
+            
+            dpi = resolve_dpi(_parse_dpi(size))
+            if analysis_type == 'clustering':
+                render = _clustering_renderer(index.frame, ml, visualizer)
+                actual_station_name = 'all'
+            elif analysis_type in STATION_RENDERERS:
+                matches = index.resolve(station_name)
+                if len(matches) == 0:
+                    return jsonify({'error': f'No data found for station: {station_name}'}), 404
+                actual_station_name = str(index.station_names[matches[0]])
+                render = STATION_RENDERERS[analysis_type](
+                    ml, visualizer, actual_station_name, index.station_frame(matches[0]),
+                    _station_anomalies(index, matches[0]))
+            else:
+                return jsonify({'error': f'Unknown analysis type: {analysis_type}'}), 404
+            
+            def build():
+                render_cache = get_render_cache(output_format)
+                key = plot_cache_key(analysis_type, actual_station_name, engine, dataset_cache.version, dpi)
+                filename = render_cache.get_or_render(
+                    key, lambda path: render(path, format=output_format, dpi=dpi))
+                return send_file(render_cache.path_for(filename), mimetype=IMAGE_MIMETYPES[output_format],
+                                 etag=False, conditional=False)
+            
+            return _conditional(etag, PLOT_MAX_AGE_SECONDS, build, dataset_cache.last_modified)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/export-analysis')
     def export_analysis():
         """Export analysis results as JSON"""
         try:
-            processor = DataProcessor(DATA_PATH)
-            df = processor.load_data()
-            df = processor.clean_data()
-            
-            # Generate summary statistics
-            summary = {
-                'data_summary': {
-                    'total_records': len(df),
-                    'stations': df['station_name'].nunique(),
-                    'date_range': {
-                        'start': df['date'].min().strftime('%Y-%m-%d'),
-                        'end': df['date'].max().strftime('%Y-%m-%d')
-                    }
-                },
-                'station_summary': df.groupby('station_name').agg({
-                    'temperature': ['mean', 'std', 'min', 'max'],
-                    'date': ['min', 'max']
-                }).round(2).to_dict(),
-                'analysis_timestamp': pd.Timestamp.now().isoformat()
-            }
-            
-            return jsonify(summary)
+            dataset_cache = get_dataset_cache(DATA_PATH)
+            # Weak ETag: each process stamps its own analysis_timestamp on
+            # summaries of the same dataset version
+            return _conditional(make_etag('export', dataset_cache.version), EXPORT_MAX_AGE_SECONDS,
+                                lambda: jsonify(dataset_cache.get_summary().export()),
+                                dataset_cache.last_modified, weak=True)
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
 
-def generate_trend_plots(df, ml, visualizer, selected_station='all'):
-    """Generate temperature trend plots for selected station(s)"""
+def run_analysis(station, analysis_type, engine, job=None):
+    """Build the plots for one analysis request and return the results payload
+    
+    Prebuilt plots are served as is when the cache manifest records them as
+    built from the current data with the requested engine and anomaly method
+    by the current code;
+    anything else is rendered on demand through the LRU render cache.
+    """
+    dataset_cache = get_dataset_cache(DATA_PATH)
+    index = dataset_cache.get_index()
+    df = index.frame
+    stats = dataset_cache.get_summary().stats()
+    
+    # Initialize ML and visualizer
+    ml = ClimateML(registry=ModelRegistry(MODEL_DIR), engine=engine)
+    visualizer = get_visualizer()
+    
+    results = {
+        'success': True,
+        'message': 'Analysis completed successfully',
+        'station': station,
+        'analysis_type': analysis_type,
+        'engine': engine,
+        'data_summary': {
+            'total_records': stats['total_records'],
+            'stations': stats['stations'],
+            'date_range': f"{stats['date_range']['start']} to {stats['date_range']['end']}"
+        }
+    }
+    
+    # Filter data by station if specific station selected
+    if station != 'all':
+        df = index.lookup(station)
+        if len(df) == 0:
+            raise ValueError(f'No data found for station: {station}')
+    
+    manifest = CacheManifest(MANIFEST_PATH)
+    render_cache = get_render_cache()
+    dataset_version = dataset_cache.version
+    station_names = [str(name) for name in index.station_names] if station == 'all' else [index.resolve_name(station)]
+    
+    artifact_version = code_version(ARTIFACT_CODE_FILES)
+    trend_params = {'engine': ml.engine, 'anomaly_method': ANOMALY_METHOD}
+    if ml.engine == 'lstm':
+        trend_params['lstm_config'] = ml.lstm_config
+    
+    def prebuilt(kind, station_name=None, params=None):
+        # Only files the manifest records as built from the current data by
+        # this code with these settings; unrecorded files are of unknown provenance
+        if station_name is None:
+            input_hash = get_input_hash(index)
+        else:
+            positions = index.resolve(station_name)
+            if not positions:
+                return []
+            input_hash = get_input_hash(index, positions[0])
+        plots = manifest.find(kind, station_name, params=params, version=artifact_version, input_hash=input_hash)
+        return [plot for plot in plots if is_plot_cached(plot)]
+    
+    def report(done, station_name):
+        if job is not None:
+            job.set_progress(done / len(station_names), f'Rendering {station_name}')
+    
+    if analysis_type == 'temperature':
+        results['plots'] = []
+        for i, station_name in enumerate(station_names):
+            report(i, station_name)
+            results['plots'].extend(
+                prebuilt('trend', station_name, trend_params)
+                or generate_trend_plots(df, ml, visualizer, station_name, index,
+                                        render_cache, dataset_version)
+            )
+        results['cached'] = True
+        if station == 'all':
+            results['message'] = 'Serving temperature analyses for all stations'
+        else:
+            results['message'] = f'Serving temperature analysis for {station}'
+            
+    elif analysis_type == 'anomalies':
+        results['plots'] = []
+        for i, station_name in enumerate(station_names):
+            report(i, station_name)
+            results['plots'].extend(generate_anomaly_plots(df, ml, visualizer, station_name, index,
+                                                           render_cache, dataset_version))
+        results['cached'] = True
+        results['message'] = f'Serving anomaly analysis for {station}'
+            
+    elif analysis_type == 'predictions':
+        results['plots'] = []
+        for i, station_name in enumerate(station_names):
+            report(i, station_name)
+            results['plots'].extend(generate_prediction_plots(df, ml, visualizer, station_name, index,
+                                                              render_cache, dataset_version))
+        results['cached'] = True
+        results['message'] = f'Serving prediction analysis for {station}'
+            
+    elif analysis_type == 'clustering':
+        results['plots'] = prebuilt('clustering', params={'n_clusters': 2}) or generate_clustering_plots(
+            index.frame, ml, visualizer, render_cache, dataset_version)
+        results['cached'] = True
+        results['message'] = 'Serving regional clustering analysis'
+    
+    return results
+
+
+def generate_trend_plots(df, ml, visualizer, selected_station='all', index=None,
+                         render_cache=None, dataset_version=None):
+    """Render (or reuse) temperature trend plots for selected station(s)"""
     plots = []
+    render_cache = render_cache or get_render_cache()
     
-    # Ensure static directory exists
-    static_dir = Path("static")
-    static_dir.mkdir(exist_ok=True)
+    if index is None:
+        index = StationIndex.build(df)
     
     # If specific station selected, only process that one
     if selected_station != 'all':
         station_names = [selected_station]
     else:
-        station_names = df['station_name'].unique()
+        station_names = index.station_names
     
     for station_name in station_names:
-        # Find the actual station name from the data
-        matching_stations = df[df['station_name'].str.contains(station_name, case=False)]
-        if len(matching_stations) == 0:
+        # Find the actual station name from the index
+        matches = index.resolve(station_name)
+        if len(matches) == 0:
             continue
             
-        actual_station_name = matching_stations['station_name'].iloc[0]
-        station_data = df[df['station_name'] == actual_station_name].copy()
-        station_data = station_data.sort_values('date')
-        
-        dates = station_data['date'].tolist()
-        temps = station_data['temperature'].tolist()
+        actual_station_name = str(index.station_names[matches[0]])
+        station_data = index.station_frame(matches[0])
         
-        # Detect anomalies
-        anomalies = ml.detect_anomalies(np.array(temps))
-        
-        # Generate predictions (use shorter sequence to avoid issues)
-        if len(temps) > 30:
-            predictions = ml.predict_temperature(np.array(temps[:-30]), np.array(temps[:-30]), forecast_period=30)
-        else:
-            predictions = []
-        
-        # Create plot filename
-        safe_name = actual_station_name.replace(' ', '_').replace(',', '').replace('/', '_')[:20]
-        plot_filename = f"trend_analysis_{safe_name}.png"
-        plot_path = static_dir / plot_filename
+        render = _trend_renderer(ml, visualizer, actual_station_name, station_data,
+                                 _station_anomalies(index, matches[0]))
         
+        key = plot_cache_key('trend', actual_station_name, ml.engine, dataset_version, visualizer.dpi)
         try:
-            # Generate plot
-            visualizer.plot_temperature_with_predictions_and_anomalies(
-                dates, temps, predictions, anomalies,
-                title=f"Temperature Trends for {actual_station_name}",
-                output_path=str(plot_path)
-            )
-            plots.append(plot_filename)
-            
-            # Clear matplotlib memory after each plot
-            import matplotlib.pyplot as plt
-            plt.close('all')
-            
+            plots.append(_render_cached(render_cache, key, render))
         except Exception as e:
             print(f"Error generating trend plot for {actual_station_name}: {e}")
             continue
@@ -264,46 +574,36 @@ def generate_trend_plots(df, ml, visualizer, selected_station='all'):
     return plots
 
 
-def generate_anomaly_plots(df, ml, visualizer, selected_station='all'):
-    """Generate anomaly detection plots for selected station(s)"""
+def generate_anomaly_plots(df, ml, visualizer, selected_station='all', index=None,
+                           render_cache=None, dataset_version=None):
+    """Render (or reuse) anomaly detection plots for selected station(s)"""
     plots = []
+    render_cache = render_cache or get_render_cache()
     
-    # Ensure static directory exists
-    static_dir = Path("static")
-    static_dir.mkdir(exist_ok=True)
+    if index is None:
+        index = StationIndex.build(df)
     
     # If specific station selected, only process that one
     if selected_station != 'all':
         station_names = [selected_station]
     else:
-        station_names = df['station_name'].unique()
+        station_names = index.station_names
     
     for station_name in station_names:
-        # Find the actual station name from the data
-        matching_stations = df[df['station_name'].str.contains(station_name, case=False)]
-        if len(matching_stations) == 0:
+        # Find the actual station name from the index
+        matches = index.resolve(station_name)
+        if len(matches) == 0:
             continue
             
-        actual_station_name = matching_stations['station_name'].iloc[0]
-        station_data = df[df['station_name'] == actual_station_name].copy()
-        temps = station_data['temperature'].values
+        actual_station_name = str(index.station_names[matches[0]])
+        station_data = index.station_frame(matches[0])
         
-        # Detect anomalies
-        anomalies = ml.detect_anomalies(temps)
-        
-        # Create anomaly plot
-        safe_name = actual_station_name.replace(' ', '_').replace(',', '').replace('/', '_')[:20]
-        plot_filename = f"anomaly_analysis_{safe_name}.png"
-        plot_path = static_dir / plot_filename
+        render = _anomaly_renderer(ml, visualizer, actual_station_name, station_data,
+                                   _station_anomalies(index, matches[0]))
         
+        key = plot_cache_key('anomaly', actual_station_name, ml.engine, dataset_version, visualizer.dpi)
         try:
-            # Generate anomaly visualization
-            visualizer.plot_temperature_with_predictions_and_anomalies(
-                station_data['date'].tolist(), temps.tolist(), [], anomalies,
-                title=f"Anomaly Detection for {actual_station_name}",
-                output_path=str(plot_path)
-            )
-            plots.append(plot_filename)
+            plots.append(_render_cached(render_cache, key, render))
         except Exception as e:
             print(f"Error generating anomaly plot for {actual_station_name}: {e}")
             continue
@@ -311,95 +611,146 @@ def generate_anomaly_plots(df, ml, visualizer, selected_station='all'):
     return plots
 
 
-def generate_clustering_plots(df, ml, visualizer):
-    """Generate clustering analysis plots"""
-    # Ensure static directory exists
-    static_dir = Path("static")
-    static_dir.mkdir(exist_ok=True)
-    
-    # Calculate multiple features for each station for better clustering
-    station_features = df.groupby('station_name').agg({
-        'temperature': ['mean', 'std', 'min', 'max']
-    }).reset_index()
-    
-    # Flatten column names
-    station_features.columns = ['station_name', 'temp_mean', 'temp_std', 'temp_min', 'temp_max']
-    
-    # Prepare data for clustering using multiple features
-    data_by_region = {}
-    for _, row in station_features.iterrows():
-        data_by_region[row['station_name']] = [
-            row['temp_mean'], 
-            row['temp_std'], 
-            row['temp_min'], 
-            row['temp_max']
-        ]
+def generate_clustering_plots(df, ml, visualizer, render_cache=None, dataset_version=None):
+    """Render (or reuse) clustering analysis plots"""
+    render_cache = render_cache or get_render_cache()
     
-    # Perform clustering
-    cluster_labels = ml.cluster_regions(data_by_region, n_clusters=2)
-    
-    # Generate cluster plot
-    plot_filename = "climate_clusters.png"
-    plot_path = static_dir / plot_filename
+    render = _clustering_renderer(df, ml, visualizer)
     
+    key = plot_cache_key('clustering', 'all', ml.engine, dataset_version, visualizer.dpi)
     try:
-        visualizer.plot_cluster_summary(
-            station_names=station_features['station_name'].tolist(),
-            cluster_ids=list(cluster_labels.values()),
-            output_path=str(plot_path)
-        )
-        return [plot_filename]
+        return [_render_cached(render_cache, key, render)]
     except Exception as e:
         print(f"Error generating clustering plot: {e}")
         return []
 
 
-def generate_prediction_plots(df, ml, visualizer, selected_station='all'):
-    """Generate future prediction plots for selected station(s)"""
+def generate_prediction_plots(df, ml, visualizer, selected_station='all', index=None,
+                              render_cache=None, dataset_version=None):
+    """Render (or reuse) future prediction plots for selected station(s)"""
     plots = []
+    render_cache = render_cache or get_render_cache()
     
-    # Ensure static directory exists
-    static_dir = Path("static")
-    static_dir.mkdir(exist_ok=True)
+    if index is None:
+        index = StationIndex.build(df)
     
     # If specific station selected, only process that one
     if selected_station != 'all':
         station_names = [selected_station]
     else:
-        station_names = df['station_name'].unique()
+        station_names = index.station_names
     
     for station_name in station_names:
-        # Find the actual station name from the data
-        matching_stations = df[df['station_name'].str.contains(station_name, case=False)]
-        if len(matching_stations) == 0:
+        # Find the actual station name from the index
+        matches = index.resolve(station_name)
+        if len(matches) == 0:
             continue
             
-        actual_station_name = matching_stations['station_name'].iloc[0]
-        station_data = df[df['station_name'] == actual_station_name].copy()
-        station_data = station_data.sort_values('date')
+        actual_station_name = str(index.station_names[matches[0]])
+        station_data = index.station_frame(matches[0])
+        
+        render = _prediction_renderer(ml, visualizer, actual_station_name, station_data)
+        
+        key = plot_cache_key('prediction', actual_station_name, ml.engine, dataset_version, visualizer.dpi)
+        try:
+            plots.append(_render_cached(render_cache, key, render))
+        except Exception as e:
+            print(f"Error generating prediction plot for {actual_station_name}: {e}")
+            continue
+    
+    return plots
+
+
+def _trend_renderer(ml, visualizer, actual_station_name, station_data, anomalies=None):
+    """Return a render(output_path, **save_options) callable for a trend plot
+    
+    anomalies are the station's precomputed flags; without them the station
+    is scored on its own.
+    """
+    def render(output_path, **save_options):
+        dates = station_data['date'].tolist()
+        temps = station_data['temperature'].tolist()
+        
+        # Detect anomalies
+        flags = anomalies
+        if flags is None:
+            flags = ml.detect_anomalies(np.array(temps), method=ANOMALY_METHOD,
+                                        dates=station_data['date'].to_numpy())
         
+        # Generate predictions (use shorter sequence to avoid issues)
+        if len(temps) > 30:
+            predictions = ml.predict_temperature(np.array(temps[:-30]), np.array(temps[:-30]), forecast_period=30,
+                                                 station=actual_station_name, dates=dates[:-30])
+        else:
+            predictions = []
+        
+        visualizer.plot_temperature_with_predictions_and_anomalies(
+            dates, temps, predictions, flags,
+            title=f"Temperature Trends for {actual_station_name}",
+            output_path=output_path, **save_options
+        )
+    return render
+
+
+def _anomaly_renderer(ml, visualizer, actual_station_name, station_data, anomalies=None):
+    """Return a render(output_path, **save_options) callable for an anomaly plot"""
+    def render(output_path, **save_options):
+        temps = station_data['temperature'].values
+        
+        # Detect anomalies
+        flags = anomalies
+        if flags is None:
+            flags = ml.detect_anomalies(temps, method=ANOMALY_METHOD, dates=station_data['date'].to_numpy())
+        
+        visualizer.plot_temperature_with_predictions_and_anomalies(
+            station_data['date'].tolist(), temps.tolist(), [], flags,
+            title=f"Anomaly Detection for {actual_station_name}",
+            output_path=output_path, **save_options
+        )
+    return render
+
+
+def _prediction_renderer(ml, visualizer, actual_station_name, station_data, anomalies=None):
+    """Return a render(output_path, **save_options) callable for a prediction plot
+    
+    anomalies is accepted for a uniform signature; prediction plots show none.
+    """
+    def render(output_path, **save_options):
         temps = station_data['temperature'].values
         
         # Generate longer-term predictions (use shorter sequence to avoid issues)
         if len(temps) > 30:
-            predictions = ml.predict_temperature(temps[:-30], temps[:-30], forecast_period=90)
+            predictions = ml.predict_temperature(temps[:-30], temps[:-30], forecast_period=90,
+                                                 station=actual_station_name,
+                                                 dates=station_data['date'].to_numpy()[:-30])
         else:
             predictions = []
         
-        # Create prediction plot
-        safe_name = actual_station_name.replace(' ', '_').replace(',', '').replace('/', '_')[:20]
-        plot_filename = f"prediction_{safe_name}.png"
-        plot_path = static_dir / plot_filename
+        visualizer.plot_temperature_with_predictions_and_anomalies(
+            station_data['date'].tolist(), temps.tolist(), predictions, [],
+            title=f"Future Predictions for {actual_station_name}",
+            output_path=output_path, **save_options
+        )
+    return render
+
+
+def _clustering_renderer(df, ml, visualizer):
+    """Return a render(output_path, **save_options) callable for the clustering plot"""
+    def render(output_path, **save_options):
+        # Assign stations with the saved centroids (fitted on first use)
+        cluster_labels = ml.cluster_stations(df, n_clusters=2, model_path=CLUSTER_MODEL_PATH)
         
-        try:
-            visualizer.plot_temperature_with_predictions_and_anomalies(
-                station_data['date'].tolist(), temps.tolist(), predictions, [],
-                title=f"Future Predictions for {actual_station_name}",
-                output_path=str(plot_path)
-            )
-            plots.append(plot_filename)
-        except Exception as e:
-            print(f"Error generating prediction plot for {actual_station_name}: {e}")
-            continue
-    
-    return plots
+        visualizer.plot_cluster_summary(
+            station_names=list(cluster_labels.keys()),
+            cluster_ids=list(cluster_labels.values()),
+            output_path=output_path, **save_options
+        )
+    return render
+
+
+# Per-station plot renderers served by /plot/<analysis_type>/<station_name>
+STATION_RENDERERS = {
+    'trend': _trend_renderer,
+    'anomaly': _anomaly_renderer,
+    'prediction': _prediction_renderer,
+}
@@ -89,12 +89,18 @@ document.addEventListener('DOMContentLoaded', function() {
             // Get form data
             const formData = new FormData(this);
             
-            // Make API call to backend
+            // Queue the analysis, then poll its job until it finishes
             fetch('/analyze', {
                 method: 'POST',
                 body: formData
             })
             .then(response => response.json())
+            .then(job => {
+                if (!job.success) {
+                    return { success: false, message: job.message };
+                }
+                return waitForJob(job.status_url, submitBtn);
+            })
             .then(data => {
                 // Reset button
                 submitBtn.innerHTML = originalText;
@@ -146,6 +152,29 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Helper Functions
 
+function waitForJob(statusUrl, submitBtn) {
+    // Poll a background analysis job; resolves with its result payload
+    return new Promise((resolve, reject) => {
+        const poll = () => {
+            fetch(statusUrl)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'done') {
+                        resolve(job.result);
+                    } else if (job.status === 'failed' || job.error) {
+                        resolve({ success: false, message: `Analysis failed: ${job.error}` });
+                    } else {
+                        const percent = Math.round((job.progress || 0) * 100);
+                        submitBtn.innerHTML = `<span class="loading"></span> Analyzing... ${percent}%`;
+                        setTimeout(poll, 1000);
+                    }
+                })
+                .catch(reject);
+        };
+        poll();
+    });
+}
+
 function showAnalysisResults(data) {
     // Create and show results modal or section
     const resultsSection = document.getElementById('analysisResults');